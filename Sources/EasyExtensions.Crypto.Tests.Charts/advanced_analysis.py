@@ -2,7 +2,28 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
 import seaborn as sns
+from metrics import no_chunk_axis_note
+from sweep_parser import frame_has_chunk_axis
 from test_parser import parse_test_results
+from units import SAMPLE_THROUGHPUT_UNIT, format_mib
+
+
+# Throughput as the parser reports it; charts.py renders the same unit by default
+UNIT = SAMPLE_THROUGHPUT_UNIT.name
+
+
+def _draw_no_chunk_axis(ax, op, data):
+    """Stand-in for a vs-chunk-size plot of an op measured at a single chunk size"""
+    ax.text(0.5, 0.5, no_chunk_axis_note(op, data['ChunkBytes'].unique()).replace(': ', ':\n'),
+            ha='center', va='center', transform=ax.transAxes, fontsize=11, color='gray')
+    ax.set_xticks([])
+    ax.set_yticks([])
+
+
+def _mid_chunk(data):
+    """Middle chunk size (MiB) an op was measured at"""
+    chunks = sorted(data['ChunkMB'].unique())
+    return chunks[len(chunks)//2]
 
 
 def create_advanced_plots(encrypt_data, decrypt_data):
@@ -28,45 +49,34 @@ def create_advanced_plots(encrypt_data, decrypt_data):
     fig.suptitle('Complete Performance Analysis: Encryption/Decryption Throughput',
                  fontsize=18, fontweight='bold')
 
-    # График 1: Encrypt - throughput vs chunk size
+    # Графики 1-2: Encrypt / Decrypt - throughput vs chunk size
     unique_threads = sorted(encrypt_data['Threads'].unique())
     colors = plt.cm.Set1(np.linspace(0, 1, len(unique_threads)))
 
-    for i, threads in enumerate(unique_threads):
-        thread_data = encrypt_data[encrypt_data['Threads']
-                                   == threads].sort_values('ChunkMB')
-        ax1.plot(thread_data['ChunkMB'], thread_data['Throughput'],
-                 marker='o', label=f'{threads} threads', linewidth=2.5,
-                 markersize=8, color=colors[i])
-
-    ax1.set_xlabel('Chunk Size (MB)', fontsize=12, fontweight='bold')
-    ax1.set_ylabel('Throughput (MB/s)', fontsize=12, fontweight='bold')
-    ax1.set_title('Encryption: Throughput vs Chunk Size',
-                  fontsize=14, fontweight='bold')
-    ax1.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-    ax1.grid(True, alpha=0.3)
-
-    # Добавляем подписи осей с размерами чанков
-    chunk_ticks = sorted(encrypt_data['ChunkMB'].unique())
-    ax1.set_xticks(chunk_ticks)
-    ax1.set_xticklabels([str(int(x)) for x in chunk_ticks])
-
-    # График 2: Decrypt - throughput vs chunk size
-    for i, threads in enumerate(unique_threads):
-        thread_data = decrypt_data[decrypt_data['Threads']
-                                   == threads].sort_values('ChunkMB')
-        ax2.plot(thread_data['ChunkMB'], thread_data['Throughput'],
-                 marker='s', label=f'{threads} threads', linewidth=2.5,
-                 markersize=8, color=colors[i])
-
-    ax2.set_xlabel('Chunk Size (MB)', fontsize=12, fontweight='bold')
-    ax2.set_ylabel('Throughput (MB/s)', fontsize=12, fontweight='bold')
-    ax2.set_title('Decryption: Throughput vs Chunk Size',
-                  fontsize=14, fontweight='bold')
-    ax2.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-    ax2.grid(True, alpha=0.3)
-    ax2.set_xticks(chunk_ticks)
-    ax2.set_xticklabels([str(int(x)) for x in chunk_ticks])
+    for ax, op, data, marker, title in ((ax1, 'encrypt', encrypt_data, 'o', 'Encryption'),
+                                        (ax2, 'decrypt', decrypt_data, 's', 'Decryption')):
+        ax.set_title(f'{title}: Throughput vs Chunk Size',
+                     fontsize=14, fontweight='bold')
+        # В старых логах decrypt расшифровывал один payload: у всех строк один размер чанка
+        if not frame_has_chunk_axis(data):
+            _draw_no_chunk_axis(ax, op, data)
+            continue
+        for i, threads in enumerate(unique_threads):
+            thread_data = data[data['Threads']
+                               == threads].sort_values('ChunkMB')
+            ax.plot(thread_data['ChunkMB'], thread_data['Throughput'],
+                    marker=marker, label=f'{threads} threads', linewidth=2.5,
+                    markersize=8, color=colors[i])
+
+        ax.set_xlabel('Chunk Size (MiB)', fontsize=12, fontweight='bold')
+        ax.set_ylabel(f'Throughput ({UNIT})', fontsize=12, fontweight='bold')
+        ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+        ax.grid(True, alpha=0.3)
+
+        # Добавляем подписи осей с размерами чанков
+        chunk_ticks = sorted(data['ChunkMB'].unique())
+        ax.set_xticks(chunk_ticks)
+        ax.set_xticklabels([f'{x:g}' for x in chunk_ticks])
 
     # График 3: Encrypt - throughput vs threads
     unique_chunks = sorted(encrypt_data['ChunkMB'].unique())
@@ -76,11 +86,11 @@ def create_advanced_plots(encrypt_data, decrypt_data):
         chunk_data = encrypt_data[encrypt_data['ChunkMB']
                                   == chunk_size].sort_values('Threads')
         ax3.plot(chunk_data['Threads'], chunk_data['Throughput'],
-                 marker='o', label=f'{chunk_size}MB', linewidth=2.5,
+                 marker='o', label=format_mib(chunk_size), linewidth=2.5,
                  markersize=8, color=chunk_colors[i])
 
     ax3.set_xlabel('Number of Threads', fontsize=12, fontweight='bold')
-    ax3.set_ylabel('Throughput (MB/s)', fontsize=12, fontweight='bold')
+    ax3.set_ylabel(f'Throughput ({UNIT})', fontsize=12, fontweight='bold')
     ax3.set_title('Encryption: Throughput vs Threads',
                   fontsize=14, fontweight='bold')
     ax3.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
@@ -88,16 +98,16 @@ def create_advanced_plots(encrypt_data, decrypt_data):
     ax3.set_xticks(unique_threads)
     ax3.set_xticklabels([str(int(x)) for x in unique_threads])
 
-    # График 4: Decrypt - throughput vs threads
-    for i, chunk_size in enumerate(unique_chunks):
+    # График 4: Decrypt - throughput vs threads (по тем чанкам, что измерялись для decrypt)
+    for i, chunk_size in enumerate(sorted(decrypt_data['ChunkMB'].unique())):
         chunk_data = decrypt_data[decrypt_data['ChunkMB']
                                   == chunk_size].sort_values('Threads')
         ax4.plot(chunk_data['Threads'], chunk_data['Throughput'],
-                 marker='s', label=f'{chunk_size}MB', linewidth=2.5,
-                 markersize=8, color=chunk_colors[i])
+                 marker='s', label=format_mib(chunk_size), linewidth=2.5,
+                 markersize=8, color=chunk_colors[i % len(chunk_colors)])
 
     ax4.set_xlabel('Number of Threads', fontsize=12, fontweight='bold')
-    ax4.set_ylabel('Throughput (MB/s)', fontsize=12, fontweight='bold')
+    ax4.set_ylabel(f'Throughput ({UNIT})', fontsize=12, fontweight='bold')
     ax4.set_title('Decryption: Throughput vs Threads',
                   fontsize=14, fontweight='bold')
     ax4.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
@@ -136,7 +146,7 @@ def create_advanced_plots(encrypt_data, decrypt_data):
             label='Decryption', alpha=0.8, color='lightcoral')
 
     ax5.set_xlabel('Number of Threads', fontsize=12, fontweight='bold')
-    ax5.set_ylabel('Max Throughput (MB/s)', fontsize=12, fontweight='bold')
+    ax5.set_ylabel(f'Max Throughput ({UNIT})', fontsize=12, fontweight='bold')
     ax5.set_title('Maximum Throughput Comparison by Thread Count',
                   fontsize=14, fontweight='bold')
     ax5.set_xticks(x)
@@ -158,8 +168,10 @@ def create_advanced_plots(encrypt_data, decrypt_data):
     baseline_dec = decrypt_data[decrypt_data['Threads'] == 1].groupby('ChunkMB')[
         'Throughput'].mean()
 
-    # Берем средний размер чанка для анализа масштабирования
-    mid_chunk = unique_chunks[len(unique_chunks)//2]  # Средний размер чанка
+    # Берем средний размер чанка для анализа масштабирования; decrypt — его же,
+    # если он измерялся, иначе свой средний
+    mid_chunk = _mid_chunk(encrypt_data)
+    dec_mid_chunk = mid_chunk if mid_chunk in baseline_dec.index else _mid_chunk(decrypt_data)
 
     enc_scaling = []
     dec_scaling = []
@@ -167,25 +179,27 @@ def create_advanced_plots(encrypt_data, decrypt_data):
         enc_throughput = encrypt_data[(encrypt_data['Threads'] == threads) &
                                       (encrypt_data['ChunkMB'] == mid_chunk)]['Throughput'].mean()
         dec_throughput = decrypt_data[(decrypt_data['Threads'] == threads) &
-                                      (decrypt_data['ChunkMB'] == mid_chunk)]['Throughput'].mean()
+                                      (decrypt_data['ChunkMB'] == dec_mid_chunk)]['Throughput'].mean()
 
-        enc_baseline = baseline_enc[mid_chunk]
-        dec_baseline = baseline_dec[mid_chunk]
+        enc_baseline = baseline_enc.get(mid_chunk, np.nan)
+        dec_baseline = baseline_dec.get(dec_mid_chunk, np.nan)
 
         enc_scaling.append(enc_throughput / enc_baseline)
         dec_scaling.append(dec_throughput / dec_baseline)
 
     ax6.plot(unique_threads, enc_scaling, marker='o', linewidth=3, markersize=10,
              label='Encryption Scaling', color='blue')
+    dec_label = 'Decryption Scaling' if dec_mid_chunk == mid_chunk \
+        else f'Decryption Scaling ({format_mib(dec_mid_chunk)})'
     ax6.plot(unique_threads, dec_scaling, marker='s', linewidth=3, markersize=10,
-             label='Decryption Scaling', color='red')
+             label=dec_label, color='red')
     ax6.plot(unique_threads, unique_threads, '--', alpha=0.7, color='gray',
              label='Ideal Linear Scaling')
 
     ax6.set_xlabel('Number of Threads', fontsize=12, fontweight='bold')
     ax6.set_ylabel('Speedup Factor', fontsize=12, fontweight='bold')
     ax6.set_title(
-        f'Scaling Efficiency (Chunk Size: {mid_chunk}MB)', fontsize=14, fontweight='bold')
+        f'Scaling Efficiency (Chunk Size: {format_mib(mid_chunk)})', fontsize=14, fontweight='bold')
     ax6.legend()
     ax6.grid(True, alpha=0.3)
     ax6.set_xticks(unique_threads)
@@ -204,55 +218,65 @@ def print_analysis_summary(encrypt_data, decrypt_data, encrypt_optimal, decrypt_
     print("="*60)
 
     print(f"\n📊 OPTIMAL CONFIGURATIONS:")
-    print(f"   Encryption:")
-    print(f"      Best result: {encrypt_optimal['Throughput']:.1f} MB/s")
-    print(
-        f"      Threads: {encrypt_optimal['Threads']}, Chunk size: {encrypt_optimal['ChunkMB']}MB")
-
-    print(f"   Decryption:")
-    print(f"      Best result: {decrypt_optimal['Throughput']:.1f} MB/s")
-    print(
-        f"      Threads: {decrypt_optimal['Threads']}, Chunk size: {decrypt_optimal['ChunkMB']}MB")
+    for name, op, data, optimal in (("Encryption", 'encrypt', encrypt_data, encrypt_optimal),
+                                    ("Decryption", 'decrypt', decrypt_data, decrypt_optimal)):
+        print(f"   {name}:")
+        print(f"      Best result: {optimal['Throughput']:.1f} {UNIT}")
+        if frame_has_chunk_axis(data):
+            print(
+                f"      Threads: {optimal['Threads']}, Chunk size: {format_mib(optimal['ChunkMB'])}")
+        else:
+            print(f"      Threads: {optimal['Threads']}")
 
     # Statistics per operation
     print(f"\n📈 OVERALL STATISTICS:")
     print(f"   Encryption:")
-    print(f"      Mean: {encrypt_data['Throughput'].mean():.1f} MB/s")
-    print(f"      Median: {encrypt_data['Throughput'].median():.1f} MB/s")
+    print(f"      Mean: {encrypt_data['Throughput'].mean():.1f} {UNIT}")
+    print(f"      Median: {encrypt_data['Throughput'].median():.1f} {UNIT}")
     print(
-        f"      Min/Max: {encrypt_data['Throughput'].min():.1f} / {encrypt_data['Throughput'].max():.1f} MB/s")
+        f"      Min/Max: {encrypt_data['Throughput'].min():.1f} / {encrypt_data['Throughput'].max():.1f} {UNIT}")
 
     print(f"   Decryption:")
-    print(f"      Mean: {decrypt_data['Throughput'].mean():.1f} MB/s")
-    print(f"      Median: {decrypt_data['Throughput'].median():.1f} MB/s")
+    print(f"      Mean: {decrypt_data['Throughput'].mean():.1f} {UNIT}")
+    print(f"      Median: {decrypt_data['Throughput'].median():.1f} {UNIT}")
     print(
-        f"      Min/Max: {decrypt_data['Throughput'].min():.1f} / {decrypt_data['Throughput'].max():.1f} MB/s")
+        f"      Min/Max: {decrypt_data['Throughput'].min():.1f} / {decrypt_data['Throughput'].max():.1f} {UNIT}")
 
     # Chunk size impact analysis
     print(f"\n🧩 EFFECT OF CHUNK SIZE:")
-    for operation, data in [("Encryption", encrypt_data), ("Decryption", decrypt_data)]:
+    for operation, op, data in [("Encryption", 'encrypt', encrypt_data), ("Decryption", 'decrypt', decrypt_data)]:
+        if not frame_has_chunk_axis(data):
+            print(f"   {no_chunk_axis_note(op, data['ChunkBytes'].unique())}")
+            continue
         chunk_performance = data.groupby(
             'ChunkMB')['Throughput'].mean().sort_values(ascending=False)
         best_chunk = chunk_performance.index[0]
         worst_chunk = chunk_performance.index[-1]
         print(f"   {operation}:")
         print(
-            f"      Best chunk size: {best_chunk}MB ({chunk_performance[best_chunk]:.1f} MB/s)")
+            f"      Best chunk size: {format_mib(best_chunk)} ({chunk_performance[best_chunk]:.1f} {UNIT})")
         print(
-            f"      Worst chunk size: {worst_chunk}MB ({chunk_performance[worst_chunk]:.1f} MB/s)")
+            f"      Worst chunk size: {format_mib(worst_chunk)} ({chunk_performance[worst_chunk]:.1f} {UNIT})")
 
     print("\n" + "="*60)
 
 
-def main():
-    """Основная функция"""
+def main(results=None):
+    """Основная функция
+
+    results: optional pre-parsed SweepResults (shared by all_charts.py)
+    Returns True once the charts are saved, False on failure.
+    """
     try:
-        # Парсим данные из файла
-        encrypt_data, decrypt_data = parse_test_results('input.txt')
+        # Парсим данные из файла, если их не передали
+        if results is None:
+            encrypt_data, decrypt_data = parse_test_results('input.txt')
+        else:
+            encrypt_data, decrypt_data = results.encrypt, results.decrypt
 
         if encrypt_data.empty or decrypt_data.empty:
             print("Ошибка: не удалось найти данные в файле input.txt")
-            return
+            return False
 
         print(f"Загружено данных:")
         print(f"  Encryption: {len(encrypt_data)} записей")
@@ -272,13 +296,16 @@ def main():
                                encrypt_optimal, decrypt_optimal)
 
         plt.show()
+        return True
 
     except FileNotFoundError:
         print("Error: file 'input.txt' not found")
+        return False
     except Exception as e:
         print(f"Error: {e}")
         import traceback
         traceback.print_exc()
+        return False
 
 
 if __name__ == "__main__":
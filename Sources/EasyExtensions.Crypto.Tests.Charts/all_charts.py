@@ -5,6 +5,8 @@ import importlib
 import logging
 from pathlib import Path
 
+from sweep_parser import SweepFormatError, load_sweep_results
+
 # Ensure non-interactive backend for matplotlib in child modules before they import pyplot
 os.environ.setdefault("MPLBACKEND", "Agg")
 
@@ -12,8 +14,8 @@ ROOT = Path(__file__).parent.resolve()
 INPUT_DEFAULT = ROOT / "input.txt"
 
 
-def _run_module_main(module_name: str) -> None:
-    """Import module, patch plt.show to no-op, then call its main()."""
+def _run_module_main(module_name: str, results) -> bool:
+    """Import module, patch plt.show to no-op, then call its main() with shared results; False if it failed."""
     mod = importlib.import_module(module_name)
     # Patch plt.show to avoid GUI blocking
     if hasattr(mod, "plt") and hasattr(mod.plt, "show"):
@@ -23,24 +25,24 @@ def _run_module_main(module_name: str) -> None:
             logging.debug("Failed to patch plt.show for %s: %s", module_name, exc)
     # Call module main()
     if hasattr(mod, "main"):
-        mod.main()
+        return mod.main(results) is not False
     else:
         raise RuntimeError(f"Module '{module_name}' has no main() function")
 
 
-def generate_simple():
+def generate_simple(results) -> bool:
     print("\n=== ✅ Generating simple charts ===")
-    _run_module_main("simple_charts")
+    return _run_module_main("simple_charts", results)
 
 
-def generate_advanced():
+def generate_advanced(results) -> bool:
     print("\n=== ✅ Generating advanced charts ===")
-    _run_module_main("advanced_analysis")
+    return _run_module_main("advanced_analysis", results)
 
 
-def generate_mega():
+def generate_mega(results) -> bool:
     print("\n=== ✅ Generating MEGA charts ===")
-    _run_module_main("mega_advanced_analysis")
+    return _run_module_main("mega_advanced_analysis", results)
 
 
 def run_selected(sets: list[str]):
@@ -52,15 +54,30 @@ def run_selected(sets: list[str]):
         print(f"❌ Data file not found: {INPUT_DEFAULT}")
         sys.exit(1)
 
+    # Parse and validate once; every chart set reuses the same results
+    try:
+        results = load_sweep_results(INPUT_DEFAULT)
+    except SweepFormatError as exc:
+        print(f"❌ {exc}")
+        sys.exit(2)
+    print(f"✅ Parsed {INPUT_DEFAULT.name}: enc={len(results.encrypt)} rows, dec={len(results.decrypt)} rows")
+
+    failed = []
     for s in sets:
         if s == "simple":
-            generate_simple()
+            ok = generate_simple(results)
         elif s == "advanced":
-            generate_advanced()
+            ok = generate_advanced(results)
         elif s == "mega":
-            generate_mega()
+            ok = generate_mega(results)
         else:
             raise ValueError(f"Unknown set: {s}")
+        if not ok:
+            failed.append(s)
+
+    if failed:
+        print(f"\n❌ Failed: {', '.join(failed)} (see the errors above)")
+        sys.exit(3)
 
     print("\n🎉 Done. Files created (if enough data):")
     print("  • performance_charts.png")
@@ -0,0 +1,381 @@
+import json
+import math
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from cube import OPS, SweepCube
+from facets import DEFAULT_WINDOW_CAP, NO_MEMORY_LIMIT, memory_limit_label
+from iteration_planner import CELL_FIELDS, Cell, run_round
+from sweep_orchestrator import (CHUNK_BYTES_VARIABLE, MEMORY_LIMITS_VARIABLE, MIN_MEMORY_LIMIT, MIN_WINDOW_CAP,
+                                THREADS_VARIABLE, WINDOW_CAPS_VARIABLE)
+from units import GIB, KIB, MIB, SAMPLE_THROUGHPUT_UNIT, format_size
+
+
+# AesGcmStreamCipher chunk bounds (MinChunkSize, MaxChunkSize) and its default threadsLimitMultiplier:
+# threads may be at most ProcessorCount * 2
+MIN_CHUNK_BYTES = 8 * KIB
+MAX_CHUNK_BYTES = 64 * MIB
+THREADS_LIMIT_MULTIPLIER = 2
+
+DEFAULT_BUDGET = 30
+DEFAULT_INITIAL = 8
+DEFAULT_BATCH = 4
+DEFAULT_ITERATIONS = 2
+DEFAULT_MAX_WINDOW_CAP = 4096
+DEFAULT_MAX_MEMORY_LIMIT = 4 * GIB
+# Stop once no candidate is expected to beat the best score by this share
+DEFAULT_MIN_GAIN = 0.005
+# The top of the memory axis stands for "no limit", the cipher default
+_NO_LIMIT_SHARE = 0.1
+_CANDIDATES = 4096
+_SEED = 0
+# Hyperparameters tried when fitting the GP (inputs and log-scores are normalised)
+_LENGTHSCALES = (0.1, 0.2, 0.35, 0.5, 0.8, 1.2)
+_NOISES = (1e-4, 1e-3, 1e-2, 0.05, 0.1)
+_erf = np.vectorize(math.erf)
+
+
+@dataclass(frozen=True)
+class CipherConfig:
+    """One point of the search: AesGcmStreamCipher constructor arguments plus the EncryptAsync chunk size."""
+    threads: int
+    chunk_bytes: int
+    window_cap: int = DEFAULT_WINDOW_CAP
+    memory_limit_bytes: int = NO_MEMORY_LIMIT
+
+    def cell(self, op: str) -> Cell:
+        return op, self.threads, self.chunk_bytes, self.window_cap, self.memory_limit_bytes
+
+    def label(self) -> str:
+        return (f"{self.threads}T, {format_size(self.chunk_bytes)} chunks, window {self.window_cap}, "
+                f"{memory_limit_label(self.memory_limit_bytes)}")
+
+    def constructor(self) -> str:
+        """C# to build the cipher with this configuration."""
+        limit = "null" if self.memory_limit_bytes == NO_MEMORY_LIMIT else f"{self.memory_limit_bytes}"
+        return (f"new AesGcmStreamCipher(masterKey, threads: {self.threads}, windowCap: {self.window_cap}, "
+                f"memoryLimitBytes: {limit})")
+
+    def encrypt_call(self) -> str:
+        return f"cipher.EncryptAsync(input, output, chunkSize: {self.chunk_bytes})"
+
+
+@dataclass(frozen=True)
+class SearchSpace:
+    """Bounds of the tuned arguments. Every axis is searched on a log scale."""
+    max_threads: int
+    min_chunk: int = MIN_CHUNK_BYTES
+    max_chunk: int = MAX_CHUNK_BYTES
+    max_window_cap: int = DEFAULT_MAX_WINDOW_CAP
+    max_memory_limit: int = DEFAULT_MAX_MEMORY_LIMIT
+    tune_memory_limit: bool = True
+
+    def __post_init__(self) -> None:
+        if self.max_threads < 1:
+            raise ValueError("max_threads must be positive")
+        if not MIN_CHUNK_BYTES <= self.min_chunk <= self.max_chunk <= MAX_CHUNK_BYTES:
+            raise ValueError(f"chunk sizes must lie within {format_size(MIN_CHUNK_BYTES)}.."
+                             f"{format_size(MAX_CHUNK_BYTES)}")
+        if self.max_window_cap < MIN_WINDOW_CAP:
+            raise ValueError(f"max_window_cap must be at least {MIN_WINDOW_CAP}")
+        if self.max_memory_limit < MIN_MEMORY_LIMIT:
+            raise ValueError(f"max_memory_limit must be at least {format_size(MIN_MEMORY_LIMIT)}")
+
+    @property
+    def _bounds(self) -> np.ndarray:
+        # log2 bounds of threads, chunk, window cap and memory limit
+        return np.log2([[1, self.max_threads], [self.min_chunk, self.max_chunk],
+                        [MIN_WINDOW_CAP, self.max_window_cap], [MIN_MEMORY_LIMIT, self.max_memory_limit]])
+
+    def decode(self, x: np.ndarray) -> CipherConfig:
+        """Config at a point of the unit cube (threads, chunk, window cap, memory limit)."""
+        lo, hi = self._bounds.T
+        share = np.append(x[:3], min(x[3] / (1 - _NO_LIMIT_SHARE), 1.0))
+        v = np.exp2(lo + share * (hi - lo))
+        chunk = int(np.clip(round(v[1] / KIB) * KIB, self.min_chunk, self.max_chunk))
+        limit = NO_MEMORY_LIMIT
+        if self.tune_memory_limit and x[3] < 1 - _NO_LIMIT_SHARE:
+            limit = int(max(round(v[3] / KIB) * KIB, MIN_MEMORY_LIMIT))
+        return CipherConfig(threads=int(np.clip(round(v[0]), 1, self.max_threads)), chunk_bytes=chunk,
+                            window_cap=int(max(round(v[2]), MIN_WINDOW_CAP)), memory_limit_bytes=limit)
+
+    def encode(self, config: CipherConfig) -> np.ndarray:
+        """Inverse of decode(), so measured configs sit exactly where they were rounded to."""
+        lo, hi = self._bounds.T
+        limit = config.memory_limit_bytes if config.memory_limit_bytes != NO_MEMORY_LIMIT else self.max_memory_limit
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = (np.log2([config.threads, config.chunk_bytes, config.window_cap, limit]) - lo) / (hi - lo)
+        x = np.nan_to_num(np.clip(x, 0.0, 1.0))
+        if config.memory_limit_bytes == NO_MEMORY_LIMIT:
+            x[3] = 1 - _NO_LIMIT_SHARE / 2
+        else:
+            x[3] *= 1 - _NO_LIMIT_SHARE
+        return x
+
+
+def default_max_threads(cpus: Sequence[int] = ()) -> int:
+    """Largest thread count the cipher accepts on the CPUs a run may use (all of them when not pinned)."""
+    count = len(cpus)
+    if not count:
+        count = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    return max(1, count * THREADS_LIMIT_MULTIPLIER)
+
+
+def _matern52(a: np.ndarray, b: np.ndarray, lengthscale: float) -> np.ndarray:
+    d = np.sqrt(((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=-1)) / lengthscale
+    return (1 + math.sqrt(5) * d + 5.0 / 3.0 * d ** 2) * np.exp(-math.sqrt(5) * d)
+
+
+class GaussianProcess:
+    """Matérn 5/2 Gaussian process over the unit cube, on standardised targets.
+
+    The lengthscale and noise are chosen from a small grid by log marginal
+    likelihood, which is plenty for the few dozen points a tuning run sees.
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, lengthscale: Optional[float] = None,
+                 noise: Optional[float] = None) -> None:
+        self.x = x
+        self.mu = float(y.mean())
+        self.sd = float(y.std()) or 1.0
+        self.y = (y - self.mu) / self.sd
+        if lengthscale is None or noise is None:
+            lengthscale, noise = max(((ls, n) for ls in _LENGTHSCALES for n in _NOISES),
+                                     key=lambda p: self._log_likelihood(*p))
+        self.lengthscale, self.noise = lengthscale, noise
+        self._chol, self._alpha = self._factor(lengthscale, noise)
+
+    def _factor(self, lengthscale: float, noise: float) -> Tuple[np.ndarray, np.ndarray]:
+        k = _matern52(self.x, self.x, lengthscale) + (noise + 1e-9) * np.eye(len(self.x))
+        chol = np.linalg.cholesky(k)
+        alpha = np.linalg.solve(chol.T, np.linalg.solve(chol, self.y))
+        return chol, alpha
+
+    def _log_likelihood(self, lengthscale: float, noise: float) -> float:
+        try:
+            chol, alpha = self._factor(lengthscale, noise)
+        except np.linalg.LinAlgError:
+            return -np.inf
+        return float(-0.5 * self.y @ alpha - np.log(np.diag(chol)).sum())
+
+    def predict(self, xs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Posterior mean and standard deviation at xs, in the units of y."""
+        k = _matern52(xs, self.x, self.lengthscale)
+        mean = k @ self._alpha
+        v = np.linalg.solve(self._chol, k.T)
+        var = np.maximum(1.0 - (v ** 2).sum(axis=0), 1e-12)
+        return self.mu + self.sd * mean, self.sd * np.sqrt(var)
+
+
+def expected_improvement(mean: np.ndarray, std: np.ndarray, best: float) -> np.ndarray:
+    """Expected amount by which each point beats best (maximisation)."""
+    z = (mean - best) / std
+    cdf = 0.5 * (1 + _erf(z / math.sqrt(2)))
+    pdf = np.exp(-0.5 * z ** 2) / math.sqrt(2 * math.pi)
+    return (mean - best) * cdf + std * pdf
+
+
+def propose(space: SearchSpace, seen: Sequence[CipherConfig], scores: np.ndarray, batch: int,
+            rng: np.random.Generator) -> Tuple[List[CipherConfig], float]:
+    """Next batch of untried configs by expected improvement of the log score, and the batch's best EI.
+
+    Later picks in a batch assume the earlier ones score their predicted mean
+    (kriging believer), which spreads the batch out instead of stacking it.
+    """
+    x = np.array([space.encode(c) for c in seen])
+    y = np.log(scores)
+    gp = GaussianProcess(x, y)
+    # Random points, plus local moves around the best configs so far
+    top = x[np.argsort(y)[-3:]]
+    local = np.clip(top[rng.integers(len(top), size=_CANDIDATES // 4)]
+                    + rng.normal(0, 0.05, size=(_CANDIDATES // 4, x.shape[1])), 0, 1)
+    pool = np.vstack([rng.random((_CANDIDATES, x.shape[1])), local])
+    configs: Dict[CipherConfig, np.ndarray] = {}
+    for point in pool:
+        config = space.decode(point)
+        if config not in configs:
+            configs[config] = space.encode(config)
+    tried = set(seen)
+    candidates = [c for c in configs if c not in tried]
+    if not candidates:
+        return [], 0.0
+    cx = np.array([configs[c] for c in candidates])
+    picked: List[CipherConfig] = []
+    best_gain = 0.0
+    for _ in range(min(batch, len(candidates))):
+        mean, std = gp.predict(cx)
+        ei = expected_improvement(mean, std, float(gp.y.max() * gp.sd + gp.mu))
+        ei[[candidates.index(c) for c in picked]] = -np.inf
+        i = int(np.argmax(ei))
+        best_gain = max(best_gain, float(ei[i]))
+        picked.append(candidates[i])
+        gp = GaussianProcess(np.vstack([gp.x, cx[i]]), np.append(gp.y * gp.sd + gp.mu, mean[i]),
+                             gp.lengthscale, gp.noise)
+    return picked, best_gain
+
+
+def initial_design(space: SearchSpace, count: int, rng: np.random.Generator) -> List[CipherConfig]:
+    """Latin hypercube sample of up to count configs (fewer if several round to the same one)."""
+    dims = 4
+    strata = (rng.permuted(np.tile(np.arange(count), (dims, 1)), axis=1).T + rng.random((count, dims))) / count
+    configs = list(dict.fromkeys(space.decode(p) for p in strata))
+    return configs[:count]
+
+
+def score(measurements: pd.DataFrame, ops: Sequence[str]) -> Dict[CipherConfig, Dict[str, float]]:
+    """Mean throughput (MiB/s) per op of every config in measurements, plus their geometric mean as 'score'."""
+    means = measurements.groupby(CELL_FIELDS)["Throughput"].mean()
+    result: Dict[CipherConfig, Dict[str, float]] = {}
+    for (op, threads, chunk, window, limit), value in means.items():
+        config = CipherConfig(int(threads), int(chunk), int(window), int(limit))
+        result.setdefault(config, {})[op] = float(value)
+    for values in result.values():
+        measured = [values[op] for op in ops if op in values]
+        values["score"] = float(np.exp(np.mean(np.log(measured)))) if len(measured) == len(ops) else math.nan
+    return result
+
+
+@dataclass
+class TuneResult:
+    best: CipherConfig
+    evaluations: pd.DataFrame        # one row per tried config, in order (Round, config columns, per-op MiB/s, Score)
+    ops: List[str]
+    rounds: int
+    stopped: str                     # "budget" or "converged"
+
+    @property
+    def best_row(self) -> pd.Series:
+        return self.evaluations.loc[self.evaluations["Score"].idxmax()]
+
+    def to_json(self) -> Dict:
+        row = self.best_row
+        return {
+            "config": {"threads": self.best.threads, "chunkBytes": self.best.chunk_bytes,
+                       "windowCap": self.best.window_cap,
+                       "memoryLimitBytes": None if self.best.memory_limit_bytes == NO_MEMORY_LIMIT
+                       else self.best.memory_limit_bytes},
+            "constructor": self.best.constructor(),
+            "encryptCall": self.best.encrypt_call(),
+            "ops": self.ops,
+            "scoreMiBps": float(row["Score"]),
+            "throughputMiBps": {op: float(row[op]) for op in self.ops},
+            "evaluations": len(self.evaluations),
+            "rounds": self.rounds,
+            "stopped": self.stopped,
+            "timestamp": pd.Timestamp.utcnow().strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+
+
+def tune(project: Path, work_dir: Path, space: SearchSpace, ops: Sequence[str] = OPS,
+         budget: int = DEFAULT_BUDGET, initial: int = DEFAULT_INITIAL, batch: int = DEFAULT_BATCH,
+         iterations: int = DEFAULT_ITERATIONS, min_gain: float = DEFAULT_MIN_GAIN, seed: int = _SEED,
+         dotnet: str = "dotnet", extra_args: Sequence[str] = (), settings: Optional[Dict[str, str]] = None,
+         cpus: Sequence[int] = ()) -> TuneResult:
+    """Bayesian optimisation of the cipher's throughput over space.
+
+    A Latin hypercube of `initial` configs is measured first; every further
+    round measures `batch` configs picked by expected improvement of the
+    log throughput (the geometric mean over ops) under a Gaussian process.
+    Each round is one dotnet test run of just those cells. The search stops
+    after `budget` configs, or once no candidate is expected to gain more
+    than min_gain (relative) on the best one.
+    """
+    work_dir.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    ops = list(ops)
+    tried: List[CipherConfig] = []
+    rows: List[Dict] = []
+    pending = initial_design(space, min(initial, budget), rng)
+    stopped = "budget"
+    number = 0
+    while pending:
+        number += 1
+        cells = [c.cell(op) for c in pending for op in ops]
+        env = dict(settings or {})
+        env[THREADS_VARIABLE] = ",".join(str(t) for t in sorted({c.threads for c in pending}))
+        env[CHUNK_BYTES_VARIABLE] = ",".join(str(b) for b in sorted({c.chunk_bytes for c in pending}))
+        env[WINDOW_CAPS_VARIABLE] = ",".join(str(w) for w in sorted({c.window_cap for c in pending}))
+        env[MEMORY_LIMITS_VARIABLE] = ",".join(str(m) for m in sorted({c.memory_limit_bytes for c in pending}))
+        measured = score(run_round(project, iterations, cells, work_dir / f"tune-{number}.jsonl", dotnet,
+                                   extra_args, env, cpus), ops)
+        for config in pending:
+            values = measured.get(config, {})
+            rows.append({"Round": number, "Threads": config.threads, "ChunkBytes": config.chunk_bytes,
+                         "WindowCap": config.window_cap, "MemoryLimitBytes": config.memory_limit_bytes,
+                         **{op: values.get(op, math.nan) for op in ops}, "Score": values.get("score", math.nan)})
+            tried.append(config)
+        evaluations = pd.DataFrame(rows)
+        ok = evaluations["Score"].notna()
+        if not ok.any():
+            raise RuntimeError("the test runs measured none of the proposed configs")
+        best = evaluations.loc[evaluations["Score"].idxmax()]
+        print(f"[tune {number}] {len(evaluations)} configs, best {best['Score']:.1f} "
+              f"{SAMPLE_THROUGHPUT_UNIT.name}: {tried[int(best.name)].label()}", flush=True)
+        if len(tried) >= budget:
+            break
+        # Configs that failed to measure stay in tried (never re-proposed) but out of the model
+        measured_configs = [c for c, m in zip(tried, ok) if m]
+        pending, gain = propose(space, measured_configs, evaluations.loc[ok, "Score"].to_numpy(),
+                                min(batch, budget - len(tried)), rng)
+        pending = [c for c in pending if c not in tried]
+        if gain < math.log1p(min_gain):
+            stopped = "converged"
+            break
+    evaluations = pd.DataFrame(rows)
+    best = tried[int(evaluations["Score"].idxmax())]
+    return TuneResult(best, evaluations, ops, number, stopped)
+
+
+def write_result(result: TuneResult, path: Path) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(result.to_json(), f, indent=2)
+
+
+@dataclass(frozen=True)
+class Recommendation:
+    """What _plot_recommendations shows: a cipher configuration and where it came from."""
+    config: CipherConfig
+    source: str                      # e.g. "auto-tune, 24 configs" or "best measured cell"
+    throughput: Dict[str, float] = field(default_factory=dict)   # MiB/s per op
+
+    def lines(self) -> List[str]:
+        """The constructor and EncryptAsync call, wrapped to fit a chart panel."""
+        c = self.config
+        limit = "null" if c.memory_limit_bytes == NO_MEMORY_LIMIT else f"{c.memory_limit_bytes}"
+        return [f"Recommended ({self.source}):",
+                "  new AesGcmStreamCipher(masterKey,",
+                f"      threads: {c.threads}, windowCap: {c.window_cap},",
+                f"      memoryLimitBytes: {limit})",
+                f"  EncryptAsync(..., chunkSize: {c.chunk_bytes})  // {format_size(c.chunk_bytes)}"]
+
+
+def load_recommendation(path: Path) -> Recommendation:
+    """Recommendation of an auto-tune result written by write_result()."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    c = data["config"]
+    config = CipherConfig(int(c["threads"]), int(c["chunkBytes"]), int(c["windowCap"]),
+                          int(c["memoryLimitBytes"] or NO_MEMORY_LIMIT))
+    return Recommendation(config, f"auto-tune, {data['evaluations']} configs", data.get("throughputMiBps", {}))
+
+
+def recommend_from_cube(cube: SweepCube) -> Recommendation:
+    """Recommendation from a measured threads x chunk sweep: the cell with the best geometric mean over ops.
+
+    Ops without a chunk axis (see SweepCube.has_chunk_axis) cannot pick a
+    chunk size and are left out. The cube holds the default window cap / memory limit.
+    """
+    ops = [op for op in OPS if cube.has_op(op) and cube.has_chunk_axis(op)] or [op for op in OPS if cube.has_op(op)]
+    means = np.stack([cube.stats(op).mean for op in ops])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        geo = np.exp(np.log(means).mean(axis=0))
+    t, c = np.unravel_index(np.nanargmax(geo), geo.shape)
+    config = CipherConfig(int(cube.threads[t]), int(cube.chunk_bytes[c]))
+    to_mibps = lambda v: float(SAMPLE_THROUGHPUT_UNIT.from_bps(cube.unit.to_bps(v)))
+    return Recommendation(config, "best measured cell" if len(ops) == 2 else f"best measured {ops[0]} cell",
+                          {op: to_mibps(m[t, c]) for op, m in zip(ops, means)})
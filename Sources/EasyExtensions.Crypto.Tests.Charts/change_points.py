@@ -0,0 +1,154 @@
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from facets import default_facet
+from history_store import HistoryStore
+
+
+SERIES_KEY = ["Host", "Op", "Threads", "ChunkBytes"]
+DEFAULT_PENALTY = 2.0
+DEFAULT_MIN_SIZE = 2
+DEFAULT_MIN_SHIFT = 0.02
+_MAD_SCALE = 1.4826
+
+
+@dataclass
+class ChangePoint:
+    """A throughput shift in one cell's history, between two consecutive runs."""
+    host: str
+    op: str
+    threads: int
+    chunk_bytes: int
+    index: int                 # position of the first run after the shift
+    before_sha: str            # last commit measured at the old level
+    after_sha: str             # first commit measured at the new level
+    before_ts: pd.Timestamp
+    after_ts: pd.Timestamp
+    before: float              # segment means, MiB/s
+    after: float
+
+    @property
+    def shift(self) -> float:
+        return (self.after - self.before) / self.before
+
+    @property
+    def commit_range(self) -> str:
+        """The git range the change landed in, usable as `git log <range>`."""
+        return f"{self.before_sha[:10]}..{self.after_sha[:10]}"
+
+
+def noise_sigma(x: np.ndarray) -> float:
+    """Robust noise level of a series: MAD of first differences, which ignores level shifts."""
+    if len(x) < 3:
+        return float(np.std(x))
+    d = np.diff(x)
+    return float(_MAD_SCALE * np.median(np.abs(d - np.median(d))) / np.sqrt(2.0))
+
+
+def pelt(x: np.ndarray, penalty: float, min_size: int = DEFAULT_MIN_SIZE) -> List[int]:
+    """Optimal partitioning of x into constant-mean segments (PELT, squared-error cost).
+
+    Returns the start indices of every segment but the first. The cost of all
+    candidate last-change positions is evaluated at once from cumulative
+    sums; candidates that can never win again are pruned, so the whole
+    search is close to linear in len(x).
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    if n < 2 * min_size:
+        return []
+    s1 = np.concatenate(([0.0], np.cumsum(x)))
+    s2 = np.concatenate(([0.0], np.cumsum(x * x)))
+
+    def cost(s: np.ndarray, t: int) -> np.ndarray:
+        return (s2[t] - s2[s]) - (s1[t] - s1[s]) ** 2 / (t - s)
+
+    best = np.full(n + 1, np.inf)
+    best[0] = -penalty
+    last = np.zeros(n + 1, dtype=int)
+    candidates = np.array([0])
+    for t in range(1, n + 1):
+        # A candidate worse than u = t - min_size at u never wins again: u may
+        # close the last segment of t and every later end. (t itself may not
+        # for the next min_size - 1 ends, so pruning against t is unsafe.)
+        u = t - min_size
+        if u >= min_size and np.isfinite(best[u]):
+            before = u - candidates >= min_size
+            old = candidates[before]
+            candidates = np.concatenate((old[best[old] + cost(old, u) <= best[u]], candidates[~before]))
+        s = candidates[t - candidates >= min_size]
+        if s.size:
+            total = best[s] + cost(s, t)
+            k = int(np.argmin(total))
+            best[t] = total[k] + penalty
+            last[t] = s[k]
+        candidates = np.append(candidates, t)
+
+    changes = []
+    t = last[n]
+    while t > 0:
+        changes.append(int(t))
+        t = last[t]
+    return changes[::-1]
+
+
+def segment_bounds(x: np.ndarray, penalty: float = DEFAULT_PENALTY, min_size: int = DEFAULT_MIN_SIZE) -> List[int]:
+    """Segment starts of x plus len(x), with the penalty scaled as detect() describes."""
+    x = np.asarray(x, dtype=float)
+    sigma = noise_sigma(x)
+    if sigma == 0.0:
+        sigma = 1e-6 * max(abs(float(np.mean(x))), 1.0)
+    return [0] + pelt(x, penalty * sigma ** 2 * np.log(len(x)), min_size) + [len(x)]
+
+
+def current_level_start(x: np.ndarray, penalty: float = DEFAULT_PENALTY, min_size: int = DEFAULT_MIN_SIZE,
+                        min_shift: float = DEFAULT_MIN_SHIFT) -> int:
+    """Index of the first value after the last shift of at least min_shift (0 if there is none)."""
+    x = np.asarray(x, dtype=float)
+    bounds = segment_bounds(x, penalty, min_size)
+    for a, b, c in reversed(list(zip(bounds, bounds[1:], bounds[2:]))):
+        before = float(x[a:b].mean())
+        if abs((float(x[b:c].mean()) - before) / before) >= min_shift:
+            return b
+    return 0
+
+
+def cell_series(store: HistoryStore, op: Optional[str] = None, threads: Optional[int] = None,
+                chunk_bytes: Optional[int] = None, host: Optional[str] = None) -> pd.DataFrame:
+    """Per-run mean of every matching cell, oldest run first.
+
+    Columns: SERIES_KEY + RunId, Timestamp, GitSha, Throughput (MiB/s). Only
+    cells measured with the default window cap and memory limit are tracked.
+    """
+    history = default_facet(store.load(op=op, threads=[threads] if threads is not None else None,
+                                       chunk_bytes=[chunk_bytes] if chunk_bytes is not None else None, host=host))
+    if history.empty:
+        return pd.DataFrame(columns=SERIES_KEY + ["RunId", "Timestamp", "GitSha", "Throughput"])
+    series = (history.groupby(SERIES_KEY + ["RunId", "Timestamp", "GitSha"], observed=True)["Throughput"]
+              .mean().reset_index())
+    return series.sort_values(SERIES_KEY + ["Timestamp"], kind="stable").reset_index(drop=True)
+
+
+def detect(series: pd.DataFrame, penalty: float = DEFAULT_PENALTY, min_size: int = DEFAULT_MIN_SIZE,
+           min_shift: float = DEFAULT_MIN_SHIFT) -> Iterator[ChangePoint]:
+    """Change points of every cell in cell_series() output.
+
+    The penalty is penalty * sigma^2 * log(n), a BIC-style cost per extra
+    segment scaled by the series' own robust noise level, so noisy cells need
+    a bigger jump. Shifts smaller than min_shift (relative) are dropped.
+    """
+    for key, cell in series.groupby(SERIES_KEY, sort=True):
+        x = cell["Throughput"].to_numpy(dtype=float)
+        bounds = segment_bounds(x, penalty, min_size)
+        means = [float(x[a:b].mean()) for a, b in zip(bounds, bounds[1:])]
+        shas = cell["GitSha"].to_numpy()
+        stamps = cell["Timestamp"].to_numpy()
+        host, op, threads, chunk = key
+        for i, idx in enumerate(bounds[1:-1]):
+            cp = ChangePoint(str(host), str(op), int(threads), int(chunk), idx, str(shas[idx - 1]), str(shas[idx]),
+                             pd.Timestamp(stamps[idx - 1]), pd.Timestamp(stamps[idx]), means[i], means[i + 1])
+            if abs(cp.shift) >= min_shift:
+                yield cp
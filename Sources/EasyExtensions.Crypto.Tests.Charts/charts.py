@@ -1,21 +1,80 @@
+import argparse
+import importlib
 import re
 import sys
+import time
 from pathlib import Path
-from typing import Tuple, Optional
+from types import ModuleType
+from typing import Dict, List, Tuple, Optional
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-try:
-    import seaborn as sns  # optional, best effort
-except Exception:  # pragma: no cover
-    sns = None
-import matplotlib.gridspec as gridspec
+
+from auto_tune import (DEFAULT_BATCH, DEFAULT_BUDGET, DEFAULT_INITIAL, DEFAULT_ITERATIONS, DEFAULT_MAX_MEMORY_LIMIT,
+                       DEFAULT_MAX_WINDOW_CAP, DEFAULT_MIN_GAIN, Recommendation, SearchSpace, default_max_threads,
+                       load_recommendation, recommend_from_cube, tune, write_result)
+from change_points import (DEFAULT_MIN_SHIFT, DEFAULT_MIN_SIZE, DEFAULT_PENALTY, SERIES_KEY, ChangePoint,
+                           cell_series, detect)
+from cpu_topology import UNPINNED, CpuLayout, measured_layout
+from cube import OPS, CellStats, SweepCube
+from facets import (DEFAULT_FACET, NO_MEMORY_LIMIT, default_facet, facet_label, facet_table, facet_values, format_facet_summary,
+                    memory_limit_label, memory_limit_order, select_facet)
+from history_store import HistoryStore, record_file
+from ingest import expand_inputs, ingest_files
+from jsonl_loader import load_measurements
+from iteration_planner import (DEFAULT_INITIAL_ITERATIONS, DEFAULT_MAX_ITERATIONS, DEFAULT_MAX_ROUNDS,
+                               DEFAULT_ROUND_ITERATIONS, DEFAULT_TARGET_WIDTH, plan, write_measurements)
+from log_follow import LogFollower
+from metrics import ZONE_HIGH, ZONE_MEDIUM, SweepMetrics, compute_metrics, format_summary
+from result_cache import cached_frames, write_frames
+from regression_gate import (DEFAULT_MIN_THRESHOLD, DEFAULT_SIGMAS, DEFAULT_WINDOW, EXIT_NO_DATA,
+                             run_gate)
+from results_db import QUERIES, ResultsDb
+from sweep_diff import DEFAULT_ALPHA, SweepDiff, diff_cubes
+from sweep_orchestrator import (CHUNK_BYTES_VARIABLE, ITERATIONS_VARIABLE, MEMORY_LIMITS_VARIABLE, THREADS_VARIABLE,
+                                WINDOW_CAPS_VARIABLE, load_spec, placement_environment, resolve_placements, run_sweep)
+from sweep_parser import parse_sweep_frames, parse_sweep_samples, rows_to_samples
+from units import (DEFAULT_DISPLAY_UNIT, OPENSSL_K_UNIT, SAMPLE_THROUGHPUT_UNIT, THROUGHPUT_UNITS, Unit, format_size,
+                   parse_size, throughput_unit)
 
 
 ROOT = Path(__file__).parent.resolve()
+# Backends that only render to files; --follow then just rewrites the PNG
+_FILE_BACKENDS = {"agg", "cairo", "pdf", "pgf", "ps", "svg", "template"}
 MYLIB_INPUT_DEFAULT = ROOT / "input.txt"
 OPENSSL_INPUT_DEFAULT = ROOT / "input-openssl.txt"
+HISTORY_DEFAULT = ROOT / "history"
+AUTO_TUNE_DEFAULT = ROOT / "auto-tune.json"
+TESTS_PROJECT_DEFAULT = ROOT.parent / "EasyExtensions.Crypto.Tests"
+DB_NAME = "results.sqlite"
+# Bump when parse_openssl_results output changes (invalidates cached tables)
+OPENSSL_PARSER_VERSION = 2
+
+
+class _LazyModule(ModuleType):
+    """Stand-in that imports the real module on first attribute access.
+
+    Keeps matplotlib (slow to import, and unusable on some CI images) out of
+    text-only commands such as --summary-only, record and query.
+    """
+
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+
+    def __getattr__(self, attr: str):
+        return getattr(importlib.import_module(self.__name__), attr)
+
+
+plt = _LazyModule("matplotlib.pyplot")
+gridspec = _LazyModule("matplotlib.gridspec")
+
+
+def _seaborn() -> Optional[ModuleType]:
+    try:
+        import seaborn  # optional, best effort
+    except Exception:  # pragma: no cover
+        return None
+    return seaborn
 
 
 def parse_mylib_results(filename: Path) -> Tuple[pd.DataFrame, pd.DataFrame]:
@@ -26,32 +85,14 @@ def parse_mylib_results(filename: Path) -> Tuple[pd.DataFrame, pd.DataFrame]:
       === DECRYPTION THREAD/CHUNK SWEEP ===
 
     And table lines: Threads | ChunkMB | Avg MB/s
-    Returns two DataFrames with columns: Threads, ChunkMB, Throughput
+    The log is streamed line by line (see sweep_parser), so large console
+    captures are read once with constant parser memory; the parsed tables are
+    cached in .chart-cache/ keyed by file content and parser version.
+    Returns two per-cell DataFrames with sweep_parser.FRAME_COLUMNS: Threads,
+    ChunkBytes (exact), ChunkMB (MiB, for display), Throughput (mean MiB/s),
+    ThroughputMin/Median/Max and Samples (iterations behind the mean).
     """
-
-    text = filename.read_text(encoding="utf-8", errors="ignore")
-
-    enc_sec = re.search(r"===\s*ENCRYPTION THREAD/CHUNK SWEEP\s*===(.*?)(?===|\Z)", text, re.DOTALL)
-    dec_sec = re.search(r"===\s*DECRYPTION THREAD/CHUNK SWEEP\s*===(.*?)(?===|\Z)", text, re.DOTALL)
-
-    def extract(section: Optional[re.Match]) -> pd.DataFrame:
-        if not section:
-            return pd.DataFrame(columns=["Threads", "ChunkMB", "Throughput"])
-        body = section.group(1)
-        # pattern matches: threads | chunk (can be decimal) | throughput (decimal)
-        pat = re.compile(r"(\d+)\s*\|\s*([\d.]+)\s*\|\s*([\d.]+)")
-        rows = []
-        for th, ch, thr in pat.findall(body):
-            rows.append({
-                "Threads": int(th),
-                "ChunkMB": float(ch),
-                "Throughput": float(thr),
-            })
-        return pd.DataFrame(rows)
-
-    enc_df = extract(enc_sec)
-    dec_df = extract(dec_sec)
-    return enc_df, dec_df
+    return parse_sweep_frames(filename)
 
 
 def parse_openssl_results(filename: Path) -> pd.DataFrame:
@@ -62,10 +103,15 @@ def parse_openssl_results(filename: Path) -> pd.DataFrame:
       header: type  16 bytes 64 bytes ...
       row:    AES-128-GCM  103872.58k ...
 
-    Returns DataFrame with columns: BlockBytes, ThroughputMBps, Label
-    ThroughputMBps is decimal MB/s (1 MB = 1,000,000 bytes).
+    Returns DataFrame with columns: BlockBytes, ThroughputBps, Label
+    ThroughputBps is canonical bytes/s ('k' is exactly 1000 bytes/s).
     """
+    frames = cached_frames(filename, "openssl", OPENSSL_PARSER_VERSION,
+                           lambda: {"openssl": _parse_openssl_text(filename)})
+    return frames["openssl"]
+
 
+def _parse_openssl_text(filename: Path) -> pd.DataFrame:
     text = filename.read_text(encoding="utf-8", errors="ignore")
     # Find header line with sizes and the AES-128-GCM row
     header_match = re.search(r"^type\s+((?:\d+\s+bytes\s+)+)\s*$", text, re.MULTILINE)
@@ -87,9 +133,7 @@ def parse_openssl_results(filename: Path) -> pd.DataFrame:
             block = int(m.group(1))
             ops = int(m.group(2))
             secs = float(m.group(3))
-            bytes_per_sec = ops * block / secs
-            mbps = bytes_per_sec / 1_000_000.0
-            data.append({"BlockBytes": block, "ThroughputMBps": mbps, "Label": "OpenSSL AES-128-GCM"})
+            data.append({"BlockBytes": block, "ThroughputBps": ops * block / secs, "Label": "OpenSSL AES-128-GCM"})
         return pd.DataFrame(sorted(data, key=lambda r: r["BlockBytes"]))
 
     # Parse sizes from header
@@ -102,94 +146,222 @@ def parse_openssl_results(filename: Path) -> pd.DataFrame:
     size_vals = size_vals[:n]
     row_vals = row_vals[:n]
 
-    # Convert k (thousands of bytes/s) to MB/s (decimal)
-    mbps = [v / 1000.0 for v in row_vals]
     df = pd.DataFrame({
         "BlockBytes": size_vals,
-        "ThroughputMBps": mbps,
+        "ThroughputBps": OPENSSL_K_UNIT.to_bps(row_vals),
         "Label": ["OpenSSL AES-128-GCM"] * n,
     })
     return df.sort_values("BlockBytes").reset_index(drop=True)
 
 
-def plot_mylib_four_panels(enc: pd.DataFrame, dec: pd.DataFrame, out_path: Path) -> None:
-    """Create 4-panel figure for my library: throughput vs chunk size (per threads) and vs threads (per chunk)."""
-    if enc.empty or dec.empty:
-        print("[warn] CottonCrypto data is empty; skipping library_performance.png")
+def _plot_with_spread(ax, x, s: CellStats, **kwargs) -> None:
+    """Plot mean throughput against x, with min..max whiskers and a median tick per point.
+
+    Unmeasured (NaN) cells are skipped. Whiskers are only drawn for cells
+    measured more than once, so logs without per-iteration samples render as
+    plain lines.
+    """
+    x = np.asarray(x)
+    ok = ~np.isnan(s.mean)
+    line, = ax.plot(x[ok], s.mean[ok], **kwargs)
+    spread = ok & (s.count > 1)
+    if not spread.any():
         return
+    color = line.get_color()
+    mean = s.mean[spread]
+    # Clip float rounding (mean of identical samples can land a hair outside min..max)
+    yerr = np.clip([mean - s.min[spread], s.max[spread] - mean], 0.0, None)
+    ax.errorbar(x[spread], mean, yerr=yerr,
+                fmt="none", ecolor=color, elinewidth=1.0, capsize=3, alpha=0.7)
+    ax.plot(x[spread], s.median[spread], linestyle="none", marker="_", markersize=8, color=color)
 
+
+# Panels of plot_mylib_four_panels in axes order: (op, x axis)
+MYLIB_PANELS = [("encrypt", "ChunkMB"), ("decrypt", "ChunkMB"), ("encrypt", "Threads"), ("decrypt", "Threads")]
+THREAD_COLORS = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b"]
+CHUNK_COLORS = ["#e41a1c", "#377eb8", "#4daf4a", "#984ea3", "#ff7f00", "#a65628", "#f781bf"]
+
+
+def _mylib_figure():
+    """Empty 2x2 figure used by plot_mylib_four_panels (and --follow)."""
     plt.rcParams["figure.facecolor"] = "white"
     plt.rcParams["axes.facecolor"] = "white"
     plt.rcParams["axes.grid"] = True
     plt.rcParams["grid.alpha"] = 0.3
 
     fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-    (ax1, ax2), (ax3, ax4) = axes
     fig.suptitle("CottonCrypto Performance: Encryption/Decryption Throughput", fontsize=16, fontweight="bold", y=0.98)
+    return fig, list(axes.flat)
 
-    thread_colors = ["#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b"]
-    chunk_colors = ["#e41a1c", "#377eb8", "#4daf4a", "#984ea3", "#ff7f00", "#a65628", "#f781bf"]
-
-    unique_threads = sorted(enc["Threads"].unique())
-    unique_chunks = sorted(enc["ChunkMB"].unique())
-
-    # 1) Encrypt: throughput vs chunk size per thread
-    for i, t in enumerate(unique_threads):
-        d = enc[enc["Threads"] == t].sort_values("ChunkMB")
-        ax1.plot(d["ChunkMB"], d["Throughput"], marker="o", label=f"{t} threads",
-                 linewidth=2.0, markersize=7, color=thread_colors[i % len(thread_colors)])
-    ax1.set_title("Encryption: Throughput vs Chunk Size", fontsize=14, fontweight="bold")
-    ax1.set_xlabel("Chunk Size (MB)")
-    ax1.set_ylabel("Throughput (MB/s)")
-    ax1.set_xticks(unique_chunks)
-    ax1.legend(frameon=True, fancybox=True)
-
-    # 2) Decrypt: throughput vs chunk size per thread
-    for i, t in enumerate(unique_threads):
-        d = dec[dec["Threads"] == t].sort_values("ChunkMB")
-        ax2.plot(d["ChunkMB"], d["Throughput"], marker="s", label=f"{t} threads",
-                 linewidth=2.0, markersize=7, color=thread_colors[i % len(thread_colors)])
-    ax2.set_title("Decryption: Throughput vs Chunk Size", fontsize=14, fontweight="bold")
-    ax2.set_xlabel("Chunk Size (MB)")
-    ax2.set_ylabel("Throughput (MB/s)")
-    ax2.set_xticks(unique_chunks)
-    ax2.legend(frameon=True, fancybox=True)
-
-    # 3) Encrypt: throughput vs threads per chunk
-    for i, ch in enumerate(unique_chunks):
-        d = enc[enc["ChunkMB"] == ch].sort_values("Threads")
-        ax3.plot(d["Threads"], d["Throughput"], marker="o", label=f"{int(ch)}MB",
-                 linewidth=2.0, markersize=7, color=chunk_colors[i % len(chunk_colors)])
-    ax3.set_title("Encryption: Throughput vs Threads", fontsize=14, fontweight="bold")
-    ax3.set_xlabel("Number of Threads")
-    ax3.set_ylabel("Throughput (MB/s)")
-    ax3.set_xticks(unique_threads)
-    ax3.legend(title="Chunk Size", frameon=True, fancybox=True)
-
-    # 4) Decrypt: throughput vs threads per chunk
-    for i, ch in enumerate(unique_chunks):
-        d = dec[dec["ChunkMB"] == ch].sort_values("Threads")
-        ax4.plot(d["Threads"], d["Throughput"], marker="s", label=f"{int(ch)}MB",
-                 linewidth=2.0, markersize=7, color=chunk_colors[i % len(chunk_colors)])
-    ax4.set_title("Decryption: Throughput vs Threads", fontsize=14, fontweight="bold")
-    ax4.set_xlabel("Number of Threads")
-    ax4.set_ylabel("Throughput (MB/s)")
-    ax4.set_xticks(unique_threads)
-    ax4.legend(title="Chunk Size", frameon=True, fancybox=True)
 
-    for ax in (ax1, ax2, ax3, ax4):
-        ax.grid(True, alpha=0.3)
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
+def _draw_no_chunk_axis(ax, cube: SweepCube, op: str) -> None:
+    """Stand-in for a vs-chunk-size panel of an op measured at a single chunk size; the caller sets the title."""
+    chunks = ", ".join(format_size(cube.chunk_bytes[c]) for c in cube.chunk_indices(op)) or "no"
+    ax.text(0.5, 0.5, f"No chunk-size dimension:\nevery {op} measurement used {chunks} chunks",
+            ha="center", va="center", transform=ax.transAxes, fontsize=11, color="gray")
+    ax.set_xticks([])
+    ax.set_yticks([])
+
+
+def _annotate_smt(ax, cube: SweepCube) -> None:
+    """Mark, on a thread-count axis, where threads start sharing cores (SMT) and outnumber the CPUs."""
+    cpu = cube.cpu
+    if cpu is None or not len(cube.threads):
+        return
+    marks = []
+    if cpu.smt_threads is not None:
+        marks.append((cpu.smt_threads, f" SMT above {cpu.smt_threads} cores"))
+    if cpu.logical_cpus:
+        marks.append((cpu.logical_cpus, f" oversubscribed above {cpu.logical_cpus} CPUs"))
+    last = cube.threads.max()
+    for i, (x, label) in enumerate(marks):
+        if x >= last:
+            continue
+        ax.axvline(x, color="dimgray", linestyle=":", linewidth=1.5)
+        ax.axvspan(x, last, color="gray", alpha=0.06)
+        ax.text(x, 0.98 - 0.06 * i, label, transform=ax.get_xaxis_transform(), ha="left", va="top",
+                fontsize=8, color="dimgray")
+
+
+def _draw_mylib_panel(ax, cube: SweepCube, op: str, x: str) -> None:
+    """Draw one panel: throughput vs chunk size per thread count, or vs threads per chunk size."""
+    marker = "o" if op == "encrypt" else "s"
+    title = "Encryption" if op == "encrypt" else "Decryption"
+
+    if x == "ChunkMB" and not cube.has_chunk_axis(op):
+        _draw_no_chunk_axis(ax, cube, op)
+        ax.set_title(f"{title}: Throughput vs Chunk Size", fontsize=14, fontweight="bold")
+        return
+    if x == "ChunkMB":
+        for i, t in enumerate(cube.threads):
+            _plot_with_spread(ax, cube.chunk_mb, cube.stats(op, t=i), marker=marker, label=f"{t} threads",
+                              linewidth=2.0, markersize=7, color=THREAD_COLORS[i % len(THREAD_COLORS)])
+        ax.set_title(f"{title}: Throughput vs Chunk Size", fontsize=14, fontweight="bold")
+        ax.set_xlabel("Chunk Size (MiB)")
+        ax.set_xticks(cube.chunk_mb)
+        legend_title = None
+    else:
+        for i in cube.chunk_indices(op):
+            _plot_with_spread(ax, cube.threads, cube.stats(op, c=i), marker=marker, label=format_size(cube.chunk_bytes[i]),
+                              linewidth=2.0, markersize=7, color=CHUNK_COLORS[i % len(CHUNK_COLORS)])
+        _annotate_smt(ax, cube)
+        ax.set_title(f"{title}: Throughput vs Threads", fontsize=14, fontweight="bold")
+        ax.set_xlabel("Number of Threads")
+        ax.set_xticks(cube.threads)
+        legend_title = "Chunk Size"
+    ax.set_ylabel(f"Throughput ({cube.unit.name})")
+    if cube.has_op(op):
+        ax.legend(title=legend_title, frameon=True, fancybox=True)
+
+    ax.grid(True, alpha=0.3)
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+
+
+def _has_both_ops(cube: SweepCube) -> bool:
+    return cube.has_op("encrypt") and cube.has_op("decrypt")
+
+
+def plot_mylib_four_panels(cube: SweepCube, out_path: Path) -> None:
+    """Create 4-panel figure for my library: throughput vs chunk size (per threads) and vs threads (per chunk)."""
+    if not _has_both_ops(cube):
+        print("[warn] CottonCrypto data is empty; skipping library_performance.png")
+        return
+
+    fig, axes = _mylib_figure()
+    for ax, (op, x) in zip(axes, MYLIB_PANELS):
+        _draw_mylib_panel(ax, cube, op, x)
 
     fig.tight_layout()
     fig.savefig(out_path, dpi=300, bbox_inches="tight")
+    plt.close(fig)
+    print(f"[ok] Saved {out_path.name}")
+
+
+def _core_samples(samples: pd.DataFrame) -> pd.DataFrame:
+    """Samples of the threads x chunk charts: the default window cap / memory limit cells.
+
+    A sweep that skipped the defaults falls back to its first facet.
+    """
+    core = default_facet(samples)
+    if core.empty and not samples.empty:
+        facet = facet_values(samples)[0]
+        print(f"[info] No cells with the default window cap / memory limit; core charts show {facet_label(facet)}")
+        core = select_facet(samples, facet)
+    return core
+
+
+def plot_facet_grid(samples: pd.DataFrame, op: str, unit: Unit, out_path: Path) -> None:
+    """Small multiples of throughput vs chunk size (per thread count) for every window cap / memory limit.
+
+    Columns are window caps, rows memory limits from loosest to tightest; the
+    y axis is shared, so the cost of a tighter limit reads straight down a column.
+    """
+    facets = facet_values(samples)
+    caps = sorted({w for w, _ in facets})
+    limits = memory_limit_order(m for _, m in facets)
+    fig, axes = plt.subplots(len(limits), len(caps), figsize=(4.5 * len(caps), 3.6 * len(limits)),
+                             sharex=True, sharey=True, squeeze=False)
+    title = "Encryption" if op == "encrypt" else "Decryption"
+    fig.suptitle(f"CottonCrypto {title}: Throughput vs Chunk Size by Window Cap and Memory Limit",
+                 fontsize=14, fontweight="bold")
+    first = True
+    for row, limit in enumerate(limits):
+        for col, cap in enumerate(caps):
+            ax = axes[row][col]
+            if (cap, limit) not in facets:
+                ax.axis("off")
+                continue
+            cube = SweepCube.from_samples(select_facet(samples, (cap, limit))).in_unit(unit)
+            _draw_mylib_panel(ax, cube, op, "ChunkMB")
+            ax.set_title(facet_label((cap, limit)), fontsize=11)
+            ax.tick_params(labelsize=8)
+            if not first and ax.get_legend() is not None:
+                ax.get_legend().remove()
+            first = first and ax.get_legend() is None
+            if col:
+                ax.set_ylabel("")
+            if row < len(limits) - 1:
+                ax.set_xlabel("")
+
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=150, bbox_inches="tight")
+    plt.close(fig)
+    print(f"[ok] Saved {out_path.name}")
+
+
+def plot_memory_cap_cost(table: pd.DataFrame, out_path: Path) -> None:
+    """Best-cell throughput under each memory limit relative to no limit, per op and window cap."""
+    limits = memory_limit_order(table["MemoryLimitBytes"])
+    if len(limits) < 2 or NO_MEMORY_LIMIT not in limits:
+        print("[info] Fewer than two memory limits (or none unlimited); skipping " + out_path.name)
+        return
+    position = {m: i for i, m in enumerate(limits)}
+    fig, ax = plt.subplots(figsize=(10, 6))
+    for (op, cap), d in table.groupby(["Op", "WindowCap"]):
+        ax.plot(d["MemoryLimitBytes"].map(position), d["Relative"] * 100, marker="o" if op == "encrypt" else "s",
+                linestyle="-" if op == "encrypt" else "--", linewidth=2.0, label=f"{op}, window {cap}")
+    ax.axhline(100, color="gray", linewidth=1, alpha=0.6)
+    ax.set_xticks(range(len(limits)))
+    ax.set_xticklabels([memory_limit_label(m) for m in limits])
+    ax.set_xlabel("Memory limit (memoryLimitBytes)")
+    ax.set_ylabel("Best throughput vs no limit (%)")
+    ax.set_title("Cost of a Memory Cap: Best Cell per Limit", fontsize=14, fontweight="bold")
+    ax.legend(frameon=True, fancybox=True)
+    ax.grid(True, alpha=0.3)
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=150, bbox_inches="tight")
+    plt.close(fig)
     print(f"[ok] Saved {out_path.name}")
 
 
-def create_advanced_plots(encrypt_data: pd.DataFrame, decrypt_data: pd.DataFrame, out_path: Path) -> None:
+def create_advanced_plots(metrics: SweepMetrics, out_path: Path) -> None:
     """Replicate the advanced analysis (6 plots) in a single figure and save it."""
-    if encrypt_data.empty or decrypt_data.empty:
+    cube = metrics.cube
+    if not _has_both_ops(cube):
         print("[warn] CottonCrypto data empty; skipping advanced_performance_analysis.png")
         return
 
@@ -208,292 +380,276 @@ def create_advanced_plots(encrypt_data: pd.DataFrame, decrypt_data: pd.DataFrame
     fig.suptitle('Complete Performance Analysis: Encryption/Decryption Throughput',
                  fontsize=18, fontweight='bold')
 
-    unique_threads = sorted(encrypt_data['Threads'].unique())
-    unique_chunks = sorted(encrypt_data['ChunkMB'].unique())
+    unique_threads = cube.threads
+    unique_chunks = cube.chunk_mb
     colors = plt.cm.Set1(np.linspace(0, 1, len(unique_threads)))
     chunk_colors = plt.cm.tab10(np.linspace(0, 1, len(unique_chunks)))
 
-    # 1) Encrypt: throughput vs chunk size
-    for i, threads in enumerate(unique_threads):
-        thread_data = encrypt_data[encrypt_data['Threads'] == threads].sort_values('ChunkMB')
-        ax1.plot(thread_data['ChunkMB'], thread_data['Throughput'], marker='o', label=f'{threads} threads',
-                 linewidth=2.5, markersize=8, color=colors[i])
-    ax1.set_xlabel('Chunk Size (MB)')
-    ax1.set_ylabel('Throughput (MB/s)')
-    ax1.set_title('Encryption: Throughput vs Chunk Size')
-    ax1.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-    ax1.grid(True, alpha=0.3)
-    ax1.set_xticks(unique_chunks)
-
-    # 2) Decrypt: throughput vs chunk size
-    for i, threads in enumerate(unique_threads):
-        thread_data = decrypt_data[decrypt_data['Threads'] == threads].sort_values('ChunkMB')
-        ax2.plot(thread_data['ChunkMB'], thread_data['Throughput'], marker='s', label=f'{threads} threads',
-                 linewidth=2.5, markersize=8, color=colors[i])
-    ax2.set_xlabel('Chunk Size (MB)')
-    ax2.set_ylabel('Throughput (MB/s)')
-    ax2.set_title('Decryption: Throughput vs Chunk Size')
-    ax2.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
-    ax2.grid(True, alpha=0.3)
-    ax2.set_xticks(unique_chunks)
+    # 1) Encrypt and 2) decrypt: throughput vs chunk size
+    for ax, op, marker, title in ((ax1, 'encrypt', 'o', 'Encryption'), (ax2, 'decrypt', 's', 'Decryption')):
+        if not cube.has_chunk_axis(op):
+            _draw_no_chunk_axis(ax, cube, op)
+            ax.set_title(f'{title}: Throughput vs Chunk Size')
+            continue
+        for i, threads in enumerate(unique_threads):
+            _plot_with_spread(ax, unique_chunks, cube.stats(op, t=i), marker=marker, label=f'{threads} threads',
+                              linewidth=2.5, markersize=8, color=colors[i])
+        ax.set_xlabel('Chunk Size (MiB)')
+        ax.set_ylabel(f'Throughput ({cube.unit.name})')
+        ax.set_title(f'{title}: Throughput vs Chunk Size')
+        ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+        ax.grid(True, alpha=0.3)
+        ax.set_xticks(unique_chunks)
 
     # 3) Encrypt: throughput vs threads
-    for i, chunk_size in enumerate(unique_chunks):
-        chunk_data = encrypt_data[encrypt_data['ChunkMB'] == chunk_size].sort_values('Threads')
-        ax3.plot(chunk_data['Threads'], chunk_data['Throughput'], marker='o', label=f'{chunk_size:g}MB',
-                 linewidth=2.5, markersize=8, color=chunk_colors[i])
+    for i in cube.chunk_indices('encrypt'):
+        _plot_with_spread(ax3, unique_threads, cube.stats('encrypt', c=i), marker='o', label=format_size(cube.chunk_bytes[i]),
+                          linewidth=2.5, markersize=8, color=chunk_colors[i])
+    _annotate_smt(ax3, cube)
     ax3.set_xlabel('Number of Threads')
-    ax3.set_ylabel('Throughput (MB/s)')
+    ax3.set_ylabel(f'Throughput ({cube.unit.name})')
     ax3.set_title('Encryption: Throughput vs Threads')
     ax3.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
     ax3.grid(True, alpha=0.3)
     ax3.set_xticks(unique_threads)
 
     # 4) Decrypt: throughput vs threads
-    for i, chunk_size in enumerate(unique_chunks):
-        chunk_data = decrypt_data[decrypt_data['ChunkMB'] == chunk_size].sort_values('Threads')
-        ax4.plot(chunk_data['Threads'], chunk_data['Throughput'], marker='s', label=f'{chunk_size:g}MB',
-                 linewidth=2.5, markersize=8, color=chunk_colors[i])
+    for i in cube.chunk_indices('decrypt'):
+        _plot_with_spread(ax4, unique_threads, cube.stats('decrypt', c=i), marker='s', label=format_size(cube.chunk_bytes[i]),
+                          linewidth=2.5, markersize=8, color=chunk_colors[i])
+    _annotate_smt(ax4, cube)
     ax4.set_xlabel('Number of Threads')
-    ax4.set_ylabel('Throughput (MB/s)')
+    ax4.set_ylabel(f'Throughput ({cube.unit.name})')
     ax4.set_title('Decryption: Throughput vs Threads')
     ax4.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
     ax4.grid(True, alpha=0.3)
     ax4.set_xticks(unique_threads)
 
     # 5) Max per thread count (bar)
-    threads_comparison = []
-    for threads in unique_threads:
-        enc_max = encrypt_data[encrypt_data['Threads'] == threads]['Throughput'].max()
-        dec_max = decrypt_data[decrypt_data['Threads'] == threads]['Throughput'].max()
-        threads_comparison.append([threads, enc_max, dec_max])
-    threads_df = pd.DataFrame(threads_comparison, columns=['Threads', 'Encrypt_Max', 'Decrypt_Max'])
-    x = np.arange(len(threads_df))
+    enc_max = metrics['encrypt'].max_per_thread
+    dec_max = metrics['decrypt'].max_per_thread
+    x = np.arange(len(unique_threads))
     width = 0.35
-    ax5.bar(x - width/2, threads_df['Encrypt_Max'], width, label='Encryption', alpha=0.8, color='skyblue')
-    ax5.bar(x + width/2, threads_df['Decrypt_Max'], width, label='Decryption', alpha=0.8, color='lightcoral')
+    ax5.bar(x - width/2, enc_max, width, label='Encryption', alpha=0.8, color='skyblue')
+    ax5.bar(x + width/2, dec_max, width, label='Decryption', alpha=0.8, color='lightcoral')
     ax5.set_xlabel('Number of Threads')
-    ax5.set_ylabel('Max Throughput (MB/s)')
+    ax5.set_ylabel(f'Max Throughput ({cube.unit.name})')
     ax5.set_title('Maximum Throughput by Threads')
     ax5.set_xticks(x)
-    ax5.set_xticklabels(threads_df['Threads'])
+    ax5.set_xticklabels(unique_threads)
     ax5.legend()
     ax5.grid(True, alpha=0.3)
 
-    # 6) Scaling efficiency at mid chunk
-    mid_chunk = unique_chunks[len(unique_chunks)//2]
-    baseline_enc = encrypt_data[encrypt_data['Threads'] == 1].groupby('ChunkMB')['Throughput'].mean()
-    baseline_dec = decrypt_data[decrypt_data['Threads'] == 1].groupby('ChunkMB')['Throughput'].mean()
-    enc_scaling, dec_scaling = [], []
-    for threads in unique_threads:
-        enc_th = encrypt_data[(encrypt_data['Threads'] == threads) & (encrypt_data['ChunkMB'] == mid_chunk)]['Throughput'].mean()
-        dec_th = decrypt_data[(decrypt_data['Threads'] == threads) & (decrypt_data['ChunkMB'] == mid_chunk)]['Throughput'].mean()
-        if mid_chunk in baseline_enc and mid_chunk in baseline_dec:
-            enc_scaling.append(enc_th / baseline_enc[mid_chunk])
-            dec_scaling.append(dec_th / baseline_dec[mid_chunk])
-        else:
-            enc_scaling.append(np.nan)
-            dec_scaling.append(np.nan)
-    ax6.plot(unique_threads, enc_scaling, marker='o', linewidth=3, markersize=10, label='Encryption Scaling', color='blue')
-    ax6.plot(unique_threads, dec_scaling, marker='s', linewidth=3, markersize=10, label='Decryption Scaling', color='red')
+    # 6) Scaling efficiency at mid chunk (or the closest chunk an op was measured at)
+    mid = metrics.mid_chunk
+    ax6.plot(unique_threads, metrics['encrypt'].speedup[:, metrics.scaling_chunk('encrypt')], marker='o', linewidth=3,
+             markersize=10, label=_scaling_label(metrics, 'encrypt', 'Encryption Scaling'), color='blue')
+    ax6.plot(unique_threads, metrics['decrypt'].speedup[:, metrics.scaling_chunk('decrypt')], marker='s', linewidth=3,
+             markersize=10, label=_scaling_label(metrics, 'decrypt', 'Decryption Scaling'), color='red')
     ax6.plot(unique_threads, unique_threads, '--', alpha=0.7, color='gray', label='Ideal Linear Scaling')
+    _annotate_smt(ax6, cube)
     ax6.set_xlabel('Number of Threads')
     ax6.set_ylabel('Speedup Factor')
-    ax6.set_title(f'Scaling Efficiency (Chunk Size: {mid_chunk:g}MB)')
+    ax6.set_title(f'Scaling Efficiency (Chunk Size: {format_size(cube.chunk_bytes[mid])})')
     ax6.legend()
     ax6.grid(True, alpha=0.3)
     ax6.set_xticks(unique_threads)
 
     fig.tight_layout()
     fig.savefig(out_path, dpi=300, bbox_inches='tight')
+    plt.close(fig)
     print(f"[ok] Saved {out_path.name}")
 
 
-def _plot_encrypt_vs_chunk(ax, encrypt_data: pd.DataFrame, unique_threads: list[int]) -> None:
-    colors = plt.cm.Set1(np.linspace(0, 1, len(unique_threads)))
-    for i, threads in enumerate(unique_threads):
-        td = encrypt_data[encrypt_data['Threads'] == threads].sort_values('ChunkMB')
-        ax.plot(td['ChunkMB'], td['Throughput'], marker='o', label=f'{threads}T', linewidth=1.5, markersize=4, color=colors[i])
-    ax.set_title('Encrypt: Throughput vs Chunks', fontsize=12, fontweight='bold')
-    ax.set_xlabel('Chunk Size (MB)')
-    ax.set_ylabel('MB/s')
-    ax.legend(ncol=2, fontsize=8)
-    ax.grid(True, alpha=0.3)
-
-
-def _plot_decrypt_vs_chunk(ax, decrypt_data: pd.DataFrame, unique_threads: list[int]) -> None:
-    colors = plt.cm.Set1(np.linspace(0, 1, len(unique_threads)))
-    for i, threads in enumerate(unique_threads):
-        td = decrypt_data[decrypt_data['Threads'] == threads].sort_values('ChunkMB')
-        ax.plot(td['ChunkMB'], td['Throughput'], marker='s', label=f'{threads}T', linewidth=1.5, markersize=4, color=colors[i])
-    ax.set_title('Decrypt: Throughput vs Chunks', fontsize=12, fontweight='bold')
-    ax.set_xlabel('Chunk Size (MB)')
-    ax.set_ylabel('MB/s')
-    ax.legend(ncol=2, fontsize=8)
-    ax.grid(True, alpha=0.3)
+def _scaling_label(metrics: SweepMetrics, op: str, label: str) -> str:
+    """Legend label of op's scaling line, naming its chunk size when that is not mid_chunk."""
+    c = metrics.scaling_chunk(op)
+    return label if c == metrics.mid_chunk else f"{label} ({format_size(metrics.cube.chunk_bytes[c])})"
 
 
-def _plot_encrypt_vs_threads(ax, encrypt_data: pd.DataFrame, unique_chunks: list[float]) -> None:
-    chunk_colors = plt.cm.tab10(np.linspace(0, 1, len(unique_chunks)))
-    for i, ch in enumerate(unique_chunks):
-        cd = encrypt_data[encrypt_data['ChunkMB'] == ch].sort_values('Threads')
-        ax.plot(cd['Threads'], cd['Throughput'], marker='o', label=f'{ch:g}MB', linewidth=1.5, markersize=4, color=chunk_colors[i])
-    ax.set_title('Encrypt: Throughput vs Threads', fontsize=12, fontweight='bold')
-    ax.set_xlabel('Threads')
-    ax.set_ylabel('MB/s')
+def _plot_op_vs_chunk(ax, cube: SweepCube, op: str) -> None:
+    colors = plt.cm.Set1(np.linspace(0, 1, len(cube.threads)))
+    marker, title = ('o', 'Encrypt') if op == 'encrypt' else ('s', 'Decrypt')
+    if not cube.has_chunk_axis(op):
+        _draw_no_chunk_axis(ax, cube, op)
+        ax.set_title(f'{title}: Throughput vs Chunks', fontsize=12, fontweight='bold')
+        return
+    for i, threads in enumerate(cube.threads):
+        _plot_with_spread(ax, cube.chunk_mb, cube.stats(op, t=i), marker=marker, label=f'{threads}T', linewidth=1.5, markersize=4, color=colors[i])
+    ax.set_title(f'{title}: Throughput vs Chunks', fontsize=12, fontweight='bold')
+    ax.set_xlabel('Chunk Size (MiB)')
+    ax.set_ylabel(cube.unit.name)
     ax.legend(ncol=2, fontsize=8)
     ax.grid(True, alpha=0.3)
 
 
-def _plot_decrypt_vs_threads(ax, decrypt_data: pd.DataFrame, unique_chunks: list[float]) -> None:
-    chunk_colors = plt.cm.tab10(np.linspace(0, 1, len(unique_chunks)))
-    for i, ch in enumerate(unique_chunks):
-        cd = decrypt_data[decrypt_data['ChunkMB'] == ch].sort_values('Threads')
-        ax.plot(cd['Threads'], cd['Throughput'], marker='s', label=f'{ch:g}MB', linewidth=1.5, markersize=4, color=chunk_colors[i])
-    ax.set_title('Decrypt: Throughput vs Threads', fontsize=12, fontweight='bold')
+def _plot_op_vs_threads(ax, cube: SweepCube, op: str) -> None:
+    chunk_colors = plt.cm.tab10(np.linspace(0, 1, len(cube.chunk_mb)))
+    marker, title = ('o', 'Encrypt') if op == 'encrypt' else ('s', 'Decrypt')
+    for i in cube.chunk_indices(op):
+        _plot_with_spread(ax, cube.threads, cube.stats(op, c=i), marker=marker, label=format_size(cube.chunk_bytes[i]), linewidth=1.5, markersize=4, color=chunk_colors[i])
+    _annotate_smt(ax, cube)
+    ax.set_title(f'{title}: Throughput vs Threads', fontsize=12, fontweight='bold')
     ax.set_xlabel('Threads')
-    ax.set_ylabel('MB/s')
+    ax.set_ylabel(cube.unit.name)
     ax.legend(ncol=2, fontsize=8)
     ax.grid(True, alpha=0.3)
 
 
-def _plot_heatmap(ax, encrypt_data: pd.DataFrame, decrypt_data: pd.DataFrame, unique_threads: list[int]) -> None:
-    encrypt_pivot = encrypt_data.pivot(index='Threads', columns='ChunkMB', values='Throughput')
-    decrypt_pivot = decrypt_data.pivot(index='Threads', columns='ChunkMB', values='Throughput')
-    common_cols = sorted(set(encrypt_pivot.columns).intersection(set(decrypt_pivot.columns)))
-    encrypt_pivot = encrypt_pivot[common_cols]
-    decrypt_pivot = decrypt_pivot[common_cols]
-    combined = (encrypt_pivot + decrypt_pivot) / 2.0
-    ax.imshow(combined.values, cmap='viridis', aspect='auto')
-    ax.set_title('Performance Heat Map (avg enc/dec)', fontsize=12, fontweight='bold')
-    ax.set_xlabel('Chunk Size (MB)')
+def _plot_heatmap(ax, cube: SweepCube) -> None:
+    # An op measured at a single chunk size would blank every other column
+    ops = [op for op in OPS if cube.has_chunk_axis(op)] or list(OPS)
+    combined = sum(cube.stats(op).mean for op in ops) / len(ops)
+    ax.imshow(combined, cmap='viridis', aspect='auto')
+    ax.set_title(f"Performance Heat Map ({'avg enc/dec' if len(ops) == 2 else ops[0]})", fontsize=12, fontweight='bold')
+    ax.set_xlabel('Chunk Size (MiB)')
     ax.set_ylabel('Threads')
-    ax.set_xticks(range(len(common_cols)))
-    ax.set_xticklabels([f"{c:g}" for c in common_cols])
-    ax.set_yticks(range(len(unique_threads)))
-    ax.set_yticklabels([str(int(x)) for x in unique_threads])
-    for i in range(min(len(unique_threads), combined.shape[0])):
-        for j in range(min(len(common_cols), combined.shape[1])):
-            ax.text(j, i, f'{combined.iloc[i, j]:.0f}', ha='center', va='center', color='white', fontsize=8, fontweight='bold')
-
-
-def _plot_bar_avg(ax, encrypt_data: pd.DataFrame, decrypt_data: pd.DataFrame, unique_chunks: list[float]) -> None:
-    enc_by_chunk = encrypt_data.groupby('ChunkMB')['Throughput'].agg(['mean', 'std']).reindex(unique_chunks)
-    dec_by_chunk = decrypt_data.groupby('ChunkMB')['Throughput'].agg(['mean', 'std']).reindex(unique_chunks)
-    x = np.arange(len(unique_chunks))
+    ax.set_xticks(range(len(cube.chunk_mb)))
+    ax.set_xticklabels([f"{c:g}" for c in cube.chunk_mb])
+    ax.set_yticks(range(len(cube.threads)))
+    ax.set_yticklabels([str(int(x)) for x in cube.threads])
+    for i, j in zip(*np.nonzero(~np.isnan(combined))):
+        ax.text(j, i, f'{combined[i, j]:.0f}', ha='center', va='center', color='white', fontsize=8, fontweight='bold')
+
+
+def _plot_bar_avg(ax, metrics: SweepMetrics) -> None:
+    cube = metrics.cube
+    enc = metrics['encrypt']
+    dec = metrics['decrypt']
+    x = np.arange(len(cube.chunk_mb))
     width = 0.35
-    ax.bar(x - width/2, enc_by_chunk['mean'], width, yerr=enc_by_chunk['std'], label='Encrypt', alpha=0.8, capsize=5, color='skyblue')
-    ax.bar(x + width/2, dec_by_chunk['mean'], width, yerr=dec_by_chunk['std'], label='Decrypt', alpha=0.8, capsize=5, color='lightcoral')
+    ax.bar(x - width/2, enc.avg_per_chunk, width, yerr=enc.std_per_chunk, label='Encrypt', alpha=0.8, capsize=5, color='skyblue')
+    ax.bar(x + width/2, dec.avg_per_chunk, width, yerr=dec.std_per_chunk, label='Decrypt', alpha=0.8, capsize=5, color='lightcoral')
     ax.set_title('Average Performance by Chunk Size', fontsize=12, fontweight='bold')
-    ax.set_xlabel('Chunk Size (MB)')
-    ax.set_ylabel('Avg Throughput (MB/s)')
+    ax.set_xlabel('Chunk Size (MiB)')
+    ax.set_ylabel(f'Avg Throughput ({cube.unit.name})')
     ax.set_xticks(x)
-    ax.set_xticklabels([f"{c:g}" for c in unique_chunks])
+    ax.set_xticklabels([f"{c:g}" for c in cube.chunk_mb])
     ax.legend()
     ax.grid(True, alpha=0.3)
 
 
-def _plot_violin(ax, encrypt_data: pd.DataFrame, decrypt_data: pd.DataFrame) -> None:
-    parts = ax.violinplot([encrypt_data['Throughput'], decrypt_data['Throughput']], positions=[1, 2], showmeans=True, showextrema=True)
+def _measured(values: np.ndarray) -> np.ndarray:
+    return values[~np.isnan(values)]
+
+
+def _plot_violin(ax, cube: SweepCube) -> None:
+    parts = ax.violinplot([_measured(cube.stats('encrypt').mean), _measured(cube.stats('decrypt').mean)],
+                          positions=[1, 2], showmeans=True, showextrema=True)
     for pc, color in zip(parts['bodies'], ['skyblue', 'lightcoral']):
         pc.set_facecolor(color)
         pc.set_alpha(0.7)
     ax.set_title('Performance Distribution', fontsize=12, fontweight='bold')
-    ax.set_ylabel('Throughput (MB/s)')
+    ax.set_ylabel(f'Throughput ({cube.unit.name})')
     ax.set_xticks([1, 2])
     ax.set_xticklabels(['Encrypt', 'Decrypt'])
     ax.grid(True, alpha=0.3)
 
 
-def _plot_scaling_eff(ax, encrypt_data: pd.DataFrame, decrypt_data: pd.DataFrame, unique_threads: list[int], unique_chunks: list[float]) -> None:
-    baseline_threads = 1
-    mid_chunk = unique_chunks[len(unique_chunks)//2]
-    enc_base = encrypt_data[(encrypt_data['Threads'] == baseline_threads) & (encrypt_data['ChunkMB'] == mid_chunk)]['Throughput']
-    dec_base = decrypt_data[(decrypt_data['Threads'] == baseline_threads) & (decrypt_data['ChunkMB'] == mid_chunk)]['Throughput']
-    enc_eff, dec_eff = [], []
-    if not enc_base.empty and not dec_base.empty:
-        enc_base_v = enc_base.iloc[0]
-        dec_base_v = dec_base.iloc[0]
-        for t in unique_threads:
-            enc_cur = encrypt_data[(encrypt_data['Threads'] == t) & (encrypt_data['ChunkMB'] == mid_chunk)]['Throughput']
-            dec_cur = decrypt_data[(decrypt_data['Threads'] == t) & (decrypt_data['ChunkMB'] == mid_chunk)]['Throughput']
-            enc_eff.append(((enc_cur.iloc[0] if not enc_cur.empty else np.nan) / enc_base_v) / t * 100)
-            dec_eff.append(((dec_cur.iloc[0] if not dec_cur.empty else np.nan) / dec_base_v) / t * 100)
-    ax.plot(unique_threads, enc_eff, marker='o', linewidth=3, markersize=8, label='Encrypt Efficiency', color='blue')
-    ax.plot(unique_threads, dec_eff, marker='s', linewidth=3, markersize=8, label='Decrypt Efficiency', color='red')
+def _plot_scaling_eff(ax, metrics: SweepMetrics) -> None:
+    cube = metrics.cube
+    mid = metrics.mid_chunk
+    enc_eff = metrics['encrypt'].efficiency[:, metrics.scaling_chunk('encrypt')]
+    dec_eff = metrics['decrypt'].efficiency[:, metrics.scaling_chunk('decrypt')]
+    ax.plot(cube.threads, enc_eff, marker='o', linewidth=3, markersize=8,
+            label=_scaling_label(metrics, 'encrypt', 'Encrypt Efficiency'), color='blue')
+    ax.plot(cube.threads, dec_eff, marker='s', linewidth=3, markersize=8,
+            label=_scaling_label(metrics, 'decrypt', 'Decrypt Efficiency'), color='red')
     ax.axhline(y=100, color='gray', linestyle='--', alpha=0.7, label='Perfect Efficiency')
-    ax.set_title(f'Scaling Efficiency ({mid_chunk:g}MB chunks)', fontsize=12, fontweight='bold')
+    _annotate_smt(ax, cube)
+    ax.set_title(f'Scaling Efficiency ({format_size(cube.chunk_bytes[mid])} chunks)', fontsize=12, fontweight='bold')
     ax.set_xlabel('Number of Threads')
     ax.set_ylabel('Efficiency (%)')
     ax.legend()
     ax.grid(True, alpha=0.3)
 
 
-def _plot_ratio(ax, encrypt_data: pd.DataFrame, decrypt_data: pd.DataFrame) -> None:
-    ratios = []
-    for _, er in encrypt_data.iterrows():
-        dr = decrypt_data[(decrypt_data['Threads'] == er['Threads']) & (decrypt_data['ChunkMB'] == er['ChunkMB'])]
-        if not dr.empty and er['Throughput'] > 0:
-            ratios.append({'Threads': er['Threads'], 'ChunkMB': er['ChunkMB'], 'Ratio': dr['Throughput'].iloc[0] / er['Throughput']})
-    ratio_df = pd.DataFrame(ratios)
-    if not ratio_df.empty:
-        sc = ax.scatter(ratio_df['Threads'], ratio_df['ChunkMB'], c=ratio_df['Ratio'], s=ratio_df['Ratio']*30, cmap='RdYlGn', alpha=0.7, edgecolors='black')
+def _cell_grid(cube: SweepCube):
+    """Threads and ChunkMB coordinates of every (thread, chunk) cell, shaped like a mean slice."""
+    return np.meshgrid(cube.threads, cube.chunk_mb, indexing='ij')
+
+
+def _plot_ratio(ax, metrics: SweepMetrics) -> None:
+    threads, chunks = _cell_grid(metrics.cube)
+    ok = ~np.isnan(metrics.ratio)
+    if ok.any():
+        ratio = metrics.ratio[ok]
+        sc = ax.scatter(threads[ok], chunks[ok], c=ratio, s=ratio*30, cmap='RdYlGn', alpha=0.7, edgecolors='black')
         cbar = plt.colorbar(sc, ax=ax, shrink=0.8)
         cbar.set_label('Decrypt/Encrypt Ratio', rotation=270, labelpad=15)
     ax.set_title('Decrypt/Encrypt Speed Ratios', fontsize=12, fontweight='bold')
     ax.set_xlabel('Threads')
-    ax.set_ylabel('Chunk Size (MB)')
-
-
-def _plot_zones(ax, encrypt_data: pd.DataFrame, decrypt_data: pd.DataFrame) -> None:
-    enc_max = encrypt_data['Throughput'].max()
-    dec_max = decrypt_data['Throughput'].max()
-    high_enc = encrypt_data[encrypt_data['Throughput'] > enc_max * 0.9]
-    med_enc = encrypt_data[(encrypt_data['Throughput'] > enc_max * 0.7) & (encrypt_data['Throughput'] <= enc_max * 0.9)]
-    high_dec = decrypt_data[decrypt_data['Throughput'] > dec_max * 0.9]
-    med_dec = decrypt_data[(decrypt_data['Throughput'] > dec_max * 0.7) & (decrypt_data['Throughput'] <= dec_max * 0.9)]
-    ax.scatter(high_enc['Threads'], high_enc['ChunkMB'], c='green', s=100, alpha=0.7, label='High Encrypt', marker='o')
-    ax.scatter(med_enc['Threads'], med_enc['ChunkMB'], c='orange', s=80, alpha=0.7, label='Medium Encrypt', marker='o')
-    ax.scatter(high_dec['Threads'], high_dec['ChunkMB'], c='darkgreen', s=100, alpha=0.7, label='High Decrypt', marker='s')
-    ax.scatter(med_dec['Threads'], med_dec['ChunkMB'], c='darkorange', s=80, alpha=0.7, label='Medium Decrypt', marker='s')
+    ax.set_ylabel('Chunk Size (MiB)')
+
+
+def _plot_zones(ax, metrics: SweepMetrics) -> None:
+    threads, chunks = _cell_grid(metrics.cube)
+    for op, marker, high_color, med_color in (('encrypt', 'o', 'green', 'orange'), ('decrypt', 's', 'darkgreen', 'darkorange')):
+        zones = metrics[op].zones
+        high = zones == ZONE_HIGH
+        med = zones == ZONE_MEDIUM
+        name = op.capitalize()
+        ax.scatter(threads[high], chunks[high], c=high_color, s=100, alpha=0.7, label=f'High {name}', marker=marker)
+        ax.scatter(threads[med], chunks[med], c=med_color, s=80, alpha=0.7, label=f'Medium {name}', marker=marker)
     ax.set_title('Performance Zones', fontsize=12, fontweight='bold')
     ax.set_xlabel('Threads')
-    ax.set_ylabel('Chunk Size (MB)')
+    ax.set_ylabel('Chunk Size (MiB)')
     ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
     ax.grid(True, alpha=0.3)
 
 
-def _plot_recommendations(ax, encrypt_data: pd.DataFrame, decrypt_data: pd.DataFrame) -> None:
+def _plot_recommendations(ax, metrics: SweepMetrics, recommendation: Optional[Recommendation] = None) -> None:
     ax.axis('off')
-    enc_best = encrypt_data.loc[encrypt_data['Throughput'].idxmax()]
-    dec_best = decrypt_data.loc[decrypt_data['Throughput'].idxmax()]
-    lines = [
-        f"Best Encrypt: {enc_best['Throughput']:.1f} MB/s @ {int(enc_best['Threads'])}T, {enc_best['ChunkMB']:g}MB",
-        f"Best Decrypt: {dec_best['Throughput']:.1f} MB/s @ {int(dec_best['Threads'])}T, {dec_best['ChunkMB']:g}MB",
-        f"Avg Encrypt: {encrypt_data['Throughput'].mean():.1f} MB/s",
-        f"Avg Decrypt: {decrypt_data['Throughput'].mean():.1f} MB/s",
-        "Tips:",
-        " - Larger chunks often help encryption",
-        " - 2-16 threads typically optimal",
+    unit = metrics.cube.unit.name
+    confidence = f"{metrics.intervals.confidence:.0%}"
+    lines = []
+    # A winner is only named when its bootstrap interval clears every other cell's
+    for op in ('encrypt', 'decrypt'):
+        contenders = metrics.contenders(op)
+        top = contenders[0]
+        where = f"{top['Threads']}T, {format_size(top['ChunkBytes'])}"
+        if metrics.has_winner(op):
+            lines.append(f"Best {op.capitalize()}: {top['Throughput']:.1f} {unit} @ {where} "
+                         f"({confidence} CI {top['Low']:.0f}-{top['High']:.0f})")
+        elif len(contenders) > 1:
+            tied = ", ".join(f"{c['Threads']}T/{format_size(c['ChunkBytes'])}" for c in contenders[1:3])
+            more = f" +{len(contenders) - 3}" if len(contenders) > 3 else ""
+            lines.append(f"{op.capitalize()}: no clear winner ({confidence} CI)")
+            lines.append(f"  {where} ~ {tied}{more}")
+        else:
+            lines.append(f"{op.capitalize()}: no clear winner (best cell: 1 sample)")
+            lines.append(f"  {where} leads")
+    lines += [
+        f"Avg Encrypt: {metrics['encrypt'].average:.1f} {unit}",
+        f"Avg Decrypt: {metrics['decrypt'].average:.1f} {unit}",
     ]
-    ax.text(0.01, 0.95, "\n".join(lines), va='top', ha='left', fontsize=10)
+    # An auto-tune result if there is one, else the measured cell with the best geometric mean over ops
+    recommendation = recommendation or recommend_from_cube(metrics.cube)
+    lines += recommendation.lines()
+    if recommendation.throughput:
+        lines.append("  " + ", ".join(
+            f"{op} {metrics.cube.unit.from_bps(SAMPLE_THROUGHPUT_UNIT.to_bps(v)):.0f}"
+            for op, v in recommendation.throughput.items()) + f" {unit}")
+    ax.text(0.01, 0.95, "\n".join(lines), va='top', ha='left', fontsize=9, family='monospace')
 
 
-def _plot_pie(ax, encrypt_data: pd.DataFrame, decrypt_data: pd.DataFrame) -> None:
+def _plot_pie(ax, metrics: SweepMetrics) -> None:
     ax.axis('off')
-    avg_speeds = [encrypt_data['Throughput'].mean(), decrypt_data['Throughput'].mean()]
+    avg_speeds = [metrics['encrypt'].average, metrics['decrypt'].average]
     labels = ['Encrypt', 'Decrypt']
     colors_ = ['skyblue', 'lightcoral']
     ax.pie(avg_speeds, labels=labels, colors=colors_, autopct='%1.0f%%', startangle=90)
     ax.set_title('Performance Share', fontsize=10, fontweight='bold')
 
 
-def create_mega_analysis(encrypt_data: pd.DataFrame, decrypt_data: pd.DataFrame, out_path: Path) -> None:
+def create_mega_analysis(metrics: SweepMetrics, out_path: Path, recommendation: Optional[Recommendation] = None) -> None:
     """Replicate the MEGA analysis with multiple subplots (compact)."""
-    if encrypt_data.empty or decrypt_data.empty:
+    cube = metrics.cube
+    if not _has_both_ops(cube):
         print("[warn] CottonCrypto data empty; skipping mega_performance_analysis.png")
         return
 
+    sns = _seaborn()
     if sns:
         sns.set_palette("husl")
 
@@ -514,27 +670,25 @@ def create_mega_analysis(encrypt_data: pd.DataFrame, decrypt_data: pd.DataFrame,
     ax11 = fig.add_subplot(gs[3, 1])
     ax12 = fig.add_subplot(gs[3, 2])
 
-    unique_threads = sorted(encrypt_data['Threads'].unique())
-    unique_chunks = sorted(encrypt_data['ChunkMB'].unique())
-
-    _plot_encrypt_vs_chunk(ax1, encrypt_data, unique_threads)
-    _plot_decrypt_vs_chunk(ax2, decrypt_data, unique_threads)
-    _plot_encrypt_vs_threads(ax3, encrypt_data, unique_chunks)
-    _plot_decrypt_vs_threads(ax4, decrypt_data, unique_chunks)
-    _plot_heatmap(ax5, encrypt_data, decrypt_data, unique_threads)
-    _plot_bar_avg(ax6, encrypt_data, decrypt_data, unique_chunks)
-    _plot_violin(ax7, encrypt_data, decrypt_data)
-    _plot_scaling_eff(ax8, encrypt_data, decrypt_data, unique_threads, unique_chunks)
-    _plot_ratio(ax9, encrypt_data, decrypt_data)
-    _plot_zones(ax10, encrypt_data, decrypt_data)
-    _plot_recommendations(ax11, encrypt_data, decrypt_data)
-    _plot_pie(ax12, encrypt_data, decrypt_data)
+    _plot_op_vs_chunk(ax1, cube, 'encrypt')
+    _plot_op_vs_chunk(ax2, cube, 'decrypt')
+    _plot_op_vs_threads(ax3, cube, 'encrypt')
+    _plot_op_vs_threads(ax4, cube, 'decrypt')
+    _plot_heatmap(ax5, cube)
+    _plot_bar_avg(ax6, metrics)
+    _plot_violin(ax7, cube)
+    _plot_scaling_eff(ax8, metrics)
+    _plot_ratio(ax9, metrics)
+    _plot_zones(ax10, metrics)
+    _plot_recommendations(ax11, metrics, recommendation)
+    _plot_pie(ax12, metrics)
 
     fig.savefig(out_path, dpi=300, bbox_inches='tight')
+    plt.close(fig)
     print(f"[ok] Saved {out_path.name}")
 
 
-def plot_openssl_comparison(enc: pd.DataFrame, dec: pd.DataFrame, ossl: pd.DataFrame, out_path: Path) -> None:
+def plot_openssl_comparison(metrics: SweepMetrics, ossl: pd.DataFrame, out_path: Path) -> None:
     """Create a simple comparison: CottonCrypto (best-per-chunk) vs OpenSSL across buffer sizes.
 
     - X-axis: buffer/chunk size in bytes, log scale
@@ -544,30 +698,26 @@ def plot_openssl_comparison(enc: pd.DataFrame, dec: pd.DataFrame, ossl: pd.DataF
         print("[warn] OpenSSL data missing; skipping openssl_comparison.png")
         return
 
-    # CottonCrypto best per chunk (across threads)
-    enc_best_per_chunk = enc.groupby("ChunkMB")["Throughput"].max().reset_index()
-    dec_best_per_chunk = dec.groupby("ChunkMB")["Throughput"].max().reset_index()
-
-    # Convert ChunkMB (decimal) to bytes for x-axis
-    enc_best_per_chunk["BlockBytes"] = (enc_best_per_chunk["ChunkMB"] * 1_000_000).astype(int)
-    dec_best_per_chunk["BlockBytes"] = (dec_best_per_chunk["ChunkMB"] * 1_000_000).astype(int)
+    # Both series on exact byte sizes and in the cube's throughput unit
+    cube = metrics.cube
+    block_bytes = cube.chunk_bytes
 
     fig, ax = plt.subplots(figsize=(10, 6))
     fig.suptitle("CottonCrypto vs OpenSSL: Throughput vs Buffer/Chunk Size", fontsize=16, fontweight="bold", y=0.96)
 
     # OpenSSL line
-    ax.plot(ossl["BlockBytes"], ossl["ThroughputMBps"], marker="o", linewidth=2.5, markersize=7,
+    ax.plot(ossl["BlockBytes"], cube.unit.from_bps(ossl["ThroughputBps"]), marker="o", linewidth=2.5, markersize=7,
             label="OpenSSL AES-128-GCM")
 
-    # CottonCrypto lines (best per chunk)
-    ax.plot(enc_best_per_chunk["BlockBytes"], enc_best_per_chunk["Throughput"], marker="s", linewidth=2.0,
-            markersize=7, label="CottonCrypto Encrypt (best per chunk)")
-    ax.plot(dec_best_per_chunk["BlockBytes"], dec_best_per_chunk["Throughput"], marker="^", linewidth=2.0,
-            markersize=7, label="CottonCrypto Decrypt (best per chunk)")
+    # CottonCrypto lines (best per chunk across threads, with that cell's spread)
+    _plot_with_spread(ax, block_bytes, metrics["encrypt"].best_per_chunk, marker="s", linewidth=2.0,
+                      markersize=7, label="CottonCrypto Encrypt (best per chunk)")
+    _plot_with_spread(ax, block_bytes, metrics["decrypt"].best_per_chunk, marker="^", linewidth=2.0,
+                      markersize=7, label="CottonCrypto Decrypt (best per chunk)")
 
     ax.set_xscale("log")
     ax.set_xlabel("Buffer / Chunk Size (bytes) [log scale]")
-    ax.set_ylabel("Throughput (MB/s)")
+    ax.set_ylabel(f"Throughput ({cube.unit.name})")
     ax.grid(True, which="both", axis="both", alpha=0.3)
     ax.legend()
 
@@ -580,12 +730,652 @@ def plot_openssl_comparison(enc: pd.DataFrame, dec: pd.DataFrame, ossl: pd.DataF
 
     fig.tight_layout()
     fig.savefig(out_path, dpi=300, bbox_inches="tight")
+    plt.close(fig)
     print(f"[ok] Saved {out_path.name}")
 
 
+def _format_delta(delta: float, significant: bool) -> str:
+    return f"{delta * 100:+.1f}%" + ("*" if significant else "")
+
+
+def plot_sweep_diff(diff: SweepDiff, unit_name: str, labels: Tuple[str, str], out_path: Path,
+                    top: int = 15) -> None:
+    """Diverging heatmap of per-cell relative delta (one panel per op) plus the worst cells as a table.
+
+    Red is slower than the baseline, blue faster; '*' marks cells whose
+    Welch t-test is significant at diff.alpha.
+    """
+    if diff.table.empty:
+        print("[warn] Sweeps share no (op, threads, chunk) cell; skipping sweep_diff.png")
+        return
+
+    fig = plt.figure(figsize=(22, 8))
+    gs = gridspec.GridSpec(1, 3, width_ratios=[1, 1, 1.3], wspace=0.25)
+    fig.suptitle(f"Sweep diff: {labels[1]} vs {labels[0]}", fontsize=16, fontweight="bold")
+
+    # Symmetric color scale so "no change" is the neutral middle
+    limit = float(np.nanmax(np.abs(diff.delta))) * 100 if np.isfinite(diff.delta).any() else 1.0
+    limit = max(limit, 1.0)
+    significant = diff.p_value < diff.alpha
+    for k, op in enumerate(diff.ops):
+        ax = fig.add_subplot(gs[0, k])
+        grid = diff.delta[k] * 100
+        im = ax.imshow(grid, cmap="RdBu", vmin=-limit, vmax=limit, aspect="auto")
+        ax.set_title(f"{op.capitalize()}: relative change", fontsize=12, fontweight="bold")
+        ax.set_xlabel("Chunk Size")
+        ax.set_ylabel("Threads")
+        ax.set_xticks(range(len(diff.chunk_bytes)))
+        ax.set_xticklabels([format_size(c) for c in diff.chunk_bytes], rotation=45)
+        ax.set_yticks(range(len(diff.threads)))
+        ax.set_yticklabels([str(int(t)) for t in diff.threads])
+        for i, j in zip(*np.nonzero(~np.isnan(grid))):
+            ax.text(j, i, _format_delta(diff.delta[k, i, j], significant[k, i, j]), ha="center", va="center",
+                    fontsize=8, fontweight="bold" if significant[k, i, j] else "normal",
+                    color="white" if abs(grid[i, j]) > 0.6 * limit else "black")
+        plt.colorbar(im, ax=ax, shrink=0.8).set_label("Change (%)", rotation=270, labelpad=15)
+
+    ax = fig.add_subplot(gs[0, 2])
+    ax.axis("off")
+    worst = diff.table.head(top)
+    rows = [[r.Op, str(r.Threads), format_size(r.ChunkBytes), f"{r.Baseline:.1f}", f"{r.Candidate:.1f}",
+             _format_delta(r.Delta, r.Significant), "n/a" if np.isnan(r.PValue) else f"{r.PValue:.3g}"]
+            for r in worst.itertuples()]
+    table = ax.table(cellText=rows, colLabels=["Op", "Threads", "Chunk", f"Base {unit_name}",
+                                               f"New {unit_name}", "Change", "p"],
+                     loc="upper center", cellLoc="right")
+    table.auto_set_font_size(False)
+    table.set_fontsize(9)
+    table.scale(1.0, 1.4)
+    for (row, _), cell in table.get_celld().items():
+        if row > 0 and worst["Significant"].iloc[row - 1] and worst["Delta"].iloc[row - 1] < 0:
+            cell.set_facecolor("#f4cccc")
+    ax.set_title(f"Worst {len(worst)} cells (* p < {diff.alpha:g})", fontsize=12, fontweight="bold")
+
+    fig.savefig(out_path, dpi=200, bbox_inches="tight")
+    plt.close(fig)
+    print(f"[ok] Saved {out_path.name}")
+
+
+def plot_cell_history(cell: pd.DataFrame, changes: List[ChangePoint], unit: Unit, out_path: Path) -> None:
+    """Per-run throughput of one cell across commits, with detected shifts marked.
+
+    x is the run order (labelled with short commit ids); horizontal lines are
+    the segment means, dashed verticals the change points with their commit
+    range and relative shift.
+    """
+    host, op, threads, chunk = (cell[k].iloc[0] for k in SERIES_KEY)
+    y = unit.from_bps(SAMPLE_THROUGHPUT_UNIT.to_bps(cell["Throughput"].to_numpy(dtype=float)))
+    x = np.arange(len(y))
+
+    fig, ax = plt.subplots(figsize=(max(10, len(y) * 0.35), 6))
+    ax.plot(x, y, marker="o", linewidth=1.5, markersize=5, color="#1f77b4", label="Run mean")
+    bounds = [0] + [cp.index for cp in changes] + [len(y)]
+    for a, b in zip(bounds, bounds[1:]):
+        ax.hlines(y[a:b].mean(), a - 0.4, b - 0.6, colors="#ff7f0e", linewidth=2.5)
+    for cp in changes:
+        ax.axvline(cp.index - 0.5, color="#d62728" if cp.shift < 0 else "#2ca02c", linestyle="--", alpha=0.8)
+        ax.annotate(f"{cp.commit_range}\n{cp.shift * 100:+.1f}%", xy=(cp.index - 0.5, ax.get_ylim()[1]),
+                    xytext=(4, -4), textcoords="offset points", va="top", fontsize=9,
+                    color="#d62728" if cp.shift < 0 else "#2ca02c")
+
+    ax.set_xticks(x)
+    ax.set_xticklabels([str(s)[:7] or "?" for s in cell["GitSha"]], rotation=60, fontsize=8)
+    ax.set_xlabel("Commit (run order)")
+    ax.set_ylabel(f"Throughput ({unit.name})")
+    ax.set_title(f"{op.capitalize()} {threads} threads, {format_size(chunk)} chunks @ {host or '?'}",
+                 fontsize=13, fontweight="bold")
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=150, bbox_inches="tight")
+    plt.close(fig)
+    print(f"[ok] Saved {out_path.name}")
+
+
+def _add_unit_option(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--unit", type=throughput_unit, default=DEFAULT_DISPLAY_UNIT,
+                   help=f"Throughput unit for charts and summaries: {', '.join(THROUGHPUT_UNITS)} "
+                        f"(default: {DEFAULT_DISPLAY_UNIT.name})")
+
+
+def ingest_main(argv: list[str]) -> int:
+    """charts.py ingest <glob> [...]: merge many result files into one long table and chart it."""
+    p = argparse.ArgumentParser(prog="charts.py ingest",
+                                description="Parse many result files (<host>/<run_id>.txt) in parallel")
+    p.add_argument("patterns", nargs="+", help="Glob(s) of result files; ** is recursive")
+    p.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    p.add_argument("--out", type=Path, default=ROOT / "ingested_runs.npz",
+                   help="Long-format table output (.npz or .csv)")
+    p.add_argument("--no-charts", action="store_true", help="Only write the merged table")
+    _add_unit_option(p)
+    args = p.parse_args(argv)
+
+    paths = expand_inputs(args.patterns)
+    if not paths:
+        print(f"[error] No files match: {' '.join(args.patterns)}")
+        return 1
+
+    long_df, skipped = ingest_files(paths, workers=args.workers)
+    if skipped:
+        print(f"[warn] Skipped {len(skipped)} of {len(paths)} files:")
+        for path, reason in skipped:
+            print(f"  {path}: {reason}")
+    if long_df.empty:
+        print(f"[error] No sweep rows found in {len(paths)} files")
+        return 2
+    print(f"Ingested {len(paths) - len(skipped)} files: {len(long_df)} rows, "
+          f"{len(long_df[['Host', 'RunId']].drop_duplicates())} runs, {long_df['Host'].nunique()} hosts")
+
+    if args.out.suffix.lower() == ".csv":
+        long_df.to_csv(args.out, index=False)
+    else:
+        write_frames(args.out, {"runs": long_df})
+    print(f"[ok] Saved {args.out.name}")
+
+    if not args.no_charts:
+        # Samples of all runs pool into the same cells
+        cube = SweepCube.from_samples(_core_samples(long_df)).in_unit(args.unit)
+        plot_mylib_four_panels(cube, ROOT / "library_performance.png")
+        if _has_both_ops(cube):
+            metrics = compute_metrics(cube)
+            create_advanced_plots(metrics, ROOT / "advanced_performance_analysis.png")
+            create_mega_analysis(metrics, ROOT / "mega_performance_analysis.png")
+        else:
+            print("[warn] CottonCrypto data needs both ops; skipping advanced and MEGA analysis")
+    return 0
+
+
+def record_main(argv: list[str]) -> int:
+    """charts.py record <file> [...]: append result files to the benchmark history store."""
+    p = argparse.ArgumentParser(prog="charts.py record",
+                                description="Append runs (samples + machine/commit metadata) to the history store")
+    p.add_argument("files", nargs="+", type=Path, help="Result files (.txt, .trx or .jsonl), one run each")
+    p.add_argument("--store", type=Path, default=HISTORY_DEFAULT, help="History store directory")
+    p.add_argument("--git-sha", help="Commit measured (default: git rev-parse HEAD next to the file)")
+    p.add_argument("--host", help="Host name (default: this machine)")
+    p.add_argument("--openssl-version", help="OpenSSL version (default: openssl version)")
+    p.add_argument("--run-ts", type=pd.Timestamp, help="Run time, UTC (default: file modification time)")
+    args = p.parse_args(argv)
+
+    store = HistoryStore(args.store)
+    for path in args.files:
+        if not path.is_file():
+            print(f"[error] Not a file: {path}")
+            return 1
+        info = record_file(store, path, run_ts=args.run_ts, git_sha=args.git_sha, host=args.host,
+                           openssl_version=args.openssl_version)
+        print(f"[ok] Recorded {path.name} as {info.run_id}: {info.rows} samples, "
+              f"{info.host or '?'} @ {info.git_sha[:10] or '?'}")
+    with ResultsDb(args.store / DB_NAME) as db:
+        db.sync(store)
+    return 0
+
+
+def query_main(argv: list[str]) -> int:
+    """charts.py query <name>: answer common questions from the indexed results database."""
+    p = argparse.ArgumentParser(prog="charts.py query",
+                                description="Query recorded runs (see charts.py record)")
+    p.add_argument("name", nargs="?", choices=sorted(QUERIES), default="best",
+                   help="best: top config per host/op; trend: a cell across commits; runs: recorded runs")
+    p.add_argument("--store", type=Path, default=HISTORY_DEFAULT, help="History store directory")
+    p.add_argument("--days", type=float, help="Only runs from the last N days")
+    p.add_argument("--op", choices=["encrypt", "decrypt"])
+    p.add_argument("--threads", type=int)
+    p.add_argument("--chunk-bytes", type=int)
+    p.add_argument("--host")
+    p.add_argument("--git-sha", help="Commit (prefix)")
+    p.add_argument("--sql", help="Run this SQL instead (tables: runs, samples)")
+    p.add_argument("--csv", type=Path, help="Also write the result as CSV")
+    args = p.parse_args(argv)
+
+    with ResultsDb(args.store / DB_NAME) as db:
+        db.sync(HistoryStore(args.store))
+        t0 = time.perf_counter()
+        if args.sql:
+            df = db.query(args.sql)
+        else:
+            since = pd.Timestamp.now("UTC").tz_localize(None) - pd.Timedelta(days=args.days) if args.days else None
+            df = db.named_query(args.name, since=since, op=args.op, threads=args.threads,
+                                chunk_bytes=args.chunk_bytes, host=args.host, git_sha=args.git_sha)
+        elapsed_ms = (time.perf_counter() - t0) * 1000
+
+    print(df.to_string(index=False) if not df.empty else "(no rows)")
+    print(f"\n{len(df)} rows in {elapsed_ms:.1f} ms")
+    if args.csv:
+        df.to_csv(args.csv, index=False)
+    return 0
+
+
+def gate_main(argv: list[str]) -> int:
+    """charts.py gate <file>: fail (exit 1) when a fresh sweep regresses against recorded history."""
+    p = argparse.ArgumentParser(prog="charts.py gate",
+                                description="CI regression gate: compare a fresh sweep against the history store")
+    p.add_argument("candidate", type=Path, help="Fresh result file (.txt, .trx or .jsonl)")
+    p.add_argument("--store", type=Path, default=HISTORY_DEFAULT, help="History store directory")
+    p.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="Latest N recorded runs form the baseline")
+    p.add_argument("--host", help="Only baseline runs from this host")
+    p.add_argument("--baseline-sha", help="Only baseline runs of this commit (prefix)")
+    p.add_argument("--exclude-sha", help="Ignore runs of this commit (e.g. the candidate, if already recorded)")
+    p.add_argument("--placement", help="Only baseline runs pinned to this CPU placement "
+                                       "(default: the one a .jsonl candidate recorded)")
+    p.add_argument("--sigmas", type=float, default=DEFAULT_SIGMAS,
+                   help="Allowed drop in units of the cell's run-to-run standard deviation")
+    p.add_argument("--min-threshold", type=float, default=DEFAULT_MIN_THRESHOLD,
+                   help="Smallest allowed relative drop, for cells with no measurable noise")
+    p.add_argument("--json", type=Path, help="Write the verdict JSON here as well")
+    args = p.parse_args(argv)
+
+    if not args.candidate.is_file():
+        print(f"[error] Not a file: {args.candidate}")
+        return EXIT_NO_DATA
+    candidate = parse_sweep_samples(args.candidate)
+    if candidate.empty:
+        print(f"[error] No sweep rows in {args.candidate}")
+        return EXIT_NO_DATA
+    # Pinned runs only compare against runs pinned the same way
+    placement = args.placement
+    if placement is None:
+        layout = _cpu_layout(args.candidate, None)
+        placement = layout.placement if layout is not None else None
+
+    verdict = run_gate(HistoryStore(args.store), candidate, window=args.window, sigmas=args.sigmas,
+                       min_threshold=args.min_threshold, host=args.host, git_sha=args.baseline_sha,
+                       exclude_sha=args.exclude_sha, placement=placement)
+    for r in verdict.regressions:
+        facet = "" if (r.window_cap, r.memory_limit_bytes) == DEFAULT_FACET \
+            else f" ({facet_label((r.window_cap, r.memory_limit_bytes))})"
+        print(f"[fail] {r.op} {r.threads}T {format_size(r.chunk_bytes)}{facet}: {r.baseline:.1f} -> {r.candidate:.1f} "
+              f"{verdict.unit} ({r.delta * 100:+.1f}%, allowed -{r.threshold * 100:.1f}%)")
+    print(f"[{verdict.status}] {verdict.checked} cells checked against {len(verdict.baseline_runs)} runs, "
+          f"{len(verdict.regressions)} regressed")
+    text = verdict.to_json()
+    print(text)
+    if args.json:
+        args.json.write_text(text + "\n", encoding="utf-8")
+    return verdict.exit_code
+
+
+def changes_main(argv: list[str]) -> int:
+    """charts.py changes: find commits where a cell's throughput shifted, across recorded history."""
+    p = argparse.ArgumentParser(prog="charts.py changes",
+                                description="Change-point detection (PELT) over each cell's recorded history")
+    p.add_argument("--store", type=Path, default=HISTORY_DEFAULT, help="History store directory")
+    p.add_argument("--op", choices=["encrypt", "decrypt"])
+    p.add_argument("--threads", type=int)
+    p.add_argument("--chunk-bytes", type=int)
+    p.add_argument("--host")
+    p.add_argument("--penalty", type=float, default=DEFAULT_PENALTY,
+                   help="Cost of an extra segment, in sigma^2 * log(n) (higher = fewer changes)")
+    p.add_argument("--min-size", type=int, default=DEFAULT_MIN_SIZE, help="Fewest runs per segment")
+    p.add_argument("--min-shift", type=float, default=DEFAULT_MIN_SHIFT, help="Ignore relative shifts below this")
+    p.add_argument("--plot", action="store_true", help="Draw history charts of cells with changes")
+    p.add_argument("--out-dir", type=Path, default=ROOT, help="Directory for history_*.png")
+    _add_unit_option(p)
+    args = p.parse_args(argv)
+
+    series = cell_series(HistoryStore(args.store), op=args.op, threads=args.threads,
+                         chunk_bytes=args.chunk_bytes, host=args.host)
+    if series.empty:
+        print("[error] No recorded runs match (see charts.py record)")
+        return 1
+    changes = list(detect(series, penalty=args.penalty, min_size=args.min_size, min_shift=args.min_shift))
+    for cp in sorted(changes, key=lambda c: c.shift):
+        before = args.unit.from_bps(SAMPLE_THROUGHPUT_UNIT.to_bps(cp.before))
+        after = args.unit.from_bps(SAMPLE_THROUGHPUT_UNIT.to_bps(cp.after))
+        print(f"{cp.host or '?'} {cp.op} {cp.threads}T {format_size(cp.chunk_bytes)}: {cp.commit_range} "
+              f"({cp.after_ts:%Y-%m-%d}) {before:.1f} -> {after:.1f} {args.unit.name} ({cp.shift * 100:+.1f}%)")
+    cells = series.groupby(SERIES_KEY).ngroups
+    print(f"\n{len(changes)} change points in {cells} cells")
+
+    if args.plot:
+        args.out_dir.mkdir(parents=True, exist_ok=True)
+        by_cell: Dict[tuple, List[ChangePoint]] = {}
+        for cp in changes:
+            by_cell.setdefault((cp.host, cp.op, cp.threads, cp.chunk_bytes), []).append(cp)
+        for key, cell in series.groupby(SERIES_KEY):
+            key = (str(key[0]), str(key[1]), int(key[2]), int(key[3]))
+            # Cells without changes are only drawn when asked for explicitly
+            if key in by_cell or cells == 1:
+                host, op, threads, chunk = key
+                name = "_".join(p for p in ("history", re.sub(r"[^\w.-]", "_", host), op,
+                                            f"{threads}T", format_size(chunk)) if p)
+                plot_cell_history(cell, by_cell.get(key, []), args.unit, args.out_dir / f"{name}.png")
+    return 0
+
+
+def _split_dotnet_args(argv: list[str]) -> Tuple[list[str], list[str]]:
+    """Own arguments, and those after '--' that go to dotnet test verbatim."""
+    if "--" in argv:
+        i = argv.index("--")
+        return argv[:i], argv[i + 1:]
+    return argv, []
+
+
+def plan_main(argv: list[str]) -> int:
+    """charts.py plan: run the perf tests in rounds, repeating only cells whose CI is still wide."""
+    p = argparse.ArgumentParser(prog="charts.py plan",
+                                description="Adaptive iteration planner for the Performance test category",
+                                epilog="Arguments after -- are passed to dotnet test.")
+    p.add_argument("--project", type=Path, default=TESTS_PROJECT_DEFAULT, help="Test project (dotnet test target)")
+    p.add_argument("--out", type=Path, default=ROOT / "performance-results.jsonl",
+                   help="Merged measurements of all rounds (.jsonl)")
+    p.add_argument("--work-dir", type=Path, default=ROOT / ".perf-rounds", help="Per-round measurement files")
+    p.add_argument("--target-width", type=float, default=DEFAULT_TARGET_WIDTH,
+                   help="Stop repeating a cell once its CI is narrower than this share of its mean")
+    p.add_argument("--initial-iterations", type=int, default=DEFAULT_INITIAL_ITERATIONS)
+    p.add_argument("--round-iterations", type=int, default=DEFAULT_ROUND_ITERATIONS,
+                   help="Iterations added to each noisy cell per round")
+    p.add_argument("--max-iterations", type=int, default=DEFAULT_MAX_ITERATIONS, help="Per-cell sample cap")
+    p.add_argument("--max-rounds", type=int, default=DEFAULT_MAX_ROUNDS)
+    p.add_argument("--spec", type=Path, help="Sweep spec for data size, threads and chunks (see charts.py sweep)")
+    p.add_argument("--dotnet", default="dotnet", help="dotnet executable")
+    argv, extra = _split_dotnet_args(argv)
+    args = p.parse_args(argv)
+
+    settings = {}
+    spec = None
+    if args.spec:
+        try:
+            spec = load_spec(args.spec)
+        except (OSError, ValueError) as e:
+            print(f"[error] {e}")
+            return 1
+        if len(spec.data_sizes) > 1:
+            print(f"[warn] Planning with the first data size only ({format_size(spec.data_sizes[0])})")
+        # The planner chooses iterations itself
+        settings = {k: v for k, v in spec.environment(spec.data_sizes[0]).items() if k != ITERATIONS_VARIABLE}
+    try:
+        placements = resolve_placements(spec.placements if spec else None)
+    except ValueError as e:
+        print(f"[error] {e}")
+        return 1
+    placement = placements[0]
+    if len(placements) > 1:
+        print(f"[warn] Planning with the first placement only ({placement.name})")
+    settings.update(placement_environment(placement))
+    result = plan(args.project, args.work_dir, target_width=args.target_width,
+                  initial_iterations=args.initial_iterations, round_iterations=args.round_iterations,
+                  max_iterations=args.max_iterations, max_rounds=args.max_rounds, dotnet=args.dotnet,
+                  extra_args=extra, settings=settings, cpus=placement.cpus if placement is not None else ())
+    write_measurements(result.samples, args.out)
+
+    full = len(result.widths) * result.widths["Samples"].max()
+    print(f"[ok] {len(result.samples)} iterations in {len(result.rounds)} rounds "
+          f"(a fixed sweep at the deepest cell's count would take {full}); saved {args.out}")
+    loose = result.loose
+    if not loose.empty:
+        print(f"[warn] {len(loose)} cells still wider than {args.target_width:.0%}:")
+        for r in loose.sort_values("Width", ascending=False).itertuples():
+            facet = "" if (r.WindowCap, r.MemoryLimitBytes) == DEFAULT_FACET \
+                else f" ({facet_label((r.WindowCap, r.MemoryLimitBytes))})"
+            print(f"    {r.Op} {r.Threads}T {format_size(r.ChunkBytes)}{facet}: {r.Width:.1%} "
+                  f"after {r.Samples} samples")
+    return 0
+
+
+def tune_main(argv: list[str]) -> int:
+    """charts.py tune: search threads, chunk size, window cap and memory limit for the fastest cipher configuration."""
+    p = argparse.ArgumentParser(prog="charts.py tune",
+                                description="Bayesian optimisation of the AesGcmStreamCipher configuration",
+                                epilog="Arguments after -- are passed to dotnet test.")
+    p.add_argument("--project", type=Path, default=TESTS_PROJECT_DEFAULT, help="Test project (dotnet test target)")
+    p.add_argument("--out", type=Path, default=AUTO_TUNE_DEFAULT,
+                   help="Recommended configuration (.json, shown on the mega analysis chart)")
+    p.add_argument("--work-dir", type=Path, default=ROOT / ".perf-tune", help="Per-round measurement files")
+    p.add_argument("--budget", type=int, default=DEFAULT_BUDGET, help="Most configurations to measure")
+    p.add_argument("--initial", type=int, default=DEFAULT_INITIAL, help="Space-filling configurations of round 1")
+    p.add_argument("--batch", type=int, default=DEFAULT_BATCH, help="Configurations proposed per further round")
+    p.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="Iterations per configuration")
+    p.add_argument("--op", choices=["both", *OPS], default="both", help="Op(s) whose throughput is maximised")
+    p.add_argument("--max-threads", type=int,
+                   help="Thread count upper bound (default: 2 x the CPUs the run may use, the cipher's limit)")
+    p.add_argument("--max-window-cap", type=int, default=DEFAULT_MAX_WINDOW_CAP)
+    p.add_argument("--max-memory-limit", type=parse_size, default=DEFAULT_MAX_MEMORY_LIMIT,
+                   help="Memory limit upper bound (e.g. 4GiB); the top of the range means no limit")
+    p.add_argument("--no-memory-limit", action="store_true", help="Keep memoryLimitBytes null instead of tuning it")
+    p.add_argument("--min-gain", type=float, default=DEFAULT_MIN_GAIN,
+                   help="Stop once no candidate is expected to gain this share on the best one")
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--spec", type=Path, help="Sweep spec for data size and placement (see charts.py sweep)")
+    p.add_argument("--dotnet", default="dotnet", help="dotnet executable")
+    argv, extra = _split_dotnet_args(argv)
+    args = p.parse_args(argv)
+
+    settings = {}
+    spec = None
+    if args.spec:
+        try:
+            spec = load_spec(args.spec)
+        except (OSError, ValueError) as e:
+            print(f"[error] {e}")
+            return 1
+        if len(spec.data_sizes) > 1:
+            print(f"[warn] Tuning with the first data size only ({format_size(spec.data_sizes[0])})")
+        # The tuner chooses the cells and iterations itself
+        tuned = {ITERATIONS_VARIABLE, THREADS_VARIABLE, CHUNK_BYTES_VARIABLE, WINDOW_CAPS_VARIABLE,
+                 MEMORY_LIMITS_VARIABLE}
+        settings = {k: v for k, v in spec.environment(spec.data_sizes[0]).items() if k not in tuned}
+    try:
+        placements = resolve_placements(spec.placements if spec else None)
+    except ValueError as e:
+        print(f"[error] {e}")
+        return 1
+    placement = placements[0]
+    if len(placements) > 1:
+        print(f"[warn] Tuning with the first placement only ({placement.name})")
+    settings.update(placement_environment(placement))
+    cpus = placement.cpus if placement is not None else ()
+    try:
+        space = SearchSpace(max_threads=args.max_threads or default_max_threads(cpus),
+                            max_window_cap=args.max_window_cap, max_memory_limit=args.max_memory_limit,
+                            tune_memory_limit=not args.no_memory_limit)
+    except ValueError as e:
+        print(f"[error] {e}")
+        return 1
+    ops = OPS if args.op == "both" else (args.op,)
+    try:
+        result = tune(args.project, args.work_dir, space, ops=ops, budget=args.budget, initial=args.initial,
+                      batch=args.batch, iterations=args.iterations, min_gain=args.min_gain, seed=args.seed,
+                      dotnet=args.dotnet, extra_args=extra, settings=settings, cpus=cpus)
+    except RuntimeError as e:
+        print(f"[error] {e}")
+        return 2
+    write_result(result, args.out)
+
+    row = result.best_row
+    print(f"[ok] Best of {len(result.evaluations)} configurations in {result.rounds} rounds ({result.stopped}): "
+          f"{row['Score']:.1f} {SAMPLE_THROUGHPUT_UNIT.name} ({', '.join(f'{op} {row[op]:.1f}' for op in ops)})")
+    print(f"    {result.best.constructor()}")
+    print(f"    {result.best.encrypt_call()}")
+    print(f"    saved {args.out}")
+    return 0
+
+
+def sweep_main(argv: list[str]) -> int:
+    """charts.py sweep <spec>: run the perf tests as a TOML/YAML spec describes and record the results."""
+    p = argparse.ArgumentParser(prog="charts.py sweep",
+                                description="Run the Performance tests with a sweep spec and record the runs",
+                                epilog="Arguments after -- are passed to dotnet test.")
+    p.add_argument("spec", type=Path, help="Sweep spec (.toml, or .yaml/.yml with PyYAML)")
+    p.add_argument("--project", type=Path, default=TESTS_PROJECT_DEFAULT, help="Test project (dotnet test target)")
+    p.add_argument("--results-dir", type=Path, default=ROOT / ".perf-runs", help="Where the .jsonl files go")
+    p.add_argument("--store", type=Path, default=HISTORY_DEFAULT, help="History store directory")
+    p.add_argument("--no-record", action="store_true", help="Only run; do not append to the history store")
+    p.add_argument("--dotnet", default="dotnet", help="dotnet executable")
+    argv, extra = _split_dotnet_args(argv)
+    args = p.parse_args(argv)
+
+    try:
+        spec = load_spec(args.spec)
+    except (OSError, ValueError) as e:
+        print(f"[error] {e}")
+        return 1
+    store = None if args.no_record else HistoryStore(args.store)
+    files = run_sweep(spec, args.project, args.results_dir, store, dotnet=args.dotnet, extra_args=extra)
+    if store is not None:
+        with ResultsDb(args.store / DB_NAME) as db:
+            db.sync(store)
+    print(f"[ok] {len(files)} runs of '{spec.name}': {', '.join(f.name for f in files)}")
+    return 0
+
+
+def follow_main(argv: list[str]) -> int:
+    """charts.py --follow <logfile>: redraw the four library panels while a sweep is running."""
+    p = argparse.ArgumentParser(prog="charts.py --follow",
+                                description="Tail a growing dotnet test log and update library_performance.png")
+    p.add_argument("logfile", type=Path, help="Console log being written by dotnet test")
+    p.add_argument("--out", type=Path, default=ROOT / "library_performance.png", help="Image to rewrite")
+    p.add_argument("--interval", type=float, default=2.0, help="Minimum seconds between redraws")
+    p.add_argument("--poll", type=float, default=0.5, help="Seconds between checks of the log")
+    p.add_argument("--idle-exit", type=float, default=0.0,
+                   help="Stop after this many seconds without new rows (default: run until Ctrl+C)")
+    _add_unit_option(p)
+    args = p.parse_args(argv)
+
+    follower = LogFollower(args.logfile)
+    fig, axes = _mylib_figure()
+    interactive = plt.get_backend().lower() not in _FILE_BACKENDS
+    if interactive:
+        plt.show(block=False)
+
+    dirty: set[str] = set()
+    last_render = 0.0
+    last_change = time.monotonic()
+    print(f"Following {args.logfile} (Ctrl+C to stop)")
+    try:
+        while True:
+            touched = follower.poll()
+            now = time.monotonic()
+            if touched:
+                dirty |= touched
+                last_change = now
+            if dirty and now - last_render >= args.interval:
+                cube = SweepCube.from_samples(rows_to_samples(follower.rows)).in_unit(args.unit)
+                # Only panels of ops that got new rows are cleared and redrawn
+                for ax, (op, x) in zip(axes, MYLIB_PANELS):
+                    if op in dirty:
+                        ax.cla()
+                        _draw_mylib_panel(ax, cube, op, x)
+                fig.tight_layout()
+                fig.savefig(args.out, dpi=150, bbox_inches="tight")
+                print(f"[live] enc={cube.cells('encrypt')} dec={cube.cells('decrypt')} cells -> {args.out.name}")
+                dirty.clear()
+                last_render = now
+            if args.idle_exit and not dirty and now - last_change >= args.idle_exit:
+                break
+            if interactive:
+                plt.pause(args.poll)
+            else:
+                time.sleep(args.poll)
+    except KeyboardInterrupt:
+        pass
+    plt.close(fig)
+    return 0
+
+
+def diff_main(argv: list[str]) -> int:
+    """charts.py diff <baseline> <candidate>: per-cell change between two sweeps with significance."""
+    p = argparse.ArgumentParser(prog="charts.py diff",
+                                description="Compare two sweeps cell by cell (relative delta + Welch's t-test)")
+    p.add_argument("baseline", type=Path, help="Baseline result file (.txt, .trx or .jsonl)")
+    p.add_argument("candidate", type=Path, help="Candidate result file")
+    p.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="Significance level (default: 0.05)")
+    p.add_argument("--out", type=Path, default=ROOT / "sweep_diff.png", help="Heatmap image")
+    p.add_argument("--csv", type=Path, help="Also write the full per-cell table as CSV")
+    p.add_argument("--no-charts", action="store_true", help="Only print the table")
+    _add_unit_option(p)
+    args = p.parse_args(argv)
+
+    cubes = []
+    for path in (args.baseline, args.candidate):
+        if not path.is_file():
+            print(f"[error] Not a file: {path}")
+            return 1
+        cubes.append(SweepCube.from_samples(_core_samples(parse_sweep_samples(path))).in_unit(args.unit))
+    diff = diff_cubes(*cubes, alpha=args.alpha)
+    if diff.table.empty:
+        print("[error] The sweeps share no (op, threads, chunk) cell")
+        return 2
+
+    t = diff.table
+    print(pd.DataFrame({
+        "Op": t["Op"],
+        "Threads": t["Threads"],
+        "Chunk": [format_size(c) for c in t["ChunkBytes"]],
+        f"Base {args.unit.name}": t["Baseline"].map("{:.1f}".format),
+        f"New {args.unit.name}": t["Candidate"].map("{:.1f}".format),
+        "Change": [_format_delta(d, sig) for d, sig in zip(t["Delta"], t["Significant"])],
+        "p": t["PValue"].map(lambda v: "n/a" if np.isnan(v) else f"{v:.3g}"),
+    }).to_string(index=False))
+    regressions = diff.regressions
+    improvements = diff.table[diff.table["Significant"] & (diff.table["Delta"] > 0)]
+    untested = int(diff.table["PValue"].isna().sum())
+    print(f"\n{len(diff.table)} cells: {len(regressions)} significantly slower, "
+          f"{len(improvements)} significantly faster (p < {args.alpha:g})"
+          + (f", {untested} without per-iteration samples" if untested else ""))
+
+    if args.csv:
+        diff.table.to_csv(args.csv, index=False)
+    if not args.no_charts:
+        plot_sweep_diff(diff, args.unit.name, (args.baseline.name, args.candidate.name), args.out)
+    return 0
+
+
+def _cpu_layout(path: Path, physical_cores: Optional[int]) -> Optional[CpuLayout]:
+    """CPU layout path was measured on: --physical-cores if given, else what a .jsonl file recorded."""
+    if physical_cores is not None:
+        return CpuLayout(UNPINNED, physical_cores)
+    if path.suffix.lower() == ".jsonl":
+        return measured_layout(load_measurements(path))
+    return None
+
+
 def main(argv: Optional[list[str]] = None) -> int:
     # Allow optional custom paths: charts.py [mylib_input] [openssl_input]
+    # [--summary-only] [--unit MiB/s|MB/s|...] [--physical-cores N], or a subcommand: charts.py ingest <glob> | record <file> | query [name] | diff <a> <b> | gate <file> | changes | sweep <spec> | plan | tune | --follow <logfile>
     args = sys.argv[1:] if argv is None else argv
+    if args and args[0] == "ingest":
+        return ingest_main(args[1:])
+    if args and args[0] == "record":
+        return record_main(args[1:])
+    if args and args[0] == "query":
+        return query_main(args[1:])
+    if args and args[0] == "gate":
+        return gate_main(args[1:])
+    if args and args[0] == "changes":
+        return changes_main(args[1:])
+    if args and args[0] == "sweep":
+        return sweep_main(args[1:])
+    if args and args[0] == "plan":
+        return plan_main(args[1:])
+    if args and args[0] == "tune":
+        return tune_main(args[1:])
+    if args and args[0] == "diff":
+        return diff_main(args[1:])
+    if args and args[0] == "--follow":
+        return follow_main(args[1:])
+    # --summary-only: print the text summary without drawing (matplotlib is never imported)
+    summary_only = "--summary-only" in args
+    args = [a for a in args if a != "--summary-only"]
+    # --unit <name>: throughput unit every chart and the summary are rendered in
+    unit = DEFAULT_DISPLAY_UNIT
+    if "--unit" in args:
+        i = args.index("--unit")
+        try:
+            unit = throughput_unit(args[i + 1] if i + 1 < len(args) else "")
+        except ValueError as exc:
+            print(f"[error] {exc}")
+            return 1
+        del args[i:i + 2]
+    # --physical-cores <n>: mark where SMT begins on logs, which do not record their CPU placement
+    physical_cores = None
+    if "--physical-cores" in args:
+        i = args.index("--physical-cores")
+        value = args[i + 1] if i + 1 < len(args) else ""
+        if not value.isdigit() or int(value) < 1:
+            print(f"[error] --physical-cores needs a positive integer, got '{value}'")
+            return 1
+        physical_cores = int(value)
+        del args[i:i + 2]
     mylib_path = Path(args[0]).resolve() if len(args) >= 1 else MYLIB_INPUT_DEFAULT
     openssl_path = Path(args[1]).resolve() if len(args) >= 2 else OPENSSL_INPUT_DEFAULT
 
@@ -593,37 +1383,54 @@ def main(argv: Optional[list[str]] = None) -> int:
         print(f"[error] CottonCrypto input not found: {mylib_path}")
         return 1
 
-    enc, dec = parse_mylib_results(mylib_path)
-    if enc.empty or dec.empty:
+    # Parsed once into the op x threads x chunk x sample cube every chart slices;
+    # extra window cap / memory limit facets get their own small-multiple charts
+    samples = parse_sweep_samples(mylib_path)
+    cube = SweepCube.from_samples(_core_samples(samples)).in_unit(unit)
+    if not _has_both_ops(cube):
         print(f"[error] Failed to parse CottonCrypto data from {mylib_path}")
         return 2
-
-    print(f"Loaded CottonCrypto data: enc={len(enc)} rows, dec={len(dec)} rows")
-    # 1) Core four panels
-    plot_mylib_four_panels(enc, dec, ROOT / "library_performance.png")
-    # 2) Advanced analysis (6 charts)
-    create_advanced_plots(enc, dec, ROOT / "advanced_performance_analysis.png")
-    # 3) MEGA analysis (multi charts)
-    create_mega_analysis(enc, dec, ROOT / "mega_performance_analysis.png")
+    cube = cube.with_cpu(_cpu_layout(mylib_path, physical_cores))
+    metrics = compute_metrics(cube)
+
+    print(f"Loaded CottonCrypto data: enc={cube.cells('encrypt')} rows, dec={cube.cells('decrypt')} rows")
+    # A charts.py tune result replaces the best measured cell as the recommended configuration
+    recommendation = None
+    if AUTO_TUNE_DEFAULT.exists():
+        try:
+            recommendation = load_recommendation(AUTO_TUNE_DEFAULT)
+            print(f"[info] Recommending the auto-tuned configuration from {AUTO_TUNE_DEFAULT.name}")
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[warn] Ignoring {AUTO_TUNE_DEFAULT.name}: {e}")
+    if not summary_only:
+        # 1) Core four panels
+        plot_mylib_four_panels(cube, ROOT / "library_performance.png")
+        # 2) Advanced analysis (6 charts)
+        create_advanced_plots(metrics, ROOT / "advanced_performance_analysis.png")
+        # 3) MEGA analysis (multi charts)
+        create_mega_analysis(metrics, ROOT / "mega_performance_analysis.png", recommendation)
+
+    facets = facet_values(samples)
+    if len(facets) > 1:
+        print(f"Loaded {len(facets)} window cap / memory limit facets")
+        if not summary_only:
+            for op in OPS:
+                plot_facet_grid(samples, op, unit, ROOT / f"facets_{op}.png")
+            plot_memory_cap_cost(facet_table(samples), ROOT / "memory_cap_cost.png")
 
     # OpenSSL part is optional
     ossl_df = pd.DataFrame()
     if openssl_path.exists():
         ossl_df = parse_openssl_results(openssl_path)
         print(f"Loaded OpenSSL data: {len(ossl_df)} points")
-        plot_openssl_comparison(enc, dec, ossl_df, ROOT / "openssl_comparison.png")
+        if not summary_only:
+            plot_openssl_comparison(metrics, ossl_df, ROOT / "openssl_comparison.png")
     else:
         print(f"[info] OpenSSL input not found, skipping comparison: {openssl_path}")
 
-    # Print a tiny summary to console
-    enc_best = enc.loc[enc["Throughput"].idxmax()]
-    dec_best = dec.loc[dec["Throughput"].idxmax()]
-    print("\nSummary:")
-    print(f"  CottonCrypto Encrypt best: {enc_best['Throughput']:.1f} MB/s at {enc_best['Threads']} threads, {enc_best['ChunkMB']}MB chunks")
-    print(f"  CottonCrypto Decrypt best: {dec_best['Throughput']:.1f} MB/s at {dec_best['Threads']} threads, {dec_best['ChunkMB']}MB chunks")
-    if not ossl_df.empty:
-        print(f"  OpenSSL best: {ossl_df['ThroughputMBps'].max():.1f} MB/s at {int(ossl_df.loc[ossl_df['ThroughputMBps'].idxmax(), 'BlockBytes'])} bytes buffer")
-
+    print("\n" + format_summary(metrics, ossl_df))
+    if len(facets) > 1:
+        print(format_facet_summary(facet_table(samples), unit))
     return 0
 
 
@@ -0,0 +1,180 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+
+SYSFS_CPU = Path("/sys/devices/system/cpu")
+
+# Where a pinned sweep runs (taskset -c):
+#   physical      one hardware thread of every core on the first socket
+#   smt           every hardware thread on the first socket (SMT siblings included)
+#   cross-socket  one hardware thread of every core on every socket
+# Unpinned runs use the whole machine and are recorded as UNPINNED
+PLACEMENTS = ("physical", "smt", "cross-socket")
+UNPINNED = "unpinned"
+
+
+@dataclass(frozen=True)
+class LogicalCpu:
+    cpu: int                 # OS CPU number, as taskset takes it
+    core: int                # core_id, unique within its package
+    package: int             # physical_package_id (socket)
+    node: int = 0            # NUMA node; 0 when sysfs has no node links
+
+
+@dataclass(frozen=True)
+class CpuLayout:
+    """What a sweep's thread counts ran on: where SMT siblings and oversubscription begin.
+
+    logical_cpus is the CPU count the run could use (the tests' processorCount,
+    i.e. its affinity mask); 0 when unknown, as for console logs.
+    """
+    placement: str
+    physical_cores: int
+    logical_cpus: int = 0
+
+    @property
+    def smt_threads(self) -> Optional[int]:
+        """Thread count above which SMT siblings share cores; None when the run had no siblings."""
+        if self.logical_cpus and self.logical_cpus <= self.physical_cores:
+            return None
+        return self.physical_cores
+
+    def describe(self) -> str:
+        cpus = f", {self.logical_cpus} CPUs" if self.logical_cpus else ""
+        return f"{self.placement}: {self.physical_cores} physical cores{cpus}"
+
+
+@dataclass(frozen=True)
+class Placement:
+    """CPUs one placement pins a run to."""
+    name: str
+    cpus: Tuple[int, ...]    # empty: not pinned
+    physical_cores: int
+
+
+def parse_cpu_list(text: str) -> List[int]:
+    """CPUs of a sysfs / taskset list such as '0-3,8,10-11'."""
+    cpus: List[int] = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        lo, _, hi = part.partition("-")
+        cpus.extend(range(int(lo), int(hi or lo) + 1))
+    return cpus
+
+
+def format_cpu_list(cpus: Sequence[int]) -> str:
+    """Compact list for taskset -c: [0, 1, 2, 3, 8] -> '0-3,8'."""
+    parts: List[str] = []
+    ordered = sorted(set(cpus))
+    start = prev = None
+    for cpu in ordered + [None]:
+        if start is not None and cpu == prev + 1:
+            prev = cpu
+            continue
+        if start is not None:
+            parts.append(str(start) if start == prev else f"{start}-{prev}")
+        start = prev = cpu
+    return ",".join(parts)
+
+
+def _read_int(path: Path, default: int) -> int:
+    try:
+        value = int(path.read_text().strip())
+    except (OSError, ValueError):
+        return default
+    # Some virtual machines report -1 for an unknown package
+    return value if value >= 0 else default
+
+
+class CpuTopology:
+    """Logical CPUs of this machine grouped into cores, sockets and NUMA nodes."""
+
+    def __init__(self, cpus: Sequence[LogicalCpu]) -> None:
+        if not cpus:
+            raise ValueError("no online CPUs")
+        self.cpus = tuple(sorted(cpus, key=lambda c: c.cpu))
+
+    @classmethod
+    def read(cls, root: Path = SYSFS_CPU) -> "CpuTopology":
+        """Read the online CPUs from sysfs (Linux); raises OSError where it is missing."""
+        root = Path(root)
+        cpus = []
+        for cpu in parse_cpu_list((root / "online").read_text()):
+            topology = root / f"cpu{cpu}" / "topology"
+            nodes = sorted((root / f"cpu{cpu}").glob("node[0-9]*"))
+            cpus.append(LogicalCpu(
+                cpu=cpu,
+                core=_read_int(topology / "core_id", cpu),
+                package=_read_int(topology / "physical_package_id", 0),
+                node=int(nodes[0].name[4:]) if nodes else 0,
+            ))
+        return cls(cpus)
+
+    def cores(self, packages: Optional[Sequence[int]] = None) -> Dict[Tuple[int, int], List[int]]:
+        """(package, core) -> its logical CPUs (SMT siblings), optionally of some packages only."""
+        cores: Dict[Tuple[int, int], List[int]] = {}
+        for c in self.cpus:
+            if packages is None or c.package in packages:
+                cores.setdefault((c.package, c.core), []).append(c.cpu)
+        return cores
+
+    @property
+    def packages(self) -> List[int]:
+        return sorted({c.package for c in self.cpus})
+
+    @property
+    def nodes(self) -> List[int]:
+        return sorted({c.node for c in self.cpus})
+
+    @property
+    def physical_cores(self) -> int:
+        return len(self.cores())
+
+    @property
+    def has_smt(self) -> bool:
+        return self.physical_cores < len(self.cpus)
+
+    def placement(self, name: str) -> Placement:
+        """CPUs of the named placement (PLACEMENTS, or UNPINNED for the whole machine unpinned).
+
+        Raises ValueError when this machine cannot tell it apart from another one:
+        'smt' without SMT siblings is 'physical', 'cross-socket' on one socket too.
+        """
+        if name == UNPINNED:
+            return Placement(name, (), self.physical_cores)
+        if name not in PLACEMENTS:
+            raise ValueError(f"unknown placement '{name}' (expected one of {', '.join(PLACEMENTS)})")
+        if name == "smt" and not self.has_smt:
+            raise ValueError("no SMT siblings on this machine; 'smt' would equal 'physical'")
+        if name == "cross-socket" and len(self.packages) < 2:
+            raise ValueError("a single socket on this machine; 'cross-socket' would equal 'physical'")
+        cores = self.cores(None if name == "cross-socket" else self.packages[:1])
+        if name == "smt":
+            cpus = [cpu for siblings in cores.values() for cpu in siblings]
+        else:
+            cpus = [min(siblings) for siblings in cores.values()]
+        return Placement(name, tuple(sorted(cpus)), len(cores))
+
+    def describe(self) -> str:
+        return (f"{len(self.cpus)} CPUs, {self.physical_cores} physical cores, "
+                f"{len(self.packages)} sockets, {len(self.nodes)} NUMA nodes")
+
+
+def measured_layout(measurements: pd.DataFrame) -> Optional[CpuLayout]:
+    """CpuLayout recorded in PerformanceTests measurements (placement, physicalCores, processorCount).
+
+    None when the run did not record its placement, or the rows disagree.
+    """
+    if measurements.empty or "physicalCores" not in measurements:
+        return None
+    cols = ["placement", "physicalCores", "processorCount"]
+    layouts = measurements[[c for c in cols if c in measurements]].dropna().drop_duplicates()
+    if len(layouts) != 1:
+        return None
+    row = layouts.iloc[0]
+    return CpuLayout(str(row.get("placement", UNPINNED)), int(row["physicalCores"]),
+                     int(row.get("processorCount", 0)))
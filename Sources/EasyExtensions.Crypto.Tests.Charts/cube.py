@@ -0,0 +1,141 @@
+import warnings
+from dataclasses import dataclass, field
+from typing import Dict, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from cpu_topology import CpuLayout
+from facets import facet_values
+from units import BPS, MIB, SAMPLE_THROUGHPUT_UNIT, Unit
+
+
+OPS = ("encrypt", "decrypt")
+Index = Union[int, slice, np.ndarray]
+
+
+class CellStats(NamedTuple):
+    """Per-cell summary arrays of a cube slice (NaN where a cell was not measured)."""
+    mean: np.ndarray
+    min: np.ndarray
+    median: np.ndarray
+    max: np.ndarray
+    count: np.ndarray
+
+
+@dataclass(frozen=True, eq=False)
+class SweepCube:
+    """Dense op x threads x chunk x sample array of throughput samples.
+
+    Built once from a sample-level (or long, multi-run) table; cells that were
+    not measured, and sample slots beyond a cell's count, are NaN. Per-cell
+    mean/min/median/max/count are precomputed, so plots slice by index instead
+    of filtering rows, and cost does not grow with the number of samples.
+    Samples are in canonical bytes/s unless converted with in_unit(). cpu,
+    when known, tells where the thread axis runs into SMT siblings.
+    """
+    threads: np.ndarray              # sorted thread counts (axis 1)
+    chunk_bytes: np.ndarray          # sorted chunk sizes in bytes (axis 2)
+    samples: np.ndarray              # float64 [op, threads, chunk, sample], in unit
+    ops: Tuple[str, ...] = OPS       # axis 0
+    unit: Unit = BPS
+    cpu: Optional[CpuLayout] = None
+    mean: np.ndarray = field(init=False, repr=False)
+    min: np.ndarray = field(init=False, repr=False)
+    median: np.ndarray = field(init=False, repr=False)
+    max: np.ndarray = field(init=False, repr=False)
+    count: np.ndarray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN (unmeasured) cells
+            stats = {
+                "mean": np.nanmean(self.samples, axis=3),
+                "min": np.nanmin(self.samples, axis=3),
+                "median": np.nanmedian(self.samples, axis=3),
+                "max": np.nanmax(self.samples, axis=3),
+            }
+        stats["count"] = np.count_nonzero(~np.isnan(self.samples), axis=3)
+        for name, value in stats.items():
+            object.__setattr__(self, name, value)
+
+    @classmethod
+    def from_samples(cls, samples: pd.DataFrame) -> "SweepCube":
+        """Build from a table with Op, Threads, ChunkBytes and Throughput (one row per sample).
+
+        Throughput is read in SAMPLE_THROUGHPUT_UNIT (MiB/s) and stored as bytes/s.
+        The table must hold a single window cap / memory limit (see facets.select_facet).
+        """
+        if len(facet_values(samples)) > 1:
+            raise ValueError("samples span several window caps / memory limits; select one facet first")
+        samples = samples[samples["Op"].isin(OPS)]
+        threads = np.sort(samples["Threads"].unique()).astype(np.int64)
+        chunk_bytes = np.sort(samples["ChunkBytes"].unique()).astype(np.int64)
+        o = pd.Categorical(samples["Op"], categories=OPS).codes
+        t = np.searchsorted(threads, samples["Threads"].to_numpy())
+        c = np.searchsorted(chunk_bytes, samples["ChunkBytes"].to_numpy())
+        # Position of each sample within its cell
+        s = pd.Series(np.zeros(len(samples))).groupby([o, t, c]).cumcount().to_numpy()
+        depth = int(s.max()) + 1 if len(s) else 1
+        cube = np.full((len(OPS), len(threads), len(chunk_bytes), depth), np.nan)
+        cube[o, t, c, s] = SAMPLE_THROUGHPUT_UNIT.to_bps(samples["Throughput"].to_numpy(dtype=float))
+        return cls(threads, chunk_bytes, cube)
+
+    def in_unit(self, unit: Unit) -> "SweepCube":
+        """The same cube with throughput expressed in unit (e.g. for display)."""
+        if unit == self.unit:
+            return self
+        return SweepCube(self.threads, self.chunk_bytes, unit.from_bps(self.unit.to_bps(self.samples)), self.ops, unit,
+                         self.cpu)
+
+    def with_cpu(self, cpu: Optional[CpuLayout]) -> "SweepCube":
+        """The same cube, annotated with the CPU layout it was measured on."""
+        return SweepCube(self.threads, self.chunk_bytes, self.samples, self.ops, self.unit, cpu)
+
+    @property
+    def chunk_mb(self) -> np.ndarray:
+        """Chunk axis in MiB, for display."""
+        return self.chunk_bytes / MIB
+
+    @property
+    def empty(self) -> bool:
+        return not self.count.any()
+
+    def op_index(self, op: str) -> int:
+        return self.ops.index(op)
+
+    def has_op(self, op: str) -> bool:
+        return self.cells(op) > 0
+
+    def cells(self, op: str) -> int:
+        """Number of measured (thread, chunk) cells of op."""
+        return int(np.count_nonzero(self.count[self.op_index(op)]))
+
+    def chunk_indices(self, op: str) -> np.ndarray:
+        """Positions on axis 2 of the chunk sizes op was measured at."""
+        return np.flatnonzero(self.count[self.op_index(op)].any(axis=0))
+
+    def has_chunk_axis(self, op: str) -> bool:
+        """Whether op was measured at several chunk sizes, so that plotting it against chunk size means something.
+
+        Decrypt data from before the tests encrypted one payload per chunk size
+        all sits at sweep_parser.DEFAULT_CHUNK_BYTES.
+        """
+        return len(self.chunk_indices(op)) > 1
+
+    def thread_index(self, threads: int) -> int:
+        """Position of a thread count on axis 1, or -1 if it was not swept."""
+        i = int(np.searchsorted(self.threads, threads))
+        return i if i < len(self.threads) and self.threads[i] == threads else -1
+
+    def stats(self, op: str, t: Index = slice(None), c: Index = slice(None)) -> CellStats:
+        """Summary arrays for op at thread index t and chunk index c."""
+        key = (self.op_index(op), t, c)
+        return CellStats(self.mean[key], self.min[key], self.median[key], self.max[key], self.count[key])
+
+    def best(self, op: str) -> Dict[str, float]:
+        """Highest-mean cell of op: {'Throughput', 'Threads', 'ChunkBytes', 'ChunkMB'}."""
+        mean = self.mean[self.op_index(op)]
+        t, c = np.unravel_index(np.nanargmax(mean), mean.shape)
+        return {"Throughput": float(mean[t, c]), "Threads": int(self.threads[t]),
+                "ChunkBytes": int(self.chunk_bytes[c]), "ChunkMB": float(self.chunk_mb[c])}
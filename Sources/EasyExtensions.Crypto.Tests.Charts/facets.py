@@ -0,0 +1,96 @@
+from typing import List, Tuple
+
+import pandas as pd
+
+from units import SAMPLE_THROUGHPUT_UNIT, Unit, format_size
+
+
+# Cipher settings swept next to threads x chunk (PERF_WINDOW_CAPS / PERF_MEMORY_LIMITS).
+# Sample tables carry them only when the source records them (.jsonl); logs and
+# older files measured the cipher defaults
+FACET_COLUMNS = ["WindowCap", "MemoryLimitBytes"]
+DEFAULT_WINDOW_CAP = 1024          # AesGcmStreamCipher default
+NO_MEMORY_LIMIT = 0                # memoryLimitBytes: null in the measurements
+
+Facet = Tuple[int, int]            # (window cap, memory limit bytes or NO_MEMORY_LIMIT)
+DEFAULT_FACET: Facet = (DEFAULT_WINDOW_CAP, NO_MEMORY_LIMIT)
+
+
+def with_facets(df: pd.DataFrame) -> pd.DataFrame:
+    """df with both FACET_COLUMNS present, missing values filled with the cipher defaults."""
+    if all(c in df and not df[c].isna().any() for c in FACET_COLUMNS):
+        return df
+    df = df.copy()
+    for col, default in zip(FACET_COLUMNS, DEFAULT_FACET):
+        df[col] = (df[col].fillna(default) if col in df else default)
+        df[col] = df[col].astype("int64")
+    return df
+
+
+def facet_values(df: pd.DataFrame) -> List[Facet]:
+    """Distinct (window cap, memory limit) pairs in df, sorted; [DEFAULT_FACET] without facet columns."""
+    df = with_facets(df)
+    if df.empty:
+        return [DEFAULT_FACET]
+    pairs = df[FACET_COLUMNS].drop_duplicates().itertuples(index=False, name=None)
+    return sorted((int(w), int(m)) for w, m in pairs)
+
+
+def select_facet(df: pd.DataFrame, facet: Facet) -> pd.DataFrame:
+    """Rows of df measured with the given (window cap, memory limit)."""
+    df = with_facets(df)
+    window_cap, memory_limit = facet
+    return df[(df["WindowCap"] == window_cap) & (df["MemoryLimitBytes"] == memory_limit)]
+
+
+def default_facet(df: pd.DataFrame) -> pd.DataFrame:
+    """Rows measured with the cipher defaults: the classic threads x chunk sweep."""
+    return select_facet(df, DEFAULT_FACET)
+
+
+def memory_limit_label(memory_limit: int) -> str:
+    return "no limit" if memory_limit == NO_MEMORY_LIMIT else format_size(memory_limit)
+
+
+def facet_label(facet: Facet) -> str:
+    """Short label: 'window 1024, no limit', 'window 64, 32MiB'."""
+    return f"window {facet[0]}, {memory_limit_label(facet[1])}"
+
+
+def memory_limit_order(limits) -> List[int]:
+    """Memory limits from loosest to tightest: no limit first, then descending."""
+    return sorted(set(limits), key=lambda m: (m != NO_MEMORY_LIMIT, -m))
+
+
+def facet_table(samples: pd.DataFrame) -> pd.DataFrame:
+    """Best cell of every op per facet, and what the memory limit costs it.
+
+    Columns: Op, WindowCap, MemoryLimitBytes, Threads, ChunkBytes, Throughput
+    (mean of the best cell, MiB/s) and Relative: Throughput over the same op
+    and window cap without a memory limit (NaN when that was not measured).
+    """
+    df = with_facets(samples)
+    key = ["Op"] + FACET_COLUMNS
+    means = df.groupby(key + ["Threads", "ChunkBytes"])["Throughput"].mean().reset_index()
+    best = means.loc[means.groupby(key)["Throughput"].idxmax()].reset_index(drop=True)
+    unlimited = (best[best["MemoryLimitBytes"] == NO_MEMORY_LIMIT]
+                 .set_index(["Op", "WindowCap"])["Throughput"])
+    reference = unlimited.reindex(pd.MultiIndex.from_frame(best[["Op", "WindowCap"]])).to_numpy()
+    best["Relative"] = best["Throughput"].to_numpy() / reference
+    order = {m: i for i, m in enumerate(memory_limit_order(best["MemoryLimitBytes"]))}
+    best = best.assign(_op=pd.Categorical(best["Op"], categories=["encrypt", "decrypt"]),
+                       _limit=best["MemoryLimitBytes"].map(order))
+    return (best.sort_values(["_op", "WindowCap", "_limit"]).drop(columns=["_op", "_limit"])
+            .reset_index(drop=True))
+
+
+def format_facet_summary(table: pd.DataFrame, unit: Unit) -> str:
+    """Text block of facet_table(): best cell per op and facet, with the cost of each memory limit."""
+    lines = ["  Best cell per window cap / memory limit:"]
+    for r in table.itertuples():
+        value = unit.from_bps(SAMPLE_THROUGHPUT_UNIT.to_bps(r.Throughput))
+        cost = f" ({(r.Relative - 1) * 100:+.1f}% vs no limit)" \
+            if r.MemoryLimitBytes != NO_MEMORY_LIMIT and r.Relative == r.Relative else ""
+        lines.append(f"    {r.Op} {facet_label((r.WindowCap, r.MemoryLimitBytes))}: {value:.1f} {unit.name} "
+                     f"at {r.Threads} threads, {format_size(r.ChunkBytes)} chunks{cost}")
+    return "\n".join(lines)
@@ -0,0 +1,281 @@
+import json
+import os
+import platform
+import re
+import socket
+import subprocess
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from cpu_topology import UNPINNED, measured_layout
+from facets import DEFAULT_FACET, FACET_COLUMNS
+from sweep_parser import LONG_COLUMNS, SAMPLE_COLUMNS, parse_sweep_samples
+
+
+MANIFEST_NAME = "manifest.jsonl"
+PARTITIONS_DIR = "runs"
+# Run metadata columns added to every history row (next to LONG_COLUMNS)
+META_COLUMNS = ["GitSha", "CpuModel", "ProcessorCount", "DotnetVersion", "OpensslVersion", "Placement",
+                "PhysicalCores"]
+HISTORY_COLUMNS = LONG_COLUMNS + FACET_COLUMNS + META_COLUMNS
+_MMAP_MIN_ROWS = 1 << 16
+
+
+@dataclass
+class RunInfo:
+    """One manifest line: who/where/when a run was measured, plus partition stats for pruning."""
+    run_id: str
+    run_ts: str                      # ISO 8601, naive UTC
+    host: str = ""
+    git_sha: str = ""
+    cpu_model: str = ""
+    processor_count: int = 0
+    dotnet_version: str = ""
+    openssl_version: str = ""
+    placement: str = ""              # cpu_topology placement the run was pinned to ('' if not recorded)
+    physical_cores: int = 0          # physical cores of that placement (0 if not recorded)
+    source: str = ""
+    rows: int = 0
+    ops: List[str] = field(default_factory=list)
+    threads: List[int] = field(default_factory=list)
+    chunk_bytes: List[int] = field(default_factory=list)
+    dtypes: Dict[str, str] = field(default_factory=dict)   # column -> numpy dtype string
+
+    @property
+    def timestamp(self) -> pd.Timestamp:
+        return pd.Timestamp(self.run_ts)
+
+
+def _command_output(args: Sequence[str], cwd: Optional[Path] = None) -> str:
+    try:
+        out = subprocess.run(args, cwd=cwd, capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return ""
+    return out.stdout.strip() if out.returncode == 0 else ""
+
+
+def git_head(directory: Path) -> str:
+    """Commit checked out in the git work tree containing directory ('' outside one)."""
+    return _command_output(["git", "rev-parse", "HEAD"], cwd=directory)
+
+
+def cpu_model() -> str:
+    """CPU model name from /proc/cpuinfo (Linux), else whatever platform reports."""
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def collect_run_metadata(source: Path) -> Dict[str, Union[str, int]]:
+    """Best-effort metadata of the machine and checkout that produced source.
+
+    ProcessorCount and the .NET version come from the measurements themselves
+    when source is a PerformanceTests .jsonl file; otherwise from this machine.
+    So does the CPU placement, which only orchestrated runs record.
+    """
+    source = Path(source)
+    meta: Dict[str, Union[str, int]] = {
+        "host": socket.gethostname(),
+        "git_sha": git_head(source.parent),
+        "cpu_model": cpu_model(),
+        "processor_count": os.cpu_count() or 0,
+        "dotnet_version": _command_output(["dotnet", "--version"]),
+        "openssl_version": " ".join(_command_output(["openssl", "version"]).split()[:2]),
+    }
+    if source.suffix.lower() == ".jsonl":
+        from jsonl_loader import load_measurements
+        df = load_measurements(source)
+        if not df.empty:
+            meta["processor_count"] = int(df["processorCount"].iloc[0])
+            meta["dotnet_version"] = str(df["runtimeVersion"].iloc[0])
+            layout = measured_layout(df)
+            if layout is not None:
+                meta["placement"] = layout.placement
+                meta["physical_cores"] = layout.physical_cores
+    return meta
+
+
+def _read_column(path: str, dtype: str, rows: int) -> np.ndarray:
+    # Small partitions are cheaper to read outright than to map
+    if rows >= _MMAP_MIN_ROWS:
+        return np.memmap(path, dtype=dtype, mode="r", shape=(rows,))
+    return np.fromfile(path, dtype=dtype)
+
+
+class HistoryStore:
+    """Append-only columnar store of sweep samples, one partition per run.
+
+    Layout:
+        manifest.jsonl          one RunInfo per line, appended after its partition is complete
+        runs/<run_id>/<col>.bin one raw array per SAMPLE_COLUMNS column (dtype in the manifest),
+                                plus FACET_COLUMNS when the source recorded them
+
+    Reads prune whole runs through the manifest (date, host, commit and the
+    op/threads/chunk values each run contains), then filter the remaining
+    partitions column-wise (large ones are memory-mapped, so only touched
+    pages are read). Nothing is ever rewritten.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+        self.manifest_path = self.root / MANIFEST_NAME
+
+    def runs(self) -> List[RunInfo]:
+        if not self.manifest_path.exists():
+            return []
+        with open(self.manifest_path, encoding="utf-8") as f:
+            return [RunInfo(**json.loads(line)) for line in f if line.strip()]
+
+    def _unique_run_id(self, base: str) -> str:
+        run_id, n = base, 1
+        while (self.root / PARTITIONS_DIR / run_id).exists():
+            n += 1
+            run_id = f"{base}-{n}"
+        return run_id
+
+    def append(self, samples: pd.DataFrame, run_ts: pd.Timestamp, source: str = "",
+               **meta: Union[str, int]) -> RunInfo:
+        """Store one run's sample-level table (SAMPLE_COLUMNS, FACET_COLUMNS if present) with its metadata."""
+        if samples.empty:
+            raise ValueError("refusing to record an empty run")
+        host = str(meta.get("host", ""))
+        sha = str(meta.get("git_sha", ""))
+        base = "-".join(p for p in (run_ts.strftime("%Y%m%dT%H%M%S"), re.sub(r"[^\w.-]", "_", host), sha[:8]) if p)
+        run_id = self._unique_run_id(base)
+
+        part = self.root / PARTITIONS_DIR / run_id
+        tmp = part.with_name(part.name + ".tmp")
+        tmp.mkdir(parents=True)
+        dtypes = {}
+        for col in SAMPLE_COLUMNS + [c for c in FACET_COLUMNS if c in samples]:
+            values = samples[col].to_numpy()
+            if values.dtype == object:
+                values = samples[col].astype(str).to_numpy(dtype=str)
+            values = np.ascontiguousarray(values)
+            values.tofile(tmp / f"{col}.bin")
+            dtypes[col] = values.dtype.str
+        os.replace(tmp, part)
+
+        info = RunInfo(run_id=run_id, run_ts=run_ts.isoformat(), source=source, rows=len(samples),
+                       ops=sorted(samples["Op"].astype(str).unique()),
+                       threads=sorted(int(t) for t in samples["Threads"].unique()),
+                       chunk_bytes=sorted(int(c) for c in samples["ChunkBytes"].unique()),
+                       dtypes=dtypes, **meta)
+        with open(self.manifest_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(asdict(info)) + "\n")
+        return info
+
+    def select_runs(self, op: Optional[str] = None, threads: Optional[Iterable[int]] = None,
+                    chunk_bytes: Optional[Iterable[int]] = None, since=None, until=None,
+                    host: Optional[str] = None, git_sha: Optional[str] = None,
+                    placement: Optional[str] = None) -> Iterator[RunInfo]:
+        """Runs whose manifest entry can contain rows matching the predicates."""
+        threads = set(threads) if threads is not None else None
+        chunk_bytes = set(chunk_bytes) if chunk_bytes is not None else None
+        since = pd.Timestamp(since) if since is not None else None
+        until = pd.Timestamp(until) if until is not None else None
+        for run in self.runs():
+            if op is not None and op not in run.ops:
+                continue
+            if threads is not None and threads.isdisjoint(run.threads):
+                continue
+            if chunk_bytes is not None and chunk_bytes.isdisjoint(run.chunk_bytes):
+                continue
+            if since is not None and run.timestamp < since:
+                continue
+            if until is not None and run.timestamp >= until:
+                continue
+            if host is not None and run.host != host:
+                continue
+            if git_sha is not None and not run.git_sha.startswith(git_sha):
+                continue
+            # Runs recorded before placements existed were never pinned
+            if placement is not None and (run.placement or UNPINNED) != placement:
+                continue
+            yield run
+
+    def _read_partition(self, run: RunInfo, op, threads, chunk_bytes) -> Dict[str, np.ndarray]:
+        """Columns of one partition, restricted to rows matching op/threads/chunk.
+
+        Runs recorded without facet columns measured the cipher defaults; they
+        are filled in, so every partition has SAMPLE_COLUMNS + FACET_COLUMNS.
+        """
+        part = os.path.join(self.root, PARTITIONS_DIR, run.run_id)
+        cols = {c: _read_column(os.path.join(part, f"{c}.bin"), run.dtypes[c], run.rows)
+                for c in SAMPLE_COLUMNS + FACET_COLUMNS if c in run.dtypes}
+        for col, default in zip(FACET_COLUMNS, DEFAULT_FACET):
+            if col not in cols:
+                cols[col] = np.full(run.rows, default, dtype=np.int64)
+        if op is None and threads is None and chunk_bytes is None:
+            return {c: np.asarray(a) for c, a in cols.items()}
+        mask = np.ones(run.rows, dtype=bool)
+        if op is not None:
+            mask &= cols["Op"] == op
+        if threads is not None:
+            mask &= np.isin(cols["Threads"], threads)
+        if chunk_bytes is not None:
+            mask &= np.isin(cols["ChunkBytes"], chunk_bytes)
+        idx = np.flatnonzero(mask)
+        return {c: np.asarray(a[idx]) for c, a in cols.items()}
+
+    def read_run(self, run: RunInfo) -> pd.DataFrame:
+        """The full sample-level table (SAMPLE_COLUMNS + FACET_COLUMNS) of one run."""
+        return pd.DataFrame(self._read_partition(run, None, None, None))[SAMPLE_COLUMNS + FACET_COLUMNS]
+
+    def load(self, op: Optional[str] = None, threads: Optional[Iterable[int]] = None,
+             chunk_bytes: Optional[Iterable[int]] = None, since=None, until=None,
+             host: Optional[str] = None, git_sha: Optional[str] = None) -> pd.DataFrame:
+        """History rows (HISTORY_COLUMNS) matching all given predicates; None means any."""
+        threads = list(threads) if threads is not None else None
+        chunk_bytes = list(chunk_bytes) if chunk_bytes is not None else None
+        runs, parts = [], []
+        for run in self.select_runs(op, threads, chunk_bytes, since, until, host, git_sha):
+            cols = self._read_partition(run, op, threads, chunk_bytes)
+            if len(cols["Op"]):
+                runs.append(run)
+                parts.append(cols)
+        if not parts:
+            return pd.DataFrame(columns=HISTORY_COLUMNS)
+
+        # Concatenate column-wise once; per-run metadata is repeated by row count
+        counts = [len(p["Op"]) for p in parts]
+        data = {c: np.concatenate([p[c] for p in parts]) for c in SAMPLE_COLUMNS + FACET_COLUMNS}
+        meta = {
+            "RunId": [r.run_id for r in runs],
+            "Host": [r.host for r in runs],
+            "Timestamp": pd.to_datetime([r.run_ts for r in runs]),
+            "GitSha": [r.git_sha for r in runs],
+            "CpuModel": [r.cpu_model for r in runs],
+            "ProcessorCount": [r.processor_count for r in runs],
+            "DotnetVersion": [r.dotnet_version for r in runs],
+            "OpensslVersion": [r.openssl_version for r in runs],
+            "Placement": [r.placement for r in runs],
+            "PhysicalCores": [r.physical_cores for r in runs],
+        }
+        for col, values in meta.items():
+            data[col] = np.repeat(np.asarray(values), counts)
+        return pd.DataFrame(data)[HISTORY_COLUMNS]
+
+
+def record_file(store: HistoryStore, source: Path, run_ts: Optional[pd.Timestamp] = None,
+                **overrides: Union[str, int]) -> RunInfo:
+    """Parse one result file and append it to the store as a run.
+
+    The run time defaults to the file modification time (naive UTC), like
+    ingest; detected metadata can be overridden (e.g. git_sha in CI).
+    """
+    source = Path(source)
+    meta = collect_run_metadata(source)
+    meta.update({k: v for k, v in overrides.items() if v is not None})
+    if run_ts is None:
+        run_ts = pd.Timestamp(source.stat().st_mtime, unit="s").floor("s")
+    return store.append(parse_sweep_samples(source), run_ts, source=str(source), **meta)
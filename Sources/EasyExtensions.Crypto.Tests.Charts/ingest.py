@@ -0,0 +1,74 @@
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+from xml.etree import ElementTree
+
+import pandas as pd
+
+from sweep_parser import LONG_COLUMNS, parse_sweep_samples, tag_run
+
+
+def expand_inputs(patterns: Iterable[str]) -> List[Path]:
+    """Resolve glob patterns (recursive ** allowed) to a sorted, de-duplicated file list."""
+    found = set()
+    for pattern in patterns:
+        matches = glob.glob(pattern, recursive=True)
+        if not matches and Path(pattern).is_file():
+            matches = [pattern]
+        found.update(Path(m).resolve() for m in matches if Path(m).is_file())
+    return sorted(found)
+
+
+def run_metadata(path: Path) -> dict:
+    """Derive run tags from the CI layout <host>/<run_id>.<ext>.
+
+    run_id is the file stem, host the parent directory name and timestamp the
+    file modification time (naive UTC).
+    """
+    return {
+        "run_id": path.stem,
+        "host": path.parent.name,
+        "timestamp": pd.Timestamp(path.stat().st_mtime, unit="s"),
+    }
+
+
+class IngestResult(NamedTuple):
+    """The merged long table and the files that contributed nothing to it, with the reason."""
+    runs: pd.DataFrame
+    skipped: List[Tuple[Path, str]]
+
+
+def parse_one(path: Path) -> Tuple[pd.DataFrame, Optional[str]]:
+    """Parse a single result file into the long format (runs in a worker process).
+
+    A file that cannot be parsed (bad sweep format, truncated or corrupt) is
+    reported with a warning and yields an empty frame plus the reason, so one
+    bad capture does not abort a bulk ingest.
+    """
+    try:
+        samples = parse_sweep_samples(path)
+    except (OSError, ValueError, ElementTree.ParseError) as e:
+        print(f"[warn] Skipping {path}: {e}")
+        return pd.DataFrame(columns=LONG_COLUMNS), str(e) or type(e).__name__
+    if samples.empty:
+        return pd.DataFrame(columns=LONG_COLUMNS), "no sweep rows"
+    return tag_run(samples, **run_metadata(path)), None
+
+
+def ingest_files(paths: List[Path], workers: Optional[int] = None) -> IngestResult:
+    """Parse many result files in a process pool and merge them into one long table."""
+    if not paths:
+        return IngestResult(pd.DataFrame(columns=LONG_COLUMNS), [])
+    workers = workers or min(len(paths), os.cpu_count() or 1)
+    if workers <= 1 or len(paths) == 1:
+        parsed = [parse_one(p) for p in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = list(pool.map(parse_one, paths, chunksize=max(1, len(paths) // (workers * 4))))
+    skipped = [(path, reason) for path, (_, reason) in zip(paths, parsed) if reason is not None]
+    parts = [part for part, reason in parsed if reason is None]
+    if not parts:
+        return IngestResult(pd.DataFrame(columns=LONG_COLUMNS), skipped)
+    return IngestResult(pd.concat(parts, ignore_index=True), skipped)
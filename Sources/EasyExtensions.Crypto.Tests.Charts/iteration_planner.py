@@ -0,0 +1,165 @@
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from cube import SweepCube
+from facets import FACET_COLUMNS, NO_MEMORY_LIMIT, facet_values, select_facet
+from jsonl_loader import load_measurements, measurements_to_samples
+from sweep_orchestrator import CELLS_VARIABLE, ITERATIONS_VARIABLE, TEST_FILTER, run_performance_tests
+from sweep_stats import DEFAULT_CONFIDENCE, cell_intervals
+
+
+# Test method of each op, to skip the other op's setup when only one op is still noisy
+OP_TESTS = {"encrypt": "Encrypt_ThreadSweep_ChunkSweep", "decrypt": "Decrypt_ThreadSweep_ChunkSweep"}
+
+DEFAULT_TARGET_WIDTH = 0.05
+DEFAULT_INITIAL_ITERATIONS = 3
+DEFAULT_ROUND_ITERATIONS = 2
+DEFAULT_MAX_ITERATIONS = 12
+DEFAULT_MAX_ROUNDS = 6
+# Below this many samples a bootstrap interval says nothing; such cells always re-run
+MIN_SAMPLES = 3
+
+# (op, threads, chunk bytes, window cap, memory limit bytes or NO_MEMORY_LIMIT)
+Cell = Tuple[str, int, int, int, int]
+# Measurement columns identifying a cell
+CELL_FIELDS = ["op", "threads", "chunkBytes", "windowCap", "memoryLimitBytes"]
+
+
+def format_cells(cells: Sequence[Cell]) -> str:
+    """PERF_CELLS value: op:threads:chunkBytes:windowCap:memoryLimitBytes entries separated by ';'."""
+    return ";".join(":".join(map(str, cell)) for cell in cells)
+
+
+def test_filter(cells: Optional[Sequence[Cell]]) -> str:
+    """dotnet test filter for the perf category, narrowed to one test when only one op is left."""
+    ops = {cell[0] for cell in cells} if cells else set(OP_TESTS)
+    if len(ops) == 1:
+        return f"{TEST_FILTER}&Name={OP_TESTS[ops.pop()]}"
+    return TEST_FILTER
+
+
+def run_round(project: Path, iterations: int, cells: Optional[Sequence[Cell]], results_path: Path,
+              dotnet: str = "dotnet", extra_args: Sequence[str] = (),
+              settings: Optional[Dict[str, str]] = None, cpus: Sequence[int] = ()) -> pd.DataFrame:
+    """Run the performance tests once and return the measurements they wrote.
+
+    cells=None runs the full sweep; otherwise only the listed cells. settings
+    are further PERF_* variables (e.g. from SweepSpec.environment); cpus pin
+    the run (see run_performance_tests).
+    """
+    env = dict(settings or {})
+    env[ITERATIONS_VARIABLE] = str(iterations)
+    if cells:
+        env[CELLS_VARIABLE] = format_cells(cells)
+    print(f"[plan] {len(cells) if cells else 'all'} cells x {iterations} iterations", flush=True)
+    return load_measurements(run_performance_tests(project, env, results_path, test_filter(cells),
+                                                   dotnet, extra_args, cpus))
+
+
+def noisy_cells(samples: pd.DataFrame, target_width: float, confidence: float = DEFAULT_CONFIDENCE,
+                max_iterations: int = DEFAULT_MAX_ITERATIONS) -> Tuple[List[Cell], pd.DataFrame]:
+    """Cells whose relative CI width still exceeds target_width, and a per-cell width table.
+
+    Width is (high - low) / mean of the bootstrap interval, per window cap /
+    memory limit facet. Cells with fewer than MIN_SAMPLES samples count as
+    noisy; cells that already have max_iterations samples are never returned.
+    """
+    tables = []
+    for facet in facet_values(samples):
+        cube = SweepCube.from_samples(select_facet(samples, facet))
+        iv = cell_intervals(cube, confidence)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            width = (iv.high - iv.low) / iv.mean
+        o, t, c = np.nonzero(cube.count > 0)
+        tables.append(pd.DataFrame({
+            "Op": np.asarray(cube.ops)[o],
+            "Threads": cube.threads[t],
+            "ChunkBytes": cube.chunk_bytes[c],
+            FACET_COLUMNS[0]: facet[0],
+            FACET_COLUMNS[1]: facet[1],
+            "Samples": cube.count[o, t, c],
+            "Width": width[o, t, c],
+        }))
+    table = pd.concat(tables, ignore_index=True)
+    table["Noisy"] = ((table["Samples"] < MIN_SAMPLES) | (table["Width"] > target_width)) \
+        & (table["Samples"] < max_iterations)
+    noisy = [(str(r.Op), int(r.Threads), int(r.ChunkBytes), int(r.WindowCap), int(r.MemoryLimitBytes))
+             for r in table[table["Noisy"]].itertuples()]
+    return noisy, table
+
+
+@dataclass
+class PlanResult:
+    samples: pd.DataFrame            # every measurement of every round (load_measurements rows)
+    widths: pd.DataFrame             # final noisy_cells() table
+    target_width: float
+    rounds: List[Dict[str, int]] = field(default_factory=list)   # cells and iterations per round
+
+    @property
+    def loose(self) -> pd.DataFrame:
+        """Cells that hit the iteration or round limit before their interval got tight."""
+        w = self.widths
+        return w[(w["Samples"] < MIN_SAMPLES) | ~(w["Width"] <= self.target_width)]
+
+
+def plan(project: Path, work_dir: Path, target_width: float = DEFAULT_TARGET_WIDTH,
+         initial_iterations: int = DEFAULT_INITIAL_ITERATIONS, round_iterations: int = DEFAULT_ROUND_ITERATIONS,
+         max_iterations: int = DEFAULT_MAX_ITERATIONS, max_rounds: int = DEFAULT_MAX_ROUNDS,
+         confidence: float = DEFAULT_CONFIDENCE, dotnet: str = "dotnet",
+         extra_args: Sequence[str] = (), settings: Optional[Dict[str, str]] = None,
+         cpus: Sequence[int] = ()) -> PlanResult:
+    """Sweep once, then re-run only the cells whose interval is still wider than target_width.
+
+    Every round appends round_iterations samples to the remaining noisy
+    cells, until all are tight, max_iterations is reached per cell, or
+    max_rounds rounds have run.
+    """
+    work_dir.mkdir(parents=True, exist_ok=True)
+    cells: Optional[List[Cell]] = None
+    iterations = initial_iterations
+    rounds: List[Dict[str, int]] = []
+    measurements: List[pd.DataFrame] = []
+    widths = pd.DataFrame()
+    for number in range(1, max_rounds + 1):
+        round_df = run_round(project, iterations, cells, work_dir / f"round-{number}.jsonl", dotnet, extra_args,
+                             settings, cpus)
+        measurements.append(round_df.assign(round=number))
+        rounds.append({"round": number, "cells": int(round_df.groupby(CELL_FIELDS).ngroups),
+                       "iterations": iterations})
+        # Keyed on the requested chunk sizes: those are what PERF_CELLS matches
+        merged = measurements_to_samples(_renumber(pd.concat(measurements, ignore_index=True)),
+                                         requested_chunks=True)
+        cells, widths = noisy_cells(merged, target_width, confidence, max_iterations)
+        tight = int(((widths["Width"] <= target_width) & (widths["Samples"] >= MIN_SAMPLES)).sum())
+        print(f"[round {number}] {tight}/{len(widths)} cells within "
+              f"{target_width:.0%} CI width", flush=True)
+        if not cells:
+            break
+        # Stay within max_iterations for the deepest of the remaining cells
+        deepest = int(widths.loc[widths["Noisy"], "Samples"].max())
+        iterations = max(1, min(round_iterations, max_iterations - deepest))
+    return PlanResult(_renumber(pd.concat(measurements, ignore_index=True)), widths, target_width, rounds)
+
+
+def _renumber(measurements: pd.DataFrame) -> pd.DataFrame:
+    """Make iteration indices unique per cell across rounds (each round starts at 0)."""
+    measurements = measurements.copy()
+    measurements["iteration"] = measurements.groupby(CELL_FIELDS).cumcount()
+    return measurements
+
+
+def write_measurements(measurements: pd.DataFrame, path: Path) -> None:
+    """Write merged rounds back as performance-results.jsonl (the format the tests emit)."""
+    fields = [c for c in measurements.columns if c not in ("Throughput", "round")]
+    with open(path, "w", encoding="utf-8") as f:
+        for row in measurements[fields].to_dict(orient="records"):
+            row = {k: (v.item() if hasattr(v, "item") else v) for k, v in row.items()}
+            row = {k: (None if isinstance(v, float) and v != v else v) for k, v in row.items()}
+            if row.get("memoryLimitBytes") == NO_MEMORY_LIMIT:
+                row["memoryLimitBytes"] = None   # the tests write null for no limit
+            f.write(json.dumps(row) + "\n")
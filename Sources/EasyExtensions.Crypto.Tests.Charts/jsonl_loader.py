@@ -0,0 +1,71 @@
+from pathlib import Path
+
+import pandas as pd
+
+from facets import DEFAULT_WINDOW_CAP, FACET_COLUMNS, NO_MEMORY_LIMIT
+from sweep_parser import DEFAULT_CHUNK_BYTES, MIB, SAMPLE_COLUMNS, pool_samples
+
+
+# Fields written by PerformanceResultsWriter (PerformanceTests.cs), camelCase
+MEASUREMENT_FIELDS = ["op", "threads", "chunkBytes", "dataBytes", "elapsedTicks",
+                      "iteration", "processorCount", "runtimeVersion", "windowCap", "memoryLimitBytes",
+                      "ciphertextChunkBytes", "placement", "physicalCores"]
+TICKS_PER_SECOND = 10_000_000  # TimeSpan ticks
+
+
+def load_measurements(filename: Path) -> pd.DataFrame:
+    """Load performance-results.jsonl as one row per timed iteration.
+
+    Plain bulk JSON decode, no text scraping. Adds Throughput in MiB/s,
+    the unit the console table prints as "MB/s". Files from before the window
+    cap / memory limit sweep measured the cipher defaults; an unlimited
+    memoryLimitBytes (null) becomes NO_MEMORY_LIMIT.
+    """
+    df = pd.read_json(filename, lines=True, dtype={"runtimeVersion": str})
+    if df.empty:
+        return pd.DataFrame(columns=MEASUREMENT_FIELDS + ["Throughput"])
+    df["windowCap"] = (df["windowCap"] if "windowCap" in df else DEFAULT_WINDOW_CAP)
+    df["memoryLimitBytes"] = (df["memoryLimitBytes"] if "memoryLimitBytes" in df else NO_MEMORY_LIMIT)
+    df = df.fillna({"windowCap": DEFAULT_WINDOW_CAP, "memoryLimitBytes": NO_MEMORY_LIMIT})
+    df = df.astype({"windowCap": "int64", "memoryLimitBytes": "int64"})
+    if "ciphertextChunkBytes" not in df:
+        df["ciphertextChunkBytes"] = None
+    seconds = df["elapsedTicks"] / TICKS_PER_SECOND
+    df["Throughput"] = df["dataBytes"] / MIB / seconds
+    return df
+
+
+def measured_chunk_bytes(df: pd.DataFrame) -> pd.Series:
+    """Chunk size each measurement really processed.
+
+    Decrypt measurements report the ciphertext's own chunk size
+    (ciphertextChunkBytes); older ones lack it because they all decrypted one
+    payload encrypted with DEFAULT_CHUNK_BYTES, whatever chunkBytes said.
+    """
+    chunk = df["chunkBytes"].astype("int64")
+    decrypt = df["op"] == "decrypt"
+    real = pd.to_numeric(df["ciphertextChunkBytes"], errors="coerce").fillna(DEFAULT_CHUNK_BYTES).astype("int64")
+    return chunk.where(~decrypt, real)
+
+
+def measurements_to_samples(df: pd.DataFrame, requested_chunks: bool = False) -> pd.DataFrame:
+    """Project measurements onto the sample-level table used by the charts (plus FACET_COLUMNS).
+
+    ChunkBytes is measured_chunk_bytes(), not the requested chunkBytes, unless
+    requested_chunks is set: cells that are re-run by name (PERF_CELLS) must
+    keep the chunk size the tests were asked for. Without it, older decrypt
+    measurements all land on one cell and are pooled into a single sample
+    per cell (see sweep_parser.pool_samples).
+    """
+    if df.empty:
+        return pd.DataFrame(columns=SAMPLE_COLUMNS + FACET_COLUMNS)
+    pooled = pd.Series(False, index=df.index)
+    if not requested_chunks:
+        pooled = (df["op"] == "decrypt") & pd.to_numeric(df["ciphertextChunkBytes"], errors="coerce").isna()
+        df = df.assign(chunkBytes=measured_chunk_bytes(df))
+    samples = df.rename(columns={"op": "Op", "threads": "Threads", "chunkBytes": "ChunkBytes",
+                                 "iteration": "Iteration", "windowCap": "WindowCap",
+                                 "memoryLimitBytes": "MemoryLimitBytes"})
+    samples = samples[SAMPLE_COLUMNS + FACET_COLUMNS].reset_index(drop=True)
+    return pool_samples(samples, pooled.reset_index(drop=True))
+
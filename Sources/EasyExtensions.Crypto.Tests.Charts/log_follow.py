@@ -0,0 +1,53 @@
+from pathlib import Path
+from typing import List, Set
+
+from sweep_parser import SweepLogParser, SweepRow
+
+
+class LogFollower:
+    """Incrementally read sweep rows from a log that is still being written.
+
+    Each poll() reads only the bytes appended since the previous call and
+    feeds the complete lines to a (non-strict) SweepLogParser; a trailing
+    partial line is kept until its newline arrives. If the file shrinks
+    (a new run overwrote it), everything is parsed again from the start.
+    """
+
+    def __init__(self, filename: Path) -> None:
+        self.filename = Path(filename)
+        self.rows: List[SweepRow] = []
+        self._reset()
+
+    def _reset(self) -> None:
+        self.rows.clear()
+        self._offset = 0
+        self._partial = b""
+        self._parser = SweepLogParser(strict=False)
+
+    def poll(self) -> Set[str]:
+        """Read what was appended; return the ops ('encrypt'/'decrypt') that got new rows."""
+        try:
+            size = self.filename.stat().st_size
+        except FileNotFoundError:
+            return set()
+        touched: Set[str] = set()
+        if size < self._offset:
+            if self.rows:
+                touched.update(row.op for row in self.rows)
+            self._reset()
+        if size == self._offset:
+            return touched
+
+        with open(self.filename, "rb") as f:
+            f.seek(self._offset)
+            data = f.read(size - self._offset)
+        self._offset += len(data)
+
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        for raw in lines:
+            row = self._parser.feed(raw.decode("utf-8", errors="ignore").rstrip("\r"))
+            if row is not None:
+                self.rows.append(row)
+                touched.add(row.op)
+        return touched
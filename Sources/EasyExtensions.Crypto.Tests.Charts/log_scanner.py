@@ -0,0 +1,109 @@
+import mmap
+from pathlib import Path
+from typing import Dict, Generator, Iterator, Optional
+
+from sweep_parser import SweepLogParser, SweepRow
+
+
+# Byte markers of the only lines SweepLogParser reacts to. Table rows and the
+# Threads:/Chunk sizes:/Rows:/Ciphertext: headers matter only inside a sweep section, so outside
+# one the scanner does not even look for them.
+_ALWAYS = (b"===", b"Source:", b"Duration:")
+_IN_SECTION = (b"|", b"Threads:", b"Chunk sizes:", b"Rows:", b"Ciphertext:")
+# Searches run window by window; consumed windows are dropped from the mapping
+WINDOW = 8 * 1024 * 1024
+
+
+def _decode(raw: bytes) -> str:
+    return raw.decode("utf-8", errors="ignore").rstrip("\r")
+
+
+def _previous_text_line(mm: mmap.mmap, line_start: int, floor: int) -> Optional[bytes]:
+    """Last non-blank line between floor and line_start, if any."""
+    end = line_start - 1
+    while end > floor:
+        start = mm.rfind(b"\n", floor, end) + 1 or floor
+        raw = mm[start:end]
+        if raw.strip():
+            return raw
+        end = start - 1
+    return None
+
+
+def _release(mm: mmap.mmap, upto: int) -> None:
+    """Drop already scanned pages from this process (they stay in the page cache)."""
+    upto -= upto % mmap.PAGESIZE
+    if upto and hasattr(mm, "madvise") and hasattr(mmap, "MADV_DONTNEED"):
+        mm.madvise(mmap.MADV_DONTNEED, 0, upto)
+
+
+def _scan_window(mm: mmap.mmap, parser: SweepLogParser, pos: int, limit: int,
+                 floor: int) -> Generator[SweepRow, None, int]:
+    """Feed the marker lines in [pos, limit); limit is a line boundary.
+
+    floor is where the text after the last fed line starts, possibly in an
+    earlier window; the returned value is the floor for the next window.
+    """
+    next_hit: Dict[bytes, int] = {}
+    while pos < limit:
+        # Earliest marker at or after pos; cached hits stay valid until passed
+        best = -1
+        for marker in _ALWAYS + (_IN_SECTION if parser.op is not None else ()):
+            hit = next_hit.get(marker, -2)
+            if hit != -1 and hit < pos:
+                hit = next_hit[marker] = mm.find(marker, pos, limit)
+            if hit != -1 and (best == -1 or hit < best):
+                best = hit
+        if best == -1:
+            return floor
+
+        start = mm.rfind(b"\n", pos, best) + 1 or pos
+        end = mm.find(b"\n", best, limit)
+        if end == -1:
+            end = limit
+        raw = mm[start:end]
+        if b"Source:" in raw:
+            # The test name is the text line right before "Source:"; it has no
+            # marker of its own, so hand it to the parser now. It may sit in the
+            # previous window, so search back to the last fed line, not to pos.
+            name = _previous_text_line(mm, start, floor)
+            if name is not None:
+                parser.feed(_decode(name))
+        row = parser.feed(_decode(raw))
+        if row is not None:
+            yield row
+        pos = floor = end + 1
+    return floor
+
+
+def _scan(mm: mmap.mmap, parser: SweepLogParser) -> Iterator[SweepRow]:
+    size = len(mm)
+    pos = floor = 0
+    while pos < size:
+        limit = min(size, pos + WINDOW)
+        if limit < size:
+            # End the window after a newline so no line (or marker) straddles it
+            cut = mm.rfind(b"\n", pos, limit)
+            if cut != -1:
+                limit = cut + 1
+        floor = yield from _scan_window(mm, parser, pos, limit, floor)
+        pos = limit
+        _release(mm, pos)
+
+
+def iter_log_rows(filename: Path, strict: bool = True) -> Iterator[SweepRow]:
+    """Stream sweep rows out of a console log without decoding all of it.
+
+    The file is memory-mapped and searched for the byte markers the parser
+    cares about (section banners, Source:/Duration: lines and, inside a
+    section, table rows and headers). Only those lines are decoded and fed to
+    SweepLogParser, so multi-GB CI captures are scanned at memchr speed.
+    Searching runs in WINDOW-sized steps and scanned pages are released, so
+    resident memory stays flat regardless of log size.
+    """
+    parser = SweepLogParser(strict=strict)
+    with open(filename, "rb") as f:
+        if Path(filename).stat().st_size:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield from _scan(mm, parser)
+    parser.close()
@@ -4,7 +4,29 @@ import numpy as np
 import seaborn as sns
 from matplotlib.patches import Rectangle
 import matplotlib.gridspec as gridspec
+from metrics import no_chunk_axis_note
+from sweep_parser import frame_has_chunk_axis
 from test_parser import parse_test_results
+from units import SAMPLE_THROUGHPUT_UNIT, format_mib
+
+
+# Throughput as the parser reports it; charts.py renders the same unit by default
+UNIT = SAMPLE_THROUGHPUT_UNIT.name
+
+
+def _draw_no_chunk_axis(ax, op, data):
+    """Stand-in for a vs-chunk-size plot of an op measured at a single chunk size"""
+    ax.text(0.5, 0.5, no_chunk_axis_note(op, data['ChunkBytes'].unique()).replace(': ', ':\n'),
+            ha='center', va='center', transform=ax.transAxes, fontsize=10, color='gray')
+    ax.set_xticks([])
+    ax.set_yticks([])
+
+
+def _scaling_efficiency(data, chunk_size):
+    """Efficiency (%) per thread count at one chunk size, relative to 1 thread (NaN without it)"""
+    at_chunk = data[data['ChunkMB'] == chunk_size].groupby('Threads')['Throughput'].mean()
+    baseline = at_chunk.get(1, np.nan)
+    return at_chunk / baseline / at_chunk.index * 100
 
 
 def create_mega_analysis(encrypt_data, decrypt_data):
@@ -43,30 +65,38 @@ def create_mega_analysis(encrypt_data, decrypt_data):
 
     # 1. Encrypt: throughput vs chunk size (compact)
     colors = plt.cm.Set1(np.linspace(0, 1, len(unique_threads)))
-    for i, threads in enumerate(unique_threads):
-        thread_data = encrypt_data[encrypt_data['Threads']
-                                   == threads].sort_values('ChunkMB')
-        ax1.plot(thread_data['ChunkMB'], thread_data['Throughput'],
-                 marker='o', label=f'{threads}T', linewidth=1.5, markersize=4, color=colors[i])
     ax1.set_title('Encrypt: Throughput vs Chunks',
                   fontsize=12, fontweight='bold')
-    ax1.set_xlabel('Chunk Size (MB)')
-    ax1.set_ylabel('MB/s')
-    ax1.legend(ncol=2, fontsize=8)
-    ax1.grid(True, alpha=0.3)
+    if frame_has_chunk_axis(encrypt_data):
+        for i, threads in enumerate(unique_threads):
+            thread_data = encrypt_data[encrypt_data['Threads']
+                                       == threads].sort_values('ChunkMB')
+            ax1.plot(thread_data['ChunkMB'], thread_data['Throughput'],
+                     marker='o', label=f'{threads}T', linewidth=1.5, markersize=4, color=colors[i])
+        ax1.set_xlabel('Chunk Size (MiB)')
+        ax1.set_ylabel(UNIT)
+        ax1.legend(ncol=2, fontsize=8)
+        ax1.grid(True, alpha=0.3)
+    else:
+        _draw_no_chunk_axis(ax1, 'encrypt', encrypt_data)
 
     # 2. Decrypt: throughput vs chunk size (compact)
-    for i, threads in enumerate(unique_threads):
-        thread_data = decrypt_data[decrypt_data['Threads']
-                                   == threads].sort_values('ChunkMB')
-        ax2.plot(thread_data['ChunkMB'], thread_data['Throughput'],
-                 marker='s', label=f'{threads}T', linewidth=1.5, markersize=4, color=colors[i])
+    # Older logs decrypted a single payload, so all their decrypt rows share one chunk size
+    decrypt_has_chunks = frame_has_chunk_axis(decrypt_data)
     ax2.set_title('Decrypt: Throughput vs Chunks',
                   fontsize=12, fontweight='bold')
-    ax2.set_xlabel('Chunk Size (MB)')
-    ax2.set_ylabel('MB/s')
-    ax2.legend(ncol=2, fontsize=8)
-    ax2.grid(True, alpha=0.3)
+    if decrypt_has_chunks:
+        for i, threads in enumerate(unique_threads):
+            thread_data = decrypt_data[decrypt_data['Threads']
+                                       == threads].sort_values('ChunkMB')
+            ax2.plot(thread_data['ChunkMB'], thread_data['Throughput'],
+                     marker='s', label=f'{threads}T', linewidth=1.5, markersize=4, color=colors[i])
+        ax2.set_xlabel('Chunk Size (MiB)')
+        ax2.set_ylabel(UNIT)
+        ax2.legend(ncol=2, fontsize=8)
+        ax2.grid(True, alpha=0.3)
+    else:
+        _draw_no_chunk_axis(ax2, 'decrypt', decrypt_data)
 
     # 3. Encrypt: throughput vs threads (compact)
     chunk_colors = plt.cm.tab10(np.linspace(0, 1, len(unique_chunks)))
@@ -74,57 +104,66 @@ def create_mega_analysis(encrypt_data, decrypt_data):
         chunk_data = encrypt_data[encrypt_data['ChunkMB']
                                   == chunk_size].sort_values('Threads')
         ax3.plot(chunk_data['Threads'], chunk_data['Throughput'],
-                 marker='o', label=f'{int(chunk_size)}MB', linewidth=1.5, markersize=4, color=chunk_colors[i])
+                 marker='o', label=format_mib(chunk_size), linewidth=1.5, markersize=4, color=chunk_colors[i])
     ax3.set_title('Encrypt: Throughput vs Threads',
                   fontsize=12, fontweight='bold')
     ax3.set_xlabel('Threads')
-    ax3.set_ylabel('MB/s')
+    ax3.set_ylabel(UNIT)
     ax3.legend(ncol=2, fontsize=8)
     ax3.grid(True, alpha=0.3)
 
-    # 4. Decrypt: throughput vs threads (compact)
-    for i, chunk_size in enumerate(unique_chunks):
+    # 4. Decrypt: throughput vs threads (compact), per chunk size decrypt was measured at
+    for i, chunk_size in enumerate(sorted(decrypt_data['ChunkMB'].unique())):
         chunk_data = decrypt_data[decrypt_data['ChunkMB']
                                   == chunk_size].sort_values('Threads')
         ax4.plot(chunk_data['Threads'], chunk_data['Throughput'],
-                 marker='s', label=f'{int(chunk_size)}MB', linewidth=1.5, markersize=4, color=chunk_colors[i])
+                 marker='s', label=format_mib(chunk_size), linewidth=1.5, markersize=4,
+                 color=chunk_colors[i % len(chunk_colors)])
     ax4.set_title('Decrypt: Throughput vs Threads',
                   fontsize=12, fontweight='bold')
     ax4.set_xlabel('Threads')
-    ax4.set_ylabel('MB/s')
+    ax4.set_ylabel(UNIT)
     ax4.legend(ncol=2, fontsize=8)
     ax4.grid(True, alpha=0.3)
 
     # 5. Heat Map - Performance Matrix
-    encrypt_pivot = encrypt_data.pivot(
-        index='Threads', columns='ChunkMB', values='Throughput')
-    decrypt_pivot = decrypt_data.pivot(
-        index='Threads', columns='ChunkMB', values='Throughput')
+    # Only ops with a chunk-size dimension: one measured at a single chunk would blank the other columns
+    pivots = [data.pivot(index='Threads', columns='ChunkMB', values='Throughput')
+                  .reindex(index=unique_threads, columns=unique_chunks)
+              for data in (encrypt_data, decrypt_data) if frame_has_chunk_axis(data)]
+    if not pivots:
+        pivots = [encrypt_data.pivot(index='Threads', columns='ChunkMB', values='Throughput')
+                      .reindex(index=unique_threads, columns=unique_chunks)]
 
     # Создаем комбинированную heat map
-    combined_data = (encrypt_pivot + decrypt_pivot) / \
-        2  # Средняя производительность
+    combined_data = sum(pivots) / len(pivots)  # Средняя производительность
     im = ax5.imshow(combined_data.values, cmap='viridis', aspect='auto')
-    ax5.set_title('🔥 Performance Heat Map\n(Average Encrypt+Decrypt)',
+    ax5.set_title('🔥 Performance Heat Map\n(Average Encrypt+Decrypt)' if len(pivots) == 2
+                  else '🔥 Performance Heat Map\n(Encrypt)',
                   fontsize=12, fontweight='bold')
-    ax5.set_xlabel('Chunk Size (MB)')
+    ax5.set_xlabel('Chunk Size (MiB)')
     ax5.set_ylabel('Threads')
     ax5.set_xticks(range(len(unique_chunks)))
-    ax5.set_xticklabels([str(int(x)) for x in unique_chunks])
+    ax5.set_xticklabels([f'{x:g}' for x in unique_chunks])
     ax5.set_yticks(range(len(unique_threads)))
     ax5.set_yticklabels([str(int(x)) for x in unique_threads])
 
     # Добавляем значения в ячейки
     for i in range(len(unique_threads)):
         for j in range(len(unique_chunks)):
+            if np.isnan(combined_data.iloc[i, j]):
+                continue
             text = ax5.text(j, i, f'{combined_data.iloc[i, j]:.0f}',
                             ha="center", va="center", color="white", fontsize=8, fontweight='bold')
 
     # 6. Efficiency by chunk size
+    # Decrypt bars only where decrypt was measured at encrypt's chunk sizes
     encrypt_by_chunk = encrypt_data.groupby('ChunkMB')['Throughput'].agg([
-        'mean', 'std', 'max', 'min'])
+        'mean', 'std', 'max', 'min']).reindex(unique_chunks)
     decrypt_by_chunk = decrypt_data.groupby('ChunkMB')['Throughput'].agg([
-        'mean', 'std', 'max', 'min'])
+        'mean', 'std', 'max', 'min']).reindex(unique_chunks)
+    if not decrypt_has_chunks:
+        decrypt_by_chunk[:] = np.nan
 
     x = np.arange(len(unique_chunks))
     width = 0.35
@@ -138,10 +177,10 @@ def create_mega_analysis(encrypt_data, decrypt_data):
 
     ax6.set_title('📊 Average Performance by Chunk Size',
                   fontsize=12, fontweight='bold')
-    ax6.set_xlabel('Chunk Size (MB)')
-    ax6.set_ylabel('Average Throughput (MB/s)')
+    ax6.set_xlabel('Chunk Size (MiB)')
+    ax6.set_ylabel(f'Average Throughput ({UNIT})')
     ax6.set_xticks(x)
-    ax6.set_xticklabels([str(int(x)) for x in unique_chunks])
+    ax6.set_xticklabels([f'{x:g}' for x in unique_chunks])
     ax6.legend()
     ax6.grid(True, alpha=0.3)
 
@@ -150,9 +189,13 @@ def create_mega_analysis(encrypt_data, decrypt_data):
         ax6.text(bar1.get_x() + bar1.get_width()/2, bar1.get_height() + 100,
                  f'{encrypt_by_chunk.iloc[i]["mean"]:.0f}',
                  ha='center', va='bottom', fontsize=8, rotation=45)
-        ax6.text(bar2.get_x() + bar2.get_width()/2, bar2.get_height() + 100,
-                 f'{decrypt_by_chunk.iloc[i]["mean"]:.0f}',
-                 ha='center', va='bottom', fontsize=8, rotation=45)
+        if not np.isnan(decrypt_by_chunk.iloc[i]["mean"]):
+            ax6.text(bar2.get_x() + bar2.get_width()/2, bar2.get_height() + 100,
+                     f'{decrypt_by_chunk.iloc[i]["mean"]:.0f}',
+                     ha='center', va='bottom', fontsize=8, rotation=45)
+    if not decrypt_has_chunks:
+        ax6.text(0.5, 0.98, no_chunk_axis_note('decrypt', decrypt_data['ChunkBytes'].unique()),
+                 ha='center', va='top', transform=ax6.transAxes, fontsize=8, color='gray')
 
     # 7. Distribution Analysis - Violin plots
     # Подготавливаем данные для violin plot
@@ -177,55 +220,31 @@ def create_mega_analysis(encrypt_data, decrypt_data):
         pc.set_alpha(0.7)
 
     ax7.set_title('🎻 Performance Distribution', fontsize=12, fontweight='bold')
-    ax7.set_ylabel('Throughput (MB/s)')
+    ax7.set_ylabel(f'Throughput ({UNIT})')
     ax7.set_xticks([1, 2])
     ax7.set_xticklabels(['Encrypt', 'Decrypt'])
     ax7.grid(True, alpha=0.3)
 
     # 8. Scaling Efficiency Analysis
-    # Вычисляем эффективность масштабирования
-    baseline_threads = 1
-    scaling_data = []
-
-    for chunk_size in unique_chunks:
-        encrypt_baseline = encrypt_data[(encrypt_data['Threads'] == baseline_threads) &
-                                        (encrypt_data['ChunkMB'] == chunk_size)]['Throughput'].iloc[0]
-        decrypt_baseline = decrypt_data[(decrypt_data['Threads'] == baseline_threads) &
-                                        (decrypt_data['ChunkMB'] == chunk_size)]['Throughput'].iloc[0]
-
-        for threads in unique_threads:
-            encrypt_current = encrypt_data[(encrypt_data['Threads'] == threads) &
-                                           (encrypt_data['ChunkMB'] == chunk_size)]['Throughput'].iloc[0]
-            decrypt_current = decrypt_data[(decrypt_data['Threads'] == threads) &
-                                           (decrypt_data['ChunkMB'] == chunk_size)]['Throughput'].iloc[0]
-
-            encrypt_efficiency = (
-                encrypt_current / encrypt_baseline) / threads * 100
-            decrypt_efficiency = (
-                decrypt_current / decrypt_baseline) / threads * 100
-
-            scaling_data.append({
-                'Threads': threads,
-                'ChunkMB': chunk_size,
-                'Encrypt_Efficiency': encrypt_efficiency,
-                'Decrypt_Efficiency': decrypt_efficiency
-            })
-
-    scaling_df = pd.DataFrame(scaling_data)
-
-    # Показываем эффективность для среднего размера чанка
+    # Эффективность масштабирования на среднем размере чанка; decrypt — на том же
+    # чанке, если он измерялся, иначе на своём среднем
     mid_chunk = unique_chunks[len(unique_chunks)//2]
-    mid_data = scaling_df[scaling_df['ChunkMB'] == mid_chunk]
+    decrypt_chunks = sorted(decrypt_data['ChunkMB'].unique())
+    decrypt_mid_chunk = mid_chunk if mid_chunk in decrypt_chunks else decrypt_chunks[len(decrypt_chunks)//2]
+    encrypt_efficiency = _scaling_efficiency(encrypt_data, mid_chunk)
+    decrypt_efficiency = _scaling_efficiency(decrypt_data, decrypt_mid_chunk)
 
-    ax8.plot(mid_data['Threads'], mid_data['Encrypt_Efficiency'],
+    ax8.plot(encrypt_efficiency.index, encrypt_efficiency.values,
              marker='o', linewidth=3, markersize=8, label='Encrypt Efficiency', color='blue')
-    ax8.plot(mid_data['Threads'], mid_data['Decrypt_Efficiency'],
-             marker='s', linewidth=3, markersize=8, label='Decrypt Efficiency', color='red')
+    decrypt_label = 'Decrypt Efficiency' if decrypt_mid_chunk == mid_chunk \
+        else f'Decrypt Efficiency ({format_mib(decrypt_mid_chunk)})'
+    ax8.plot(decrypt_efficiency.index, decrypt_efficiency.values,
+             marker='s', linewidth=3, markersize=8, label=decrypt_label, color='red')
     ax8.axhline(y=100, color='gray', linestyle='--',
                 alpha=0.7, label='Perfect Efficiency')
 
     ax8.set_title(
-        f'⚡ Scaling Efficiency ({mid_chunk}MB chunks)', fontsize=12, fontweight='bold')
+        f'⚡ Scaling Efficiency ({format_mib(mid_chunk)} chunks)', fontsize=12, fontweight='bold')
     ax8.set_xlabel('Number of Threads')
     ax8.set_ylabel('Efficiency (%)')
     ax8.legend()
@@ -245,7 +264,7 @@ def create_mega_analysis(encrypt_data, decrypt_data):
                 'Decrypt_Encrypt_Ratio': ratio
             })
 
-    ratio_df = pd.DataFrame(ratio_data)
+    ratio_df = pd.DataFrame(ratio_data, columns=['Threads', 'ChunkMB', 'Decrypt_Encrypt_Ratio'])
 
     # Создаем scatter plot с размерами точек
     scatter = ax9.scatter(ratio_df['Threads'], ratio_df['ChunkMB'],
@@ -256,7 +275,7 @@ def create_mega_analysis(encrypt_data, decrypt_data):
     ax9.set_title('🚀 Decrypt/Encrypt Speed Ratios',
                   fontsize=12, fontweight='bold')
     ax9.set_xlabel('Threads')
-    ax9.set_ylabel('Chunk Size (MB)')
+    ax9.set_ylabel('Chunk Size (MiB)')
 
     # Добавляем colorbar
     cbar = plt.colorbar(scatter, ax=ax9, shrink=0.8)
@@ -289,7 +308,7 @@ def create_mega_analysis(encrypt_data, decrypt_data):
 
     ax10.set_title('🎯 Performance Zones', fontsize=12, fontweight='bold')
     ax10.set_xlabel('Threads')
-    ax10.set_ylabel('Chunk Size (MB)')
+    ax10.set_ylabel('Chunk Size (MiB)')
     ax10.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
     ax10.grid(True, alpha=0.3)
 
@@ -305,20 +324,20 @@ def create_mega_analysis(encrypt_data, decrypt_data):
         ["🏆 BEST CONFIGURATIONS", "", ""],
         ["Operation", "Threads", "Chunk Size"],
         ["Encryption", f"{encrypt_best['Threads']:.0f}",
-            f"{encrypt_best['ChunkMB']:.0f}MB"],
+            format_mib(encrypt_best['ChunkMB'])],
         ["Decryption", f"{decrypt_best['Threads']:.0f}",
-            f"{decrypt_best['ChunkMB']:.0f}MB"],
+            format_mib(decrypt_best['ChunkMB']) if decrypt_has_chunks else "n/a"],
         ["", "", ""],
         ["📈 PERFORMANCE INSIGHTS", "", ""],
         ["Avg Decrypt Speed",
-            f"{decrypt_data['Throughput'].mean():.0f}", "MB/s"],
+            f"{decrypt_data['Throughput'].mean():.0f}", UNIT],
         ["Avg Encrypt Speed",
-            f"{encrypt_data['Throughput'].mean():.0f}", "MB/s"],
+            f"{encrypt_data['Throughput'].mean():.0f}", UNIT],
         ["Decrypt Advantage",
             f"{((decrypt_data['Throughput'].mean() / encrypt_data['Throughput'].mean() - 1) * 100):.1f}%", ""],
         ["", "", ""],
         ["💡 RECOMMENDATIONS", "", ""],
-        ["For Encryption", "Use 16-32MB", "chunks"],
+        ["For Encryption", "Use 16-32MiB", "chunks"],
         ["For Decryption", "Use 2-8", "threads"],
         ["General Rule", "Bigger chunks", "for encrypt"],
         ["Thread Scaling", "2-16 threads", "optimal"]
@@ -376,22 +395,25 @@ def print_mega_summary(encrypt_data, decrypt_data, encrypt_best, decrypt_best):
     print(f"   Test combinations per operation: {len(encrypt_data)}")
 
     print(f"\n🏆 ABSOLUTE CHAMPIONS:")
-    print(f"   🔐 Encryption King: {encrypt_best['Throughput']:.1f} MB/s")
-    print(
-        f"       Configuration: {encrypt_best['Threads']:.0f} threads × {encrypt_best['ChunkMB']:.0f}MB chunks")
-    print(f"   🔓 Decryption Master: {decrypt_best['Throughput']:.1f} MB/s")
+    print(f"   🔐 Encryption King: {encrypt_best['Throughput']:.1f} {UNIT}")
     print(
-        f"       Configuration: {decrypt_best['Threads']:.0f} threads × {decrypt_best['ChunkMB']:.0f}MB chunks")
+        f"       Configuration: {encrypt_best['Threads']:.0f} threads × {format_mib(encrypt_best['ChunkMB'])} chunks")
+    print(f"   🔓 Decryption Master: {decrypt_best['Throughput']:.1f} {UNIT}")
+    if frame_has_chunk_axis(decrypt_data):
+        print(
+            f"       Configuration: {decrypt_best['Threads']:.0f} threads × {format_mib(decrypt_best['ChunkMB'])} chunks")
+    else:
+        print(f"       Configuration: {decrypt_best['Threads']:.0f} threads")
 
     # Detailed statistics
     print(f"\n📈 DETAILED STATISTICS:")
     for op_name, data in [("Encryption", encrypt_data), ("Decryption", decrypt_data)]:
         stats = data['Throughput'].describe()
         print(f"   {op_name}:")
-        print(f"      Mean: {stats['mean']:.1f} MB/s")
-        print(f"      Median: {stats['50%']:.1f} MB/s")
-        print(f"      Std Dev: {stats['std']:.1f} MB/s")
-        print(f"      Range: {stats['min']:.1f} - {stats['max']:.1f} MB/s")
+        print(f"      Mean: {stats['mean']:.1f} {UNIT}")
+        print(f"      Median: {stats['50%']:.1f} {UNIT}")
+        print(f"      Std Dev: {stats['std']:.1f} {UNIT}")
+        print(f"      Range: {stats['min']:.1f} - {stats['max']:.1f} {UNIT}")
         print(
             f"      Coefficient of Variation: {(stats['std']/stats['mean']*100):.1f}%")
 
@@ -408,16 +430,19 @@ def print_mega_summary(encrypt_data, decrypt_data, encrypt_best, decrypt_best):
             'Threads')['Throughput'].mean().sort_values(ascending=False)
         best_threads = thread_performance.index[0]
         print(
-            f"   {op_name}: {best_threads} threads ({thread_performance.iloc[0]:.1f} MB/s avg)")
+            f"   {op_name}: {best_threads} threads ({thread_performance.iloc[0]:.1f} {UNIT} avg)")
 
     # Best chunk sizes
     print(f"\n🧩 OPTIMAL CHUNK SIZES:")
-    for op_name, data in [("Encryption", encrypt_data), ("Decryption", decrypt_data)]:
+    for op_name, op, data in [("Encryption", 'encrypt', encrypt_data), ("Decryption", 'decrypt', decrypt_data)]:
+        if not frame_has_chunk_axis(data):
+            print(f"   {no_chunk_axis_note(op, data['ChunkBytes'].unique())}")
+            continue
         chunk_performance = data.groupby(
             'ChunkMB')['Throughput'].mean().sort_values(ascending=False)
         best_chunk = chunk_performance.index[0]
         print(
-            f"   {op_name}: {best_chunk}MB chunks ({chunk_performance.iloc[0]:.1f} MB/s avg)")
+            f"   {op_name}: {format_mib(best_chunk)} chunks ({chunk_performance.iloc[0]:.1f} {UNIT} avg)")
 
     print(f"\n💡 KEY INSIGHTS:")
     print(f"   • Decryption consistently outperforms encryption")
@@ -428,15 +453,22 @@ def print_mega_summary(encrypt_data, decrypt_data, encrypt_best, decrypt_best):
     print("\n" + "="*70)
 
 
-def main():
-    """Main function"""
+def main(results=None):
+    """Main function
+
+    results: optional pre-parsed SweepResults (shared by all_charts.py)
+    Returns True once the charts are saved, False on failure.
+    """
     try:
-        # Парсим данные из файла
-        encrypt_data, decrypt_data = parse_test_results('input.txt')
+        # Парсим данные из файла, если их не передали
+        if results is None:
+            encrypt_data, decrypt_data = parse_test_results('input.txt')
+        else:
+            encrypt_data, decrypt_data = results.encrypt, results.decrypt
 
         if encrypt_data.empty or decrypt_data.empty:
             print("Error: failed to find data in input.txt")
-            return
+            return False
 
         print(f"🎯 Data loaded for MEGA analysis:")
         print(f"   Encryption: {len(encrypt_data)} records")
@@ -446,10 +478,10 @@ def main():
         fig, encrypt_optimal, decrypt_optimal = create_mega_analysis(
             encrypt_data, decrypt_data)
 
-    # Сохраняем графики
-    fig.savefig('mega_performance_analysis.png',
-            dpi=300, bbox_inches='tight')
-    print(f"\n💾 MEGA analysis saved to mega_performance_analysis.png")
+        # Сохраняем графики
+        fig.savefig('mega_performance_analysis.png',
+                    dpi=300, bbox_inches='tight')
+        print(f"\n💾 MEGA analysis saved to mega_performance_analysis.png")
 
         # Выводим детальную сводку
         print_mega_summary(encrypt_data, decrypt_data,
@@ -467,13 +499,16 @@ def main():
         print(f"   10. Performance zones")
         print(f"   11. Recommendations table")
         print(f"   12. Summary dashboard")
+        return True
 
     except FileNotFoundError:
         print("❌ Error: file 'input.txt' not found")
+        return False
     except Exception as e:
         print(f"❌ Error: {e}")
         import traceback
         traceback.print_exc()
+        return False
 
 
 if __name__ == "__main__":
@@ -0,0 +1,205 @@
+import warnings
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from cube import OPS, CellStats, SweepCube
+from sweep_stats import CellIntervals, cell_intervals
+from units import format_size
+
+
+# Performance zones: share of an op's best mean throughput a cell reaches
+HIGH_ZONE = 0.9
+MEDIUM_ZONE = 0.7
+ZONE_LOW, ZONE_MEDIUM, ZONE_HIGH = 0, 1, 2
+
+
+@dataclass(frozen=True)
+class OpMetrics:
+    """Derived quantities of one op; grids are [threads, chunk] like SweepCube.mean."""
+    best: Dict[str, float]           # SweepCube.best()
+    average: float                   # mean over measured cells
+    max_per_thread: np.ndarray       # [threads] best mean over chunk sizes
+    avg_per_chunk: np.ndarray        # [chunk] mean over thread counts
+    std_per_chunk: np.ndarray        # [chunk] sample std over thread counts
+    best_thread_per_chunk: np.ndarray  # [chunk] thread index of the fastest cell
+    best_per_chunk: CellStats        # [chunk] stats of that cell
+    speedup: np.ndarray              # [threads, chunk] relative to 1 thread (NaN without it)
+    efficiency: np.ndarray           # [threads, chunk] speedup / threads, in %
+    zones: np.ndarray                # [threads, chunk] ZONE_LOW/MEDIUM/HIGH (LOW also for unmeasured)
+
+
+@dataclass(frozen=True)
+class SweepMetrics:
+    """Everything the charts and the text summary derive from a SweepCube."""
+    cube: SweepCube
+    ops: Dict[str, OpMetrics]
+    ratio: np.ndarray                # [threads, chunk] decrypt / encrypt mean
+    mid_chunk: int                   # chunk index used for the scaling panels
+    intervals: CellIntervals         # robust stats and bootstrap intervals per cell
+
+    def __getitem__(self, op: str) -> OpMetrics:
+        return self.ops[op]
+
+    def contenders(self, op: str) -> List[Dict[str, float]]:
+        """Cells of op statistically tied with its best (best first), with their interval.
+
+        A single entry backed by two or more samples is a clear winner.
+        """
+        iv = self.intervals
+        o = self.cube.op_index(op)
+        rows = []
+        for i in iv.contenders(op):
+            t, c = np.unravel_index(i, iv.mean.shape[1:])
+            rows.append({"Throughput": float(iv.mean[o, t, c]), "Low": float(iv.low[o, t, c]),
+                         "High": float(iv.high[o, t, c]), "Samples": int(iv.count[o, t, c]),
+                         "Threads": int(self.cube.threads[t]), "ChunkBytes": int(self.cube.chunk_bytes[c])})
+        return rows
+
+    def scaling_chunk(self, op: str) -> int:
+        """Chunk index of op's scaling figures: mid_chunk, or the closest chunk op was measured at."""
+        measured = self.cube.chunk_indices(op)
+        if not len(measured) or self.mid_chunk in measured:
+            return self.mid_chunk
+        return int(measured[np.argmin(np.abs(measured - self.mid_chunk))])
+
+    def has_winner(self, op: str) -> bool:
+        return self.intervals.winner(op) is not None
+
+    def best_per_chunk_table(self) -> pd.DataFrame:
+        """One row per (op, chunk): the fastest thread count and its mean (in the cube's unit).
+
+        Both come from the outlier-filtered means of sweep_stats, the statistic
+        the summary's best line and its interval use.
+        """
+        rows: List[pd.DataFrame] = []
+        chunks = np.arange(len(self.cube.chunk_bytes))
+        for op in self.ops:
+            mean = self.intervals.mean[self.cube.op_index(op)]
+            best_thread = np.where(np.isnan(mean), -np.inf, mean).argmax(axis=0)
+            rows.append(pd.DataFrame({
+                "Op": op,
+                "ChunkBytes": self.cube.chunk_bytes,
+                "Threads": self.cube.threads[best_thread],
+                "Throughput": mean[best_thread, chunks],
+            }))
+        return pd.concat(rows, ignore_index=True).dropna(subset=["Throughput"])
+
+
+def _op_metrics(cube: SweepCube, op: str) -> OpMetrics:
+    mean = cube.stats(op).mean
+    measured = ~np.isnan(mean)
+    filled = np.where(measured, mean, -np.inf)
+
+    best_thread = filled.argmax(axis=0)
+    base = cube.thread_index(1)
+    if base >= 0:
+        speedup = mean / mean[base]
+    else:
+        speedup = np.full(mean.shape, np.nan)
+
+    top = filled.max()
+    zones = np.where(filled > top * HIGH_ZONE, ZONE_HIGH,
+                     np.where(filled > top * MEDIUM_ZONE, ZONE_MEDIUM, ZONE_LOW))
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN rows/columns and 1-thread std
+        return OpMetrics(
+            best=cube.best(op),
+            average=float(np.nanmean(mean)),
+            max_per_thread=np.nanmax(mean, axis=1),
+            avg_per_chunk=np.nanmean(mean, axis=0),
+            std_per_chunk=np.nanstd(mean, axis=0, ddof=1),
+            best_thread_per_chunk=best_thread,
+            best_per_chunk=cube.stats(op, t=best_thread, c=np.arange(len(cube.chunk_bytes))),
+            speedup=speedup,
+            efficiency=speedup / cube.threads[:, None] * 100,
+            zones=zones,
+        )
+
+
+def compute_metrics(cube: SweepCube) -> SweepMetrics:
+    """Derive ratios, scaling efficiency, zones and best-per-chunk from the cube.
+
+    Every quantity is a whole-array operation over the [threads, chunk] mean
+    grid of each op, so the cost does not depend on the number of rows.
+    Requires both ops to be present (see SweepCube.has_op).
+    """
+    ops = {op: _op_metrics(cube, op) for op in OPS}
+    enc = cube.stats("encrypt").mean
+    dec = cube.stats("decrypt").mean
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(enc > 0, dec / enc, np.nan)
+    return SweepMetrics(cube=cube, ops=ops, ratio=ratio, mid_chunk=len(cube.chunk_bytes) // 2,
+                        intervals=cell_intervals(cube))
+
+
+def no_chunk_axis_note(op: str, chunk_bytes: Iterable[int]) -> str:
+    """Why op has no vs-chunk-size figures: it was measured at a single chunk size (see SweepCube.has_chunk_axis)."""
+    chunks = ", ".join(format_size(int(c)) for c in chunk_bytes) or "no"
+    return f"{op.capitalize()} has no chunk-size dimension: every measurement used {chunks} chunks"
+
+
+def format_summary(metrics: SweepMetrics, ossl: Optional[pd.DataFrame] = None) -> str:
+    """Plain-text summary (used by charts.py, and alone by --summary-only), in the cube's unit."""
+    cube = metrics.cube
+    unit = cube.unit.name
+    lines = ["Summary:"]
+    for op in OPS:
+        # Mean without outliers, the statistic the bootstrap interval below is built on
+        contenders = metrics.contenders(op)
+        top = contenders[0]
+        lines.append(f"  CottonCrypto {op.capitalize()} best: {top['Throughput']:.1f} {unit} at "
+                     f"{top['Threads']} threads, {format_size(top['ChunkBytes'])} chunks")
+        confidence = f"{metrics.intervals.confidence:.0%}"
+        if metrics.has_winner(op):
+            lines.append(f"    clear winner without outliers: {top['Threads']} threads, {format_size(top['ChunkBytes'])} "
+                         f"chunks ({confidence} CI {top['Low']:.1f} .. {top['High']:.1f} {unit})")
+        elif len(contenders) > 1:
+            lines.append(f"    no clear winner: {len(contenders) - 1} other cells within its {confidence} CI")
+        else:
+            lines.append("    no clear winner: the best cell rests on a single sample")
+    rejected = int(metrics.intervals.rejected.sum())
+    if rejected:
+        lines.append(f"  Outliers rejected (MAD): {rejected} samples")
+    for op in OPS:
+        lines.append(f"  CottonCrypto {op.capitalize()} average: {metrics[op].average:.1f} {unit}")
+    for op in OPS:
+        if not cube.has_chunk_axis(op):
+            lines.append(f"  {no_chunk_axis_note(op, cube.chunk_bytes[cube.chunk_indices(op)])}")
+
+    mid = metrics.mid_chunk
+    if cube.cpu is not None:
+        smt = cube.cpu.smt_threads
+        lines.append(f"  CPU placement {cube.cpu.describe()}"
+                     + (f"; SMT siblings share cores above {smt} threads" if smt is not None else ""))
+    lines.append(f"  Scaling efficiency at {format_size(cube.chunk_bytes[mid])} chunks:")
+    for op in OPS:
+        c = metrics.scaling_chunk(op)
+        eff = ", ".join(f"{t}T {e:.0f}%" for t, e in zip(cube.threads, metrics[op].efficiency[:, c])
+                        if not np.isnan(e))
+        at = "" if c == mid else f" (at {format_size(cube.chunk_bytes[c])})"
+        lines.append(f"    {op}{at}: {eff or 'n/a (no 1-thread cell)'}")
+
+    ratio = metrics.ratio[~np.isnan(metrics.ratio)]
+    if ratio.size:
+        lines.append(f"  Decrypt/Encrypt ratio: {ratio.min():.2f} .. {ratio.max():.2f} "
+                     f"(median {np.median(ratio):.2f})")
+    for op in OPS:
+        zones = metrics[op].zones
+        lines.append(f"  Zones {op}: {np.count_nonzero(zones == ZONE_HIGH)} cells >{HIGH_ZONE:.0%} of best, "
+                     f"{np.count_nonzero(zones == ZONE_MEDIUM)} cells >{MEDIUM_ZONE:.0%}")
+
+    table = metrics.best_per_chunk_table()
+    table["Chunk"] = [format_size(c) for c in table.pop("ChunkBytes")]
+    table[unit] = table.pop("Throughput").round(1)
+    lines.append("  Best thread count per chunk size (mean without outliers):")
+    lines.extend("    " + line for line in table.to_string(index=False).splitlines())
+
+    if ossl is not None and not ossl.empty:
+        best = ossl.loc[ossl["ThroughputBps"].idxmax()]
+        lines.append(f"  OpenSSL best: {cube.unit.from_bps(best['ThroughputBps']):.1f} {unit} "
+                     f"at {int(best['BlockBytes'])} bytes buffer")
+    return "\n".join(lines)
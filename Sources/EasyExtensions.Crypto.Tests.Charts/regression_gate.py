@@ -0,0 +1,135 @@
+import json
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from change_points import current_level_start, noise_sigma
+from facets import DEFAULT_WINDOW_CAP, FACET_COLUMNS, NO_MEMORY_LIMIT, with_facets
+from history_store import HistoryStore, RunInfo
+from units import SAMPLE_THROUGHPUT_UNIT
+
+
+# Cells of different window caps / memory limits are gated separately
+CELL = ["Op", "Threads", "ChunkBytes"] + FACET_COLUMNS
+DEFAULT_WINDOW = 10
+DEFAULT_SIGMAS = 3.0
+DEFAULT_MIN_THRESHOLD = 0.01
+# 1.4826 * MAD estimates the standard deviation of normal data, robustly
+_MAD_SCALE = 1.4826
+# Below this many baseline runs the run-to-run spread is not estimated at all
+_MIN_RUNS_FOR_SPREAD = 3
+
+EXIT_PASS = 0
+EXIT_REGRESSION = 1
+EXIT_NO_DATA = 2
+
+
+@dataclass
+class CellVerdict:
+    op: str
+    threads: int
+    chunk_bytes: int
+    baseline: float        # median of per-run means, MiB/s
+    candidate: float       # candidate mean, MiB/s
+    delta: float           # relative change
+    threshold: float       # allowed relative drop for this cell
+    window_cap: int = DEFAULT_WINDOW_CAP
+    memory_limit_bytes: int = NO_MEMORY_LIMIT
+
+
+@dataclass
+class GateVerdict:
+    """Outcome of a gate run, serialised as the compact JSON CI reads."""
+    status: str                          # "pass", "fail" or "no-baseline"
+    unit: str = SAMPLE_THROUGHPUT_UNIT.name
+    baseline_runs: List[str] = field(default_factory=list)
+    checked: int = 0
+    skipped: int = 0                     # candidate cells the baseline has never measured
+    regressions: List[CellVerdict] = field(default_factory=list)
+
+    @property
+    def exit_code(self) -> int:
+        return {"pass": EXIT_PASS, "fail": EXIT_REGRESSION}.get(self.status, EXIT_NO_DATA)
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["regressions"] = [{k: (round(v, 4) if isinstance(v, float) else v) for k, v in r.items()}
+                               for r in data["regressions"]]
+        return json.dumps(data, separators=(",", ":"))
+
+
+def baseline_runs(store: HistoryStore, window: int = DEFAULT_WINDOW, host: Optional[str] = None,
+                  git_sha: Optional[str] = None, exclude_sha: Optional[str] = None,
+                  placement: Optional[str] = None) -> List[RunInfo]:
+    """The latest `window` recorded runs matching host/commit/CPU placement, oldest first."""
+    runs = [r for r in store.select_runs(host=host, git_sha=git_sha, placement=placement)
+            if not (exclude_sha and r.git_sha.startswith(exclude_sha))]
+    runs.sort(key=lambda r: r.timestamp)
+    return runs[-window:] if window > 0 else runs
+
+
+def cell_baseline(store: HistoryStore, runs: List[RunInfo]) -> pd.DataFrame:
+    """Per cell: median of per-run means (Baseline), their noise (Sigma) and run count.
+
+    Only runs after the cell's last change point (see change_points) count, so
+    a speed-up or slowdown that landed inside the window neither drags the
+    median nor inflates the spread. Sigma is the larger of the run-to-run
+    standard deviation and the standard error of a single run's mean from its
+    own iterations. The run-to-run part is the MAD of those runs, or, when
+    fewer than _MIN_RUNS_FOR_SPREAD remain, the MAD of first differences over
+    the whole window, which ignores level shifts. A MAD over a handful of runs
+    can come out near zero; the within-run error keeps the threshold from
+    collapsing.
+    """
+    order = {r.run_id: i for i, r in enumerate(runs)}
+    samples = pd.concat([store.read_run(r).assign(RunId=r.run_id) for r in runs], ignore_index=True)
+    per_run = samples.groupby(CELL + ["RunId"])["Throughput"].agg(["mean", "std", "count"]).reset_index()
+    per_run["sem"] = per_run["std"] / np.sqrt(per_run["count"])
+    per_run = per_run.sort_values("RunId", key=lambda ids: ids.map(order), kind="stable").reset_index(drop=True)
+    window = per_run.groupby(CELL)["mean"]
+    start = window.transform(lambda m: current_level_start(m.to_numpy()))
+    current = per_run[window.cumcount() >= start]
+    grouped = current.groupby(CELL)
+    cells = grouped["mean"].agg(Baseline="median", Runs="count")
+    deviation = (current["mean"] - grouped["mean"].transform("median")).abs()
+    between = deviation.groupby([current[c] for c in CELL]).median() * _MAD_SCALE
+    stepwise = window.agg(lambda m: noise_sigma(m.to_numpy()) if len(m) >= _MIN_RUNS_FOR_SPREAD else 0.0)
+    between = between.where(cells["Runs"] >= _MIN_RUNS_FOR_SPREAD, stepwise.reindex(between.index))
+    within = grouped["sem"].mean().fillna(0.0)
+    cells["Sigma"] = np.maximum(between, within)
+    return cells.reset_index()
+
+
+def evaluate_gate(baseline: pd.DataFrame, candidate: pd.DataFrame, run_ids: List[str],
+                  sigmas: float = DEFAULT_SIGMAS, min_threshold: float = DEFAULT_MIN_THRESHOLD) -> GateVerdict:
+    """Compare a candidate sample table against cell_baseline() output.
+
+    A cell fails when its mean drops by more than max(sigmas * Sigma / Baseline,
+    min_threshold), i.e. the allowance follows each cell's own historical noise.
+    """
+    if baseline.empty:
+        return GateVerdict(status="no-baseline")
+    cand = with_facets(candidate).groupby(CELL)["Throughput"].mean().rename("Candidate").reset_index()
+    merged = cand.merge(baseline, on=CELL, how="left")
+    known = merged["Baseline"].notna()
+    m = merged[known].assign(Delta=lambda d: (d["Candidate"] - d["Baseline"]) / d["Baseline"],
+                             Threshold=lambda d: np.maximum(sigmas * d["Sigma"] / d["Baseline"], min_threshold))
+    failed = m[m["Delta"] < -m["Threshold"]].sort_values("Delta")
+    regressions = [CellVerdict(r.Op, int(r.Threads), int(r.ChunkBytes), float(r.Baseline), float(r.Candidate),
+                               float(r.Delta), float(r.Threshold), int(r.WindowCap), int(r.MemoryLimitBytes))
+                   for r in failed.itertuples()]
+    return GateVerdict(status="fail" if regressions else "pass", baseline_runs=run_ids,
+                       checked=int(known.sum()), skipped=int((~known).sum()), regressions=regressions)
+
+
+def run_gate(store: HistoryStore, candidate: pd.DataFrame, window: int = DEFAULT_WINDOW,
+             sigmas: float = DEFAULT_SIGMAS, min_threshold: float = DEFAULT_MIN_THRESHOLD,
+             **run_filters: Optional[str]) -> GateVerdict:
+    """Select the baseline runs from the store and evaluate candidate against them."""
+    runs = baseline_runs(store, window, **run_filters)
+    if not runs:
+        return GateVerdict(status="no-baseline")
+    return evaluate_gate(cell_baseline(store, runs), candidate, [r.run_id for r in runs], sigmas, min_threshold)
+
@@ -0,0 +1,92 @@
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+
+CACHE_DIR_NAME = ".chart-cache"
+# Set CHARTS_NO_CACHE=1 to always parse from scratch
+ENABLED = os.environ.get("CHARTS_NO_CACHE", "") not in ("1", "true", "yes")
+
+_HASH_BLOCK = 1024 * 1024
+_ORDER_KEY = "__columns__"
+
+
+def content_key(source: Path, kind: str, version: int) -> str:
+    """sha256 over the file bytes plus the parser identity and version."""
+    h = hashlib.sha256()
+    with open(source, "rb") as f:
+        while True:
+            block = f.read(_HASH_BLOCK)
+            if not block:
+                break
+            h.update(block)
+    h.update(f"\0{kind}\0{version}".encode())
+    return h.hexdigest()
+
+
+def write_frames(path: Path, frames: Dict[str, pd.DataFrame]) -> None:
+    """Store DataFrames column by column in an uncompressed .npz (no pickling)."""
+    arrays: Dict[str, np.ndarray] = {}
+    order = []
+    for name, df in frames.items():
+        for col in df.columns:
+            key = f"{name}/{col}"
+            values = df[col].to_numpy()
+            if values.dtype == object:
+                values = df[col].astype(str).to_numpy(dtype=str)
+            arrays[key] = values
+            order.append(key)
+    arrays[_ORDER_KEY] = np.array(order, dtype=str)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, path)
+
+
+def read_frames(path: Path) -> Dict[str, pd.DataFrame]:
+    """Inverse of write_frames."""
+    columns: Dict[str, Dict[str, np.ndarray]] = {}
+    with np.load(path, allow_pickle=False) as data:
+        for key in data[_ORDER_KEY]:
+            name, col = str(key).split("/", 1)
+            columns.setdefault(name, {})[col] = data[key]
+    return {name: pd.DataFrame(cols) for name, cols in columns.items()}
+
+
+def cached_frames(source: Path, kind: str, version: int,
+                  parse: Callable[[], Dict[str, pd.DataFrame]]) -> Dict[str, pd.DataFrame]:
+    """Return parse() output, reusing an on-disk copy keyed by content hash.
+
+    The cache lives in .chart-cache/ next to the input. A changed input or a
+    bumped parser version yields a new key, so stale entries are never read;
+    they are removed when the replacement is written.
+    """
+    if not ENABLED:
+        return parse()
+
+    source = Path(source)
+    cache_dir = source.parent / CACHE_DIR_NAME
+    key = content_key(source, kind, version)
+    prefix = f"{source.name}.{kind}."
+    entry = cache_dir / f"{prefix}{key[:32]}.npz"
+
+    if entry.exists():
+        try:
+            return read_frames(entry)
+        except Exception as exc:  # corrupt/partial entry: fall back to parsing
+            logging.debug("Ignoring unreadable cache %s: %s", entry, exc)
+
+    frames = parse()
+    try:
+        cache_dir.mkdir(exist_ok=True)
+        for stale in cache_dir.glob(f"{prefix}*.npz"):
+            stale.unlink()
+        write_frames(entry, frames)
+    except OSError as exc:  # read-only checkout etc. — caching is best effort
+        logging.debug("Failed to write cache %s: %s", entry, exc)
+    return frames
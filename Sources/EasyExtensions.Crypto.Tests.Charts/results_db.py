@@ -0,0 +1,151 @@
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from facets import default_facet
+from history_store import HistoryStore
+from sweep_parser import SAMPLE_COLUMNS
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id          TEXT PRIMARY KEY,
+    run_ts          TEXT NOT NULL,      -- ISO 8601, naive UTC
+    host            TEXT NOT NULL,
+    git_sha         TEXT NOT NULL,
+    cpu_model       TEXT,
+    processor_count INTEGER,
+    dotnet_version  TEXT,
+    openssl_version TEXT,
+    source          TEXT
+);
+-- One row per timed iteration; run_ts/host/git_sha are copied from runs so
+-- the composite indexes below cover the common queries without a join.
+CREATE TABLE IF NOT EXISTS samples (
+    run_id      TEXT NOT NULL REFERENCES runs(run_id),
+    op          TEXT NOT NULL,
+    threads     INTEGER NOT NULL,
+    chunk_bytes INTEGER NOT NULL,
+    iteration   INTEGER NOT NULL,
+    throughput  REAL NOT NULL,          -- MiB/s
+    run_ts      TEXT NOT NULL,
+    host        TEXT NOT NULL,
+    git_sha     TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_samples_cell ON samples (op, threads, chunk_bytes, run_ts);
+CREATE INDEX IF NOT EXISTS ix_samples_host_sha ON samples (host, git_sha);
+"""
+
+# Ready-made questions for `charts.py query <name>`; {where} is filled from the
+# given filters only, so SQLite can use the composite indexes
+QUERIES: Dict[str, str] = {
+    # Best (threads, chunk) per host and op, by mean throughput over the window
+    "best": """
+        WITH cells AS (
+            SELECT host, op, threads, chunk_bytes,
+                   AVG(throughput) AS mean_mibps, COUNT(*) AS samples, COUNT(DISTINCT run_id) AS runs
+            FROM samples {where}
+            GROUP BY host, op, threads, chunk_bytes
+        ), ranked AS (
+            SELECT *, ROW_NUMBER() OVER (PARTITION BY host, op ORDER BY mean_mibps DESC) AS rank
+            FROM cells
+        )
+        SELECT host, op, threads, chunk_bytes, ROUND(mean_mibps, 1) AS mean_mibps, samples, runs
+        FROM ranked WHERE rank = 1 ORDER BY host, op
+    """,
+    # One cell (or slice) across commits, oldest first
+    "trend": """
+        SELECT git_sha, host, MIN(run_ts) AS first_run, COUNT(DISTINCT run_id) AS runs,
+               ROUND(AVG(throughput), 1) AS mean_mibps,
+               ROUND(MIN(throughput), 1) AS min_mibps, ROUND(MAX(throughput), 1) AS max_mibps
+        FROM samples {where}
+        GROUP BY git_sha, host
+        ORDER BY first_run
+    """,
+    "runs": """
+        SELECT run_id, run_ts, host, SUBSTR(git_sha, 1, 10) AS git_sha, cpu_model, processor_count,
+               dotnet_version, openssl_version
+        FROM runs {where}
+        ORDER BY run_ts
+    """,
+}
+# Filter columns in composite-index order; "runs" only has the run-level ones
+_FILTERS = ["op", "threads", "chunk_bytes", "host", "git_sha"]
+_RUN_FILTERS = {"host", "git_sha"}
+
+
+def _where(filters: Dict[str, object], since: Optional[pd.Timestamp], run_level: bool) -> Tuple[str, dict]:
+    clauses, params = [], {}
+    for col in _FILTERS:
+        value = filters.get(col)
+        if value is None or (run_level and col not in _RUN_FILTERS):
+            continue
+        if col == "git_sha":
+            # Prefix match as a range, which (unlike LIKE) can use the index
+            clauses.append("git_sha >= :git_sha AND git_sha < :git_sha_end")
+            params["git_sha_end"] = f"{value}~"
+        else:
+            clauses.append(f"{col} = :{col}")
+        params[col] = value
+    if since is not None:
+        clauses.append("run_ts >= :since")
+        params["since"] = since.isoformat()
+    return ("WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+class ResultsDb:
+    """SQLite index over the history store for ad-hoc questions.
+
+    The store (history_store) stays the source of truth; sync() copies runs
+    the database has not seen yet, so the file can be deleted and rebuilt.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ResultsDb":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def sync(self, store: HistoryStore) -> int:
+        """Insert store runs missing from the database; returns how many were added."""
+        known = {row[0] for row in self.conn.execute("SELECT run_id FROM runs")}
+        added = 0
+        with self.conn:
+            for run in store.runs():
+                if run.run_id in known:
+                    continue
+                self.conn.execute(
+                    "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (run.run_id, run.run_ts, run.host, run.git_sha, run.cpu_model, run.processor_count,
+                     run.dotnet_version, run.openssl_version, run.source))
+                # The schema has no window cap / memory limit columns: index the default-facet cells
+                samples = default_facet(store.read_run(run))[SAMPLE_COLUMNS]
+                self.conn.executemany(
+                    "INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(run.run_id, op, int(t), int(c), int(i), float(v), run.run_ts, run.host, run.git_sha)
+                     for op, t, c, i, v in samples.itertuples(index=False, name=None)])
+                added += 1
+        return added
+
+    def query(self, sql: str, params: Optional[dict] = None) -> pd.DataFrame:
+        return pd.read_sql_query(sql, self.conn, params=params or {})
+
+    def named_query(self, name: str, since: Optional[pd.Timestamp] = None, **filters) -> pd.DataFrame:
+        """Run one of QUERIES filtered by op/threads/chunk_bytes/host/git_sha (None = any)."""
+        where, params = _where(filters, since, run_level=(name == "runs"))
+        return self.query(QUERIES[name].format(where=where), params)
+
+    def plan(self, sql: str, params: Optional[dict] = None) -> List[str]:
+        """EXPLAIN QUERY PLAN details, to check a query uses the indexes."""
+        return [row[-1] for row in self.conn.execute("EXPLAIN QUERY PLAN " + sql, params or {})]
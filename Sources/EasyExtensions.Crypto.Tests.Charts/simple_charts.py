@@ -1,7 +1,22 @@
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
+from metrics import no_chunk_axis_note
+from sweep_parser import frame_has_chunk_axis
 from test_parser import parse_test_results
+from units import SAMPLE_THROUGHPUT_UNIT, format_mib
+
+
+# Throughput as the parser reports it; charts.py renders the same unit by default
+UNIT = SAMPLE_THROUGHPUT_UNIT.name
+
+
+def _draw_no_chunk_axis(ax, op, data):
+    """Stand-in for a vs-chunk-size plot of an op measured at a single chunk size"""
+    ax.text(0.5, 0.5, no_chunk_axis_note(op, data['ChunkBytes'].unique()).replace(': ', ':\n'),
+            ha='center', va='center', transform=ax.transAxes, fontsize=11, color='gray')
+    ax.set_xticks([])
+    ax.set_yticks([])
 
 
 def create_plots(encrypt_data, decrypt_data):
@@ -23,43 +38,32 @@ def create_plots(encrypt_data, decrypt_data):
     chunk_colors = ['#e41a1c', '#377eb8', '#4daf4a',
                     '#984ea3', '#ff7f00', '#ffff33', '#a65628']
 
-    # Plot 1: Encrypt - throughput vs chunk size (per thread count)
+    # Plots 1-2: Encrypt / Decrypt - throughput vs chunk size (per thread count)
     unique_threads = sorted(encrypt_data['Threads'].unique())
-    for i, threads in enumerate(unique_threads):
-        thread_data = encrypt_data[encrypt_data['Threads']
-                                   == threads].sort_values('ChunkMB')
-        ax1.plot(thread_data['ChunkMB'], thread_data['Throughput'],
-                 marker='o', label=f'{threads} threads', linewidth=2.5,
-                 markersize=8, color=thread_colors[i % len(thread_colors)])
-
-    ax1.set_xlabel('Chunk Size (MB)', fontsize=12, fontweight='bold')
-    ax1.set_ylabel('Throughput (MB/s)', fontsize=12, fontweight='bold')
-    ax1.set_title('Encryption: Throughput vs Chunk Size',
-                  fontsize=14, fontweight='bold')
-    ax1.legend(frameon=True, fancybox=True, shadow=True)
-    ax1.grid(True, alpha=0.3, linestyle='-', linewidth=0.5)
-
-    # Add x-axis labels for chunk sizes
-    chunk_ticks = sorted(encrypt_data['ChunkMB'].unique())
-    ax1.set_xticks(chunk_ticks)
-    ax1.set_xticklabels([f'{int(x)}' for x in chunk_ticks])
-
-    # Plot 2: Decrypt - throughput vs chunk size (per thread count)
-    for i, threads in enumerate(unique_threads):
-        thread_data = decrypt_data[decrypt_data['Threads']
-                                   == threads].sort_values('ChunkMB')
-        ax2.plot(thread_data['ChunkMB'], thread_data['Throughput'],
-                 marker='s', label=f'{threads} threads', linewidth=2.5,
-                 markersize=8, color=thread_colors[i % len(thread_colors)])
-
-    ax2.set_xlabel('Chunk Size (MB)', fontsize=12, fontweight='bold')
-    ax2.set_ylabel('Throughput (MB/s)', fontsize=12, fontweight='bold')
-    ax2.set_title('Decryption: Throughput vs Chunk Size',
-                  fontsize=14, fontweight='bold')
-    ax2.legend(frameon=True, fancybox=True, shadow=True)
-    ax2.grid(True, alpha=0.3, linestyle='-', linewidth=0.5)
-    ax2.set_xticks(chunk_ticks)
-    ax2.set_xticklabels([f'{int(x)}' for x in chunk_ticks])
+    for ax, op, data, marker, title in ((ax1, 'encrypt', encrypt_data, 'o', 'Encryption'),
+                                        (ax2, 'decrypt', decrypt_data, 's', 'Decryption')):
+        ax.set_title(f'{title}: Throughput vs Chunk Size',
+                     fontsize=14, fontweight='bold')
+        # Older logs decrypted a single payload, so all their decrypt rows share one chunk size
+        if not frame_has_chunk_axis(data):
+            _draw_no_chunk_axis(ax, op, data)
+            continue
+        for i, threads in enumerate(unique_threads):
+            thread_data = data[data['Threads']
+                               == threads].sort_values('ChunkMB')
+            ax.plot(thread_data['ChunkMB'], thread_data['Throughput'],
+                    marker=marker, label=f'{threads} threads', linewidth=2.5,
+                    markersize=8, color=thread_colors[i % len(thread_colors)])
+
+        ax.set_xlabel('Chunk Size (MiB)', fontsize=12, fontweight='bold')
+        ax.set_ylabel(f'Throughput ({UNIT})', fontsize=12, fontweight='bold')
+        ax.legend(frameon=True, fancybox=True, shadow=True)
+        ax.grid(True, alpha=0.3, linestyle='-', linewidth=0.5)
+
+        # Add x-axis labels for chunk sizes
+        chunk_ticks = sorted(data['ChunkMB'].unique())
+        ax.set_xticks(chunk_ticks)
+        ax.set_xticklabels([f'{x:g}' for x in chunk_ticks])
 
     # Plot 3: Encrypt - throughput vs threads (per chunk size)
     unique_chunks = sorted(encrypt_data['ChunkMB'].unique())
@@ -68,11 +72,11 @@ def create_plots(encrypt_data, decrypt_data):
         chunk_data = encrypt_data[encrypt_data['ChunkMB']
                                   == chunk_size].sort_values('Threads')
         ax3.plot(chunk_data['Threads'], chunk_data['Throughput'],
-                 marker='o', label=f'{int(chunk_size)}MB', linewidth=2.5,
+                 marker='o', label=format_mib(chunk_size), linewidth=2.5,
                  markersize=8, color=chunk_colors[i % len(chunk_colors)])
 
     ax3.set_xlabel('Number of Threads', fontsize=12, fontweight='bold')
-    ax3.set_ylabel('Throughput (MB/s)', fontsize=12, fontweight='bold')
+    ax3.set_ylabel(f'Throughput ({UNIT})', fontsize=12, fontweight='bold')
     ax3.set_title('Encryption: Throughput vs Threads',
                   fontsize=14, fontweight='bold')
     ax3.legend(frameon=True, fancybox=True, shadow=True, title='Chunk Size')
@@ -80,16 +84,16 @@ def create_plots(encrypt_data, decrypt_data):
     ax3.set_xticks(unique_threads)
     ax3.set_xticklabels([str(int(x)) for x in unique_threads])
 
-    # Plot 4: Decrypt - throughput vs threads (per chunk size)
-    for i, chunk_size in enumerate(unique_chunks):
+    # Plot 4: Decrypt - throughput vs threads (per chunk size it was measured at)
+    for i, chunk_size in enumerate(sorted(decrypt_data['ChunkMB'].unique())):
         chunk_data = decrypt_data[decrypt_data['ChunkMB']
                                   == chunk_size].sort_values('Threads')
         ax4.plot(chunk_data['Threads'], chunk_data['Throughput'],
-                 marker='s', label=f'{int(chunk_size)}MB', linewidth=2.5,
+                 marker='s', label=format_mib(chunk_size), linewidth=2.5,
                  markersize=8, color=chunk_colors[i % len(chunk_colors)])
 
     ax4.set_xlabel('Number of Threads', fontsize=12, fontweight='bold')
-    ax4.set_ylabel('Throughput (MB/s)', fontsize=12, fontweight='bold')
+    ax4.set_ylabel(f'Throughput ({UNIT})', fontsize=12, fontweight='bold')
     ax4.set_title('Decryption: Throughput vs Threads',
                   fontsize=14, fontweight='bold')
     ax4.legend(frameon=True, fancybox=True, shadow=True, title='Chunk Size')
@@ -120,31 +124,41 @@ def print_summary(encrypt_data, decrypt_data):
     decrypt_best = decrypt_data.loc[decrypt_data['Throughput'].idxmax()]
 
     print(f"\n🏆 TOP RESULTS:")
-    print(f"   Encryption: {encrypt_best['Throughput']:.1f} MB/s")
-    print(
-        f"   ({encrypt_best['Threads']:.0f} threads, {encrypt_best['ChunkMB']:.0f}MB chunks)")
-    print(f"   Decryption: {decrypt_best['Throughput']:.1f} MB/s")
-    print(
-        f"   ({decrypt_best['Threads']:.0f} threads, {decrypt_best['ChunkMB']:.0f}MB chunks)")
+    for name, op, data, best in (("Encryption", 'encrypt', encrypt_data, encrypt_best),
+                                 ("Decryption", 'decrypt', decrypt_data, decrypt_best)):
+        print(f"   {name}: {best['Throughput']:.1f} {UNIT}")
+        if frame_has_chunk_axis(data):
+            print(
+                f"   ({best['Threads']:.0f} threads, {format_mib(best['ChunkMB'])} chunks)")
+        else:
+            print(f"   ({best['Threads']:.0f} threads; {no_chunk_axis_note(op, data['ChunkBytes'].unique())})")
 
     print(f"\n📊 AVERAGE VALUES:")
-    print(f"   Encryption: {encrypt_data['Throughput'].mean():.1f} MB/s")
-    print(f"   Decryption: {decrypt_data['Throughput'].mean():.1f} MB/s")
+    print(f"   Encryption: {encrypt_data['Throughput'].mean():.1f} {UNIT}")
+    print(f"   Decryption: {decrypt_data['Throughput'].mean():.1f} {UNIT}")
     print(
         f"   Decryption is {((decrypt_data['Throughput'].mean() / encrypt_data['Throughput'].mean() - 1) * 100):.1f}% faster")
 
     print("\n" + "="*50)
 
 
-def main():
-    """Main function"""
+def main(results=None):
+    """Main function
+
+    results: optional pre-parsed SweepResults (shared by all_charts.py);
+    input.txt is parsed only when it is not given.
+    Returns True once the charts are saved, False on failure.
+    """
     try:
-        # Parse data from file
-        encrypt_data, decrypt_data = parse_test_results('input.txt')
+        # Parse data from file unless the caller already did
+        if results is None:
+            encrypt_data, decrypt_data = parse_test_results('input.txt')
+        else:
+            encrypt_data, decrypt_data = results.encrypt, results.decrypt
 
         if encrypt_data.empty or decrypt_data.empty:
             print("Error: failed to find data in input.txt")
-            return
+            return False
 
         print(f"✅ Data successfully loaded:")
         print(f"   Encryption: {len(encrypt_data)} records")
@@ -169,11 +183,14 @@ def main():
         print(f"   2. Decryption: Throughput vs Chunk Size")
         print(f"   3. Encryption: Throughput vs Threads")
         print(f"   4. Decryption: Throughput vs Threads")
+        return True
 
     except FileNotFoundError:
         print("❌ Error: file 'input.txt' not found")
+        return False
     except Exception as e:
         print(f"❌ Error: {e}")
+        return False
 
 
 if __name__ == "__main__":
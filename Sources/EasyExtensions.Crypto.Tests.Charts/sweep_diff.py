@@ -0,0 +1,156 @@
+import math
+import warnings
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from cube import SweepCube
+
+
+DIFF_COLUMNS = ["Op", "Threads", "ChunkBytes", "Baseline", "Candidate", "Delta",
+                "BaselineSamples", "CandidateSamples", "T", "DF", "PValue", "Significant"]
+DEFAULT_ALPHA = 0.05
+
+_lgamma = np.vectorize(math.lgamma, otypes=[float])
+_TINY = 1e-300
+
+
+def _beta_cf(a: np.ndarray, b: np.ndarray, x: np.ndarray, iterations: int = 200) -> np.ndarray:
+    """Continued fraction of the incomplete beta function (modified Lentz), elementwise."""
+    def guard(v):
+        return np.where(np.abs(v) < _TINY, _TINY, v)
+
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c = np.ones_like(x)
+    d = 1.0 / guard(1.0 - qab * x / qap)
+    h = d.copy()
+    for m in range(1, iterations + 1):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 / guard(1.0 + aa * d)
+        c = guard(1.0 + aa / c)
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 / guard(1.0 + aa * d)
+        c = guard(1.0 + aa / c)
+        h *= d * c
+    return h
+
+
+def beta_inc(a, b, x) -> np.ndarray:
+    """Regularized incomplete beta I_x(a, b) for arrays (a, b > 0; 0 <= x <= 1)."""
+    a, b, x = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a, b, x)))
+    out = np.where(x <= 0.0, 0.0, 1.0)
+    inner = (x > 0.0) & (x < 1.0)
+    if not inner.any():
+        return out
+    a, b, x = a[inner], b[inner], x[inner]
+    log_front = _lgamma(a + b) - _lgamma(a) - _lgamma(b) + a * np.log(x) + b * np.log1p(-x)
+    front = np.exp(log_front)
+    # The fraction converges fast on the side of the mean; use the symmetry otherwise
+    direct = x < (a + 1.0) / (a + b + 2.0)
+    value = np.where(direct,
+                     front * _beta_cf(a, b, x) / a,
+                     1.0 - front * _beta_cf(b, a, 1.0 - x) / b)
+    out[inner] = value
+    return out
+
+
+def student_t_two_sided(t, df) -> np.ndarray:
+    """Two-sided p-value P(|T| >= |t|) of Student's t with df degrees of freedom."""
+    t = np.asarray(t, dtype=float)
+    df = np.asarray(df, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = df / (df + t * t)
+    p = beta_inc(df / 2.0, 0.5, np.where(np.isnan(x), 0.5, x))
+    return np.where(np.isnan(x), np.nan, p)
+
+
+def welch_t_test(mean1, var1, n1, mean2, var2, n2) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Elementwise Welch's unequal-variance t-test: (t, degrees of freedom, two-sided p).
+
+    Cells with fewer than two samples on either side get NaN. Two noise-free
+    cells are significant exactly when their means differ.
+    """
+    n1 = np.asarray(n1, dtype=float)
+    n2 = np.asarray(n2, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s1 = var1 / n1
+        s2 = var2 / n2
+        se = np.sqrt(s1 + s2)
+        t = (mean2 - mean1) / se
+        df = (s1 + s2) ** 2 / (s1 ** 2 / (n1 - 1) + s2 ** 2 / (n2 - 1))
+    p = student_t_two_sided(t, df)
+    exact = se == 0
+    p = np.where(exact, np.where(mean1 == mean2, 1.0, 0.0), p)
+    df = np.where(exact, n1 + n2 - 2, df)
+    testable = (n1 >= 2) & (n2 >= 2)
+    return (np.where(testable, t, np.nan), np.where(testable, df, np.nan), np.where(testable, p, np.nan))
+
+
+def _common_axes(a: SweepCube, b: SweepCube):
+    """Shared thread/chunk values and the index of each cube's matching cells."""
+    threads = np.intersect1d(a.threads, b.threads)
+    chunks = np.intersect1d(a.chunk_bytes, b.chunk_bytes)
+    ops = range(len(a.ops))
+    return (threads, chunks,
+            np.ix_(ops, np.searchsorted(a.threads, threads), np.searchsorted(a.chunk_bytes, chunks)),
+            np.ix_(ops, np.searchsorted(b.threads, threads), np.searchsorted(b.chunk_bytes, chunks)))
+
+
+@dataclass(frozen=True)
+class SweepDiff:
+    """Per-cell comparison of two sweeps, aligned on (op, threads, chunk).
+
+    Grids are [op, threads, chunk] over the cells both sweeps share;
+    table has one row per cell measured in both (DIFF_COLUMNS), worst
+    relative delta first.
+    """
+    threads: np.ndarray
+    chunk_bytes: np.ndarray
+    ops: Tuple[str, ...]
+    delta: np.ndarray                # (candidate - baseline) / baseline
+    p_value: np.ndarray              # Welch two-sided; NaN without per-iteration samples
+    alpha: float
+    table: pd.DataFrame
+
+    @property
+    def regressions(self) -> pd.DataFrame:
+        """Significantly slower cells, worst first."""
+        return self.table[self.table["Significant"] & (self.table["Delta"] < 0)]
+
+
+def diff_cubes(baseline: SweepCube, candidate: SweepCube, alpha: float = DEFAULT_ALPHA) -> SweepDiff:
+    """Relative delta and Welch's t-test for every cell present in both cubes."""
+    candidate = candidate.in_unit(baseline.unit)
+    threads, chunks, ia, ib = _common_axes(baseline, candidate)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # unmeasured / single-sample cells
+        var_a = np.nanvar(baseline.samples, axis=3, ddof=1)[ia]
+        var_b = np.nanvar(candidate.samples, axis=3, ddof=1)[ib]
+    mean_a, n_a = baseline.mean[ia], baseline.count[ia]
+    mean_b, n_b = candidate.mean[ib], candidate.count[ib]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = (mean_b - mean_a) / mean_a
+    t, df, p = welch_t_test(mean_a, np.nan_to_num(var_a), n_a, mean_b, np.nan_to_num(var_b), n_b)
+
+    o, ti, ci = np.nonzero((n_a > 0) & (n_b > 0))
+    table = pd.DataFrame({
+        "Op": np.asarray(baseline.ops)[o],
+        "Threads": threads[ti],
+        "ChunkBytes": chunks[ci],
+        "Baseline": mean_a[o, ti, ci],
+        "Candidate": mean_b[o, ti, ci],
+        "Delta": delta[o, ti, ci],
+        "BaselineSamples": n_a[o, ti, ci],
+        "CandidateSamples": n_b[o, ti, ci],
+        "T": t[o, ti, ci],
+        "DF": df[o, ti, ci],
+        "PValue": p[o, ti, ci],
+    })
+    table["Significant"] = table["PValue"] < alpha
+    table = table.sort_values("Delta", kind="stable").reset_index(drop=True)[DIFF_COLUMNS]
+    return SweepDiff(threads, chunks, baseline.ops, delta, p, alpha, table)
@@ -0,0 +1,223 @@
+import os
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from cpu_topology import PLACEMENTS, SYSFS_CPU, UNPINNED, CpuTopology, Placement, format_cpu_list
+from facets import NO_MEMORY_LIMIT
+from history_store import HistoryStore, RunInfo, git_head, record_file
+from units import KIB, MIB, format_size, parse_size
+
+
+# Environment variables read by TestUtils/PerformanceSettings.cs and PerformanceResultsWriter.cs
+ITERATIONS_VARIABLE = "PERF_ITERATIONS"
+CELLS_VARIABLE = "PERF_CELLS"
+DATA_SIZE_VARIABLE = "PERF_DATA_SIZE_MB"
+THREADS_VARIABLE = "PERF_THREADS"
+CHUNK_BYTES_VARIABLE = "PERF_CHUNK_BYTES"
+WINDOW_CAPS_VARIABLE = "PERF_WINDOW_CAPS"
+MEMORY_LIMITS_VARIABLE = "PERF_MEMORY_LIMITS"
+PLACEMENT_VARIABLE = "PERF_PLACEMENT"
+PHYSICAL_CORES_VARIABLE = "PERF_PHYSICAL_CORES"
+RESULTS_PATH_VARIABLE = "PERF_RESULTS_PATH"
+SETTINGS_VARIABLES = [ITERATIONS_VARIABLE, CELLS_VARIABLE, DATA_SIZE_VARIABLE, THREADS_VARIABLE,
+                      CHUNK_BYTES_VARIABLE, WINDOW_CAPS_VARIABLE, MEMORY_LIMITS_VARIABLE,
+                      PLACEMENT_VARIABLE, PHYSICAL_CORES_VARIABLE, RESULTS_PATH_VARIABLE]
+TEST_FILTER = "Category=Performance"
+# PerformanceTests buffers the plaintext in one byte[] of whole MiB
+MAX_DATA_SIZE = (2 ** 31 - 1) // MIB * MIB
+# AesGcmStreamCipher bounds: windowCap >= 4, memoryLimitBytes >= MinChunkSize (8 KiB) * 4
+MIN_WINDOW_CAP = 4
+MIN_MEMORY_LIMIT = 4 * 8 * KIB
+_SPEC_KEYS = {"name", "data_sizes", "threads", "chunk_sizes", "window_caps", "memory_limits", "placements",
+              "iterations"}
+
+
+def parse_memory_limit(value) -> int:
+    """Bytes of a memory limit; 0, 'none' or 'unlimited' mean no limit (NO_MEMORY_LIMIT)."""
+    if isinstance(value, str) and value.strip().lower() in ("none", "unlimited"):
+        return NO_MEMORY_LIMIT
+    return parse_size(value)
+
+
+@dataclass(frozen=True)
+class SweepSpec:
+    """What one orchestrated sweep measures. None keeps the test's built-in default."""
+    name: str = "sweep"
+    data_sizes: Sequence[int] = (1000 * MIB,)    # bytes; one test run per size
+    threads: Optional[Sequence[int]] = None
+    chunk_sizes: Optional[Sequence[int]] = None  # bytes
+    window_caps: Optional[Sequence[int]] = None
+    memory_limits: Optional[Sequence[int]] = None  # bytes, NO_MEMORY_LIMIT for none
+    placements: Optional[Sequence[str]] = None     # cpu_topology.PLACEMENTS; None runs unpinned
+    iterations: Optional[int] = None
+
+    def __post_init__(self) -> None:
+        if not self.data_sizes:
+            raise ValueError("data_sizes must not be empty")
+        for size in self.data_sizes:
+            if size % MIB or not MIB <= size <= MAX_DATA_SIZE:
+                raise ValueError(f"data size {format_size(size)} must be whole MiB, "
+                                 f"1MiB..{format_size(MAX_DATA_SIZE)}")
+        for label, values in (("threads", self.threads), ("chunk_sizes", self.chunk_sizes)):
+            if values is not None and (not values or min(values) < 1):
+                raise ValueError(f"{label} must be a non-empty list of positive integers")
+        if self.window_caps is not None and (not self.window_caps or min(self.window_caps) < MIN_WINDOW_CAP):
+            raise ValueError(f"window_caps must be a non-empty list of integers >= {MIN_WINDOW_CAP}")
+        if self.memory_limits is not None:
+            if not self.memory_limits or any(m != NO_MEMORY_LIMIT and m < MIN_MEMORY_LIMIT
+                                             for m in self.memory_limits):
+                raise ValueError(f"memory_limits must be 'none' or at least {format_size(MIN_MEMORY_LIMIT)}")
+        if self.placements is not None:
+            unknown = set(self.placements) - set(PLACEMENTS) - {UNPINNED}
+            if not self.placements or unknown:
+                raise ValueError(f"placements must be a non-empty list of {', '.join(PLACEMENTS + (UNPINNED,))}")
+        if self.iterations is not None and self.iterations < 1:
+            raise ValueError("iterations must be positive")
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SweepSpec":
+        """Build from a parsed spec file; sizes may be bytes or strings such as '64KiB'."""
+        unknown = set(data) - _SPEC_KEYS
+        if unknown:
+            raise ValueError(f"unknown sweep spec keys: {', '.join(sorted(unknown))}")
+        sizes = data.get("data_sizes")
+        chunks = data.get("chunk_sizes")
+        threads = data.get("threads")
+        caps = data.get("window_caps")
+        limits = data.get("memory_limits")
+        placements = data.get("placements")
+        return cls(
+            name=str(data.get("name", "sweep")),
+            data_sizes=tuple(parse_size(s) for s in sizes) if sizes is not None else cls.data_sizes,
+            threads=tuple(int(t) for t in threads) if threads is not None else None,
+            chunk_sizes=tuple(parse_size(c) for c in chunks) if chunks is not None else None,
+            window_caps=tuple(int(w) for w in caps) if caps is not None else None,
+            memory_limits=tuple(parse_memory_limit(m) for m in limits) if limits is not None else None,
+            placements=tuple(str(x) for x in placements) if placements is not None else None,
+            iterations=int(data["iterations"]) if "iterations" in data else None,
+        )
+
+    def environment(self, data_size: int) -> Dict[str, str]:
+        """PERF_* variables for the test run measuring data_size bytes."""
+        env = {DATA_SIZE_VARIABLE: str(data_size // MIB)}
+        if self.threads is not None:
+            env[THREADS_VARIABLE] = ",".join(map(str, self.threads))
+        if self.chunk_sizes is not None:
+            env[CHUNK_BYTES_VARIABLE] = ",".join(map(str, self.chunk_sizes))
+        if self.window_caps is not None:
+            env[WINDOW_CAPS_VARIABLE] = ",".join(map(str, self.window_caps))
+        if self.memory_limits is not None:
+            env[MEMORY_LIMITS_VARIABLE] = ",".join(map(str, self.memory_limits))
+        if self.iterations is not None:
+            env[ITERATIONS_VARIABLE] = str(self.iterations)
+        return env
+
+
+def load_spec(path: Path) -> SweepSpec:
+    """Read a sweep spec from .toml, or .yaml/.yml when PyYAML is installed."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".toml":
+        import tomllib
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    elif suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError(f"{path.name}: YAML specs need PyYAML (pip install pyyaml); or use TOML") from None
+        with open(path, encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+    else:
+        raise ValueError(f"{path.name}: sweep spec must be .toml, .yaml or .yml")
+    return SweepSpec.from_dict(data)
+
+
+def resolve_placements(names: Optional[Sequence[str]],
+                       topology: Optional[CpuTopology] = None) -> List[Optional[Placement]]:
+    """Placements to run, in order; names=None means one unpinned run.
+
+    Placements this machine cannot tell apart from 'physical' are skipped with
+    a note. Without a readable topology (not Linux) unpinned runs go ahead
+    unrecorded ([None]), while explicit placements raise ValueError.
+    """
+    if topology is None:
+        try:
+            topology = CpuTopology.read()
+        except OSError as e:
+            if names:
+                raise ValueError(f"placements need the CPU topology in {SYSFS_CPU}: {e}") from None
+            return [None]
+    print(f"[cpu] {topology.describe()}", flush=True)
+    placements: List[Optional[Placement]] = []
+    for name in names or (UNPINNED,):
+        try:
+            placements.append(topology.placement(name))
+        except ValueError as e:
+            print(f"[skip] {name}: {e}", flush=True)
+    if not placements:
+        raise ValueError("none of the placements can run on this machine")
+    return placements
+
+
+def placement_environment(placement: Optional[Placement]) -> Dict[str, str]:
+    """PERF_* variables that make the tests record placement on every measurement."""
+    if placement is None:
+        return {}
+    return {PLACEMENT_VARIABLE: placement.name, PHYSICAL_CORES_VARIABLE: str(placement.physical_cores)}
+
+
+def run_performance_tests(project: Path, settings: Dict[str, str], results_path: Path,
+                          test_filter: str = TEST_FILTER, dotnet: str = "dotnet",
+                          extra_args: Sequence[str] = (), cpus: Sequence[int] = ()) -> Path:
+    """Run `dotnet test --filter <test_filter>` with the given PERF_* settings.
+
+    Settings not given are removed from the inherited environment, so the
+    tests fall back to their defaults. Non-empty cpus pin the run with
+    taskset (Environment.ProcessorCount then reports their number).
+    Measurements go to results_path (replaced if it exists), which is returned.
+    """
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    results_path.unlink(missing_ok=True)
+    env = {k: v for k, v in os.environ.items() if k not in SETTINGS_VARIABLES}
+    env.update(settings)
+    env[RESULTS_PATH_VARIABLE] = str(results_path.resolve())
+    cmd = [dotnet, "test", str(project), "--filter", test_filter, *extra_args]
+    if cpus:
+        cmd = ["taskset", "-c", format_cpu_list(cpus), *cmd]
+    shown = " ".join(f"{k}={v}" for k, v in settings.items() if len(v) <= 80)
+    print(f"[run] {' '.join(cmd)}  ({shown})", flush=True)
+    subprocess.run(cmd, env=env, check=True)
+    if not results_path.exists():
+        raise RuntimeError(f"the test run wrote no measurements to {results_path}")
+    return results_path
+
+
+def run_sweep(spec: SweepSpec, project: Path, results_dir: Path, store: Optional[HistoryStore] = None,
+              dotnet: str = "dotnet", extra_args: Sequence[str] = ()) -> List[Path]:
+    """Run the spec (one test run per data size and placement) and record each run into store.
+
+    Runs are recorded against the commit checked out at project. Returns the
+    .jsonl measurement files, named <name>-<timestamp>-<size>.jsonl, with a
+    -<placement> suffix when the spec lists placements.
+    """
+    sha = git_head(project)
+    stamp = pd.Timestamp.utcnow().strftime("%Y%m%dT%H%M%S")
+    placements = resolve_placements(spec.placements)
+    files: List[Path] = []
+    for size in spec.data_sizes:
+        for placement in placements:
+            suffix = f"-{placement.name}" if spec.placements and placement is not None else ""
+            path = results_dir / f"{spec.name}-{stamp}-{format_size(size)}{suffix}.jsonl"
+            env = {**spec.environment(size), **placement_environment(placement)}
+            run_performance_tests(project, env, path, dotnet=dotnet, extra_args=extra_args,
+                                  cpus=placement.cpus if placement is not None else ())
+            files.append(path)
+            if store is not None:
+                info: RunInfo = record_file(store, path, git_sha=sha)
+                print(f"[ok] Recorded {path.name} as {info.run_id}: {info.rows} samples", flush=True)
+    return files
@@ -0,0 +1,347 @@
+import math
+import re
+import warnings
+from dataclasses import dataclass
+from decimal import Decimal
+from pathlib import Path
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from facets import FACET_COLUMNS, default_facet
+from result_cache import cached_frames
+from units import MIB
+
+
+# Bump whenever parsing output changes so cached tables are invalidated
+PARSER_VERSION = 6
+
+# Section markers printed by PerformanceTests.cs
+SECTION_RE = re.compile(r"^\s*===\s*(ENCRYPTION|DECRYPTION) THREAD/CHUNK SWEEP\s*===")
+# NUnit console headers that precede every test's output
+SOURCE_RE = re.compile(r"^\s*Source:\s*(\S+)\s+line\s+(\d+)")
+DURATION_RE = re.compile(r"^\s*Duration:\s*([\d.]+)\s*(ms|sec|s|min)\b")
+# Sweep preamble: "Threads: 1, 2, 4" and "Chunk sizes: 0.1MB, 0.5MB, ..."
+THREADS_HEADER_RE = re.compile(r"^\s*Threads:\s*(.+?)\s*$")
+CHUNKS_HEADER_RE = re.compile(r"^\s*Chunk sizes:\s*(.+?)\s*$")
+# Table row count, printed when cells are filtered or window caps / memory limits
+# are swept (rows of those are prefixed "[windowCap=.. memoryLimit=..]" and not parsed)
+ROWS_HEADER_RE = re.compile(r"^\s*Rows:\s*(\d+)\s*$")
+# Decrypt sections that list one ciphertext per chunk size print their real chunk
+# sizes. Older ones decrypted a single payload encrypted with the default chunk,
+# whatever the row said
+CIPHERTEXT_HEADER_RE = re.compile(r"^\s*Ciphertext:\s*one payload per chunk size")
+# AesGcmStreamCipher.DefaultChunkSize: the chunk of every pre-fix decrypt measurement
+DEFAULT_CHUNK_BYTES = MIB
+# Table rows: threads | chunk MiB (decimal) | avg throughput (decimal) [| per-iteration samples]
+ROW_RE = re.compile(r"^\s*(\d+)\s*\|\s*([\d.]+)\s*\|\s*([\d.]+)(?:\s*\|\s*([\d.]+(?:\s+[\d.]+)*))?")
+
+
+# Per-cell frames: Throughput is the mean over samples, with its spread alongside.
+# ChunkBytes is canonical; ChunkMB (MiB, exact) is derived for display
+FRAME_COLUMNS = ["Threads", "ChunkBytes", "ChunkMB", "Throughput",
+                 "ThroughputMin", "ThroughputMedian", "ThroughputMax", "Samples"]
+# Sample-level table: one row per timed iteration; Throughput is in MiB/s as the
+# tests report it (units.SAMPLE_THROUGHPUT_UNIT)
+SAMPLE_COLUMNS = ["Op", "Threads", "ChunkBytes", "Iteration", "Throughput"]
+# Long format: samples across runs, tagged with run metadata
+LONG_COLUMNS = SAMPLE_COLUMNS + ["RunId", "Host", "Timestamp"]
+
+_DURATION_SCALE = {"ms": 0.001, "s": 1.0, "sec": 1.0, "min": 60.0}
+
+
+class SweepFormatError(ValueError):
+    """Raised when a log does not contain usable sweep data."""
+
+
+class SweepRow(NamedTuple):
+    """One measurement from a sweep table, tagged with the test it came from."""
+    op: str                      # "encrypt" or "decrypt"
+    threads: int
+    chunk_bytes: int
+    throughput: float            # Avg as printed by the test, in MiB/s (headed "MB/s")
+    samples: Tuple[float, ...]   # per-iteration MiB/s; (throughput,) for logs without them
+    test_name: Optional[str]
+    source_line: Optional[int]
+    duration_sec: Optional[float]
+    pooled: bool = False         # one of several rows that measured the same cell (see SweepLogParser)
+
+
+def chunk_mb_to_bytes(text: str) -> int:
+    """Recover the exact chunk size from a ChunkMB cell.
+
+    The test prints chunkSize / 1 MiB with three decimals, i.e. +-512 bytes,
+    so sub-MiB sizes are ambiguous ("0.062" fits both 63 and 64 KiB). The sweep
+    uses whole KiB (chunkSizesInKBytes * 1024), so we take the KiB values that
+    print the same and prefer a power of two, then the closest one.
+    """
+    mib = Decimal(text)
+    half_ulp = Decimal(1).scaleb(mib.as_tuple().exponent) / 2
+    lo = math.ceil((mib - half_ulp) * 1024)
+    hi = math.floor((mib + half_ulp) * 1024)
+    candidates = [k for k in range(lo, hi + 1) if k > 0]
+    if not candidates:
+        return int(round(mib * MIB))
+    pow2 = [k for k in candidates if k & (k - 1) == 0]
+    target = float(mib) * 1024
+    best = min(pow2 or candidates, key=lambda k: abs(k - target))
+    return best * 1024
+
+
+class SweepLogParser:
+    """Line-oriented state machine over NUnit console output.
+
+    Feed lines one by one; every table row inside an ENCRYPTION/DECRYPTION
+    sweep section comes back as a SweepRow. Nothing but the current section
+    context is kept, so memory does not depend on log size.
+
+    Decrypt rows of logs without the "Ciphertext:" header are recorded with
+    DEFAULT_CHUNK_BYTES, the chunk size their ciphertext really had, and
+    marked pooled: a thread count's rows are separate measurements of one
+    cell under fake chunk labels, not iterations of it (see rows_to_samples).
+
+    When a section closes, its row count is checked against the "Rows:" header
+    line, or else the "Threads:" and "Chunk sizes:" ones; a mismatch raises
+    SweepFormatError in strict mode and is a warning otherwise. Call close()
+    after the last line.
+    """
+
+    def __init__(self, strict: bool = True) -> None:
+        self.strict = strict
+        self.op: Optional[str] = None
+        self.test_name: Optional[str] = None
+        self.source_line: Optional[int] = None
+        self.duration_sec: Optional[float] = None
+        self._last_text: Optional[str] = None
+        self._expected_rows: Optional[int] = None
+        self._threads_count: Optional[int] = None
+        self._rows = 0
+        self._per_chunk_payloads = False
+
+    def _open_section(self, op: str) -> None:
+        self._close_section()
+        self.op = op
+        self._rows = 0
+        self._threads_count = None
+        self._expected_rows = None
+        self._per_chunk_payloads = False
+
+    def _close_section(self) -> None:
+        if self.op is not None and self._expected_rows is not None and self._rows != self._expected_rows:
+            msg = (f"{self.test_name or self.op}: {self.op} sweep has {self._rows} rows, "
+                   f"header lists {self._expected_rows}")
+            if self.strict:
+                raise SweepFormatError(msg)
+            warnings.warn(msg, RuntimeWarning, stacklevel=3)
+        self.op = None
+
+    def close(self) -> None:
+        """Finish the input, validating the last open section."""
+        self._close_section()
+
+    def begin_test(self, name: Optional[str], source_line: Optional[int] = None,
+                   duration_sec: Optional[float] = None) -> None:
+        """Start a new test context; closes any open sweep section."""
+        self._close_section()
+        self.test_name = name
+        self.source_line = source_line
+        self.duration_sec = duration_sec
+
+    def feed(self, line: str) -> Optional[SweepRow]:
+        m = SECTION_RE.match(line)
+        if m:
+            self._open_section("encrypt" if m.group(1) == "ENCRYPTION" else "decrypt")
+            return None
+
+        if self.op is not None:
+            if "|" in line:
+                m = ROW_RE.match(line)
+                if m:
+                    self._rows += 1
+                    avg = float(m.group(3))
+                    samples = tuple(float(x) for x in m.group(4).split()) if m.group(4) else (avg,)
+                    chunk = chunk_mb_to_bytes(m.group(2))
+                    pooled = self.op == "decrypt" and not self._per_chunk_payloads
+                    if pooled:
+                        chunk = DEFAULT_CHUNK_BYTES
+                    return SweepRow(self.op, int(m.group(1)), chunk, avg, samples,
+                                    self.test_name, self.source_line, self.duration_sec, pooled)
+            elif CIPHERTEXT_HEADER_RE.match(line):
+                self._per_chunk_payloads = True
+                return None
+            else:
+                # "Rows:" follows the other headers and overrides threads x chunk sizes
+                m = ROWS_HEADER_RE.match(line)
+                if m:
+                    self._expected_rows = int(m.group(1))
+                    return None
+                if self._expected_rows is None:
+                    m = THREADS_HEADER_RE.match(line)
+                    if m:
+                        self._threads_count = len(m.group(1).split(","))
+                        return None
+                    m = CHUNKS_HEADER_RE.match(line)
+                    if m and self._threads_count is not None:
+                        self._expected_rows = self._threads_count * len(m.group(1).split(","))
+                        return None
+
+        m = SOURCE_RE.match(line)
+        if m:
+            # A new test starts: the line before "Source:" is its name
+            self.begin_test(self._last_text, int(m.group(2)))
+        else:
+            m = DURATION_RE.match(line)
+            if m:
+                self.duration_sec = float(m.group(1)) * _DURATION_SCALE[m.group(2)]
+            elif line.lstrip().startswith("==="):
+                # Any other banner closes the current sweep section
+                self._close_section()
+
+        stripped = line.strip()
+        if stripped:
+            self._last_text = stripped
+        return None
+
+
+def iter_sweep_rows(lines: Iterable[str], strict: bool = True) -> Iterator[SweepRow]:
+    """Lazily yield sweep rows from an iterable of log lines."""
+    parser = SweepLogParser(strict=strict)
+    for line in lines:
+        row = parser.feed(line)
+        if row is not None:
+            yield row
+    parser.close()
+
+
+def iter_sweep_file(filename: Path, strict: bool = True) -> Iterator[SweepRow]:
+    """Stream sweep rows from a console log or a .trx file, reading it exactly once."""
+    if Path(filename).suffix.lower() == ".trx":
+        from trx_reader import iter_trx_rows
+        yield from iter_trx_rows(filename, strict=strict)
+        return
+    from log_scanner import iter_log_rows
+    yield from iter_log_rows(filename, strict=strict)
+
+
+def pool_samples(samples: pd.DataFrame, pooled: pd.Series) -> pd.DataFrame:
+    """Replace the pooled samples of each cell by a single one, their mean (Iteration 0).
+
+    Legacy decrypt sweeps measured one cell several times under different
+    chunk labels. Counting those as iterations would overstate the sample
+    size behind bootstrap intervals, Welch tests and gate thresholds.
+    """
+    if not pooled.any():
+        return samples
+    keys = [c for c in samples.columns if c not in ("Iteration", "Throughput")]
+    merged = samples[pooled].groupby(keys, as_index=False, sort=False)["Throughput"].mean().assign(Iteration=0)
+    return pd.concat([samples[~pooled], merged[samples.columns]], ignore_index=True)
+
+
+def rows_to_samples(rows: Iterable[SweepRow]) -> pd.DataFrame:
+    """Flatten rows into the sample-level table (one row per iteration; pooled rows give one per cell)."""
+    cols = {c: [] for c in SAMPLE_COLUMNS}
+    pooled = []
+    for row in rows:
+        for i, value in enumerate(row.samples):
+            cols["Op"].append(row.op)
+            cols["Threads"].append(row.threads)
+            cols["ChunkBytes"].append(row.chunk_bytes)
+            cols["Iteration"].append(i)
+            cols["Throughput"].append(value)
+            pooled.append(row.pooled)
+    if not cols["Op"]:
+        return pd.DataFrame(columns=SAMPLE_COLUMNS)
+    return pool_samples(pd.DataFrame(cols), pd.Series(pooled))
+
+
+def with_chunk_mb(df: pd.DataFrame) -> pd.DataFrame:
+    """Add the display column ChunkMB (exact MiB) derived from ChunkBytes."""
+    df = df.copy()
+    df["ChunkMB"] = df["ChunkBytes"].astype("int64") / MIB
+    return df
+
+
+def samples_to_frames(samples: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Aggregate a sample-level (or long) table into per-cell (encrypt, decrypt) frames.
+
+    Throughput is the mean over all samples of a cell (across runs for long
+    tables); ThroughputMin/Median/Max and Samples describe the spread.
+    """
+    def frame(op: str) -> pd.DataFrame:
+        d = samples[samples["Op"] == op]
+        if d.empty:
+            return pd.DataFrame(columns=FRAME_COLUMNS)
+        cells = (d.groupby(["Threads", "ChunkBytes"])["Throughput"]
+                  .agg(Throughput="mean", ThroughputMin="min", ThroughputMedian="median",
+                       ThroughputMax="max", Samples="count")
+                  .reset_index())
+        return with_chunk_mb(cells)[FRAME_COLUMNS]
+
+    return frame("encrypt"), frame("decrypt")
+
+
+def frame_has_chunk_axis(frame: pd.DataFrame) -> bool:
+    """Whether a per-cell frame spans several chunk sizes (SweepCube.has_chunk_axis for FRAME_COLUMNS frames)."""
+    return frame["ChunkBytes"].nunique() > 1
+
+
+def parse_sweep_samples(filename: Path) -> pd.DataFrame:
+    """Sample-level table for a log, served from the on-disk cache when possible.
+
+    Accepts console logs, .trx files and the .jsonl measurements written by
+    PerformanceTests (see jsonl_loader).
+    """
+    def parse():
+        if Path(filename).suffix.lower() == ".jsonl":
+            from jsonl_loader import load_measurements, measurements_to_samples
+            samples = measurements_to_samples(load_measurements(filename))
+        else:
+            samples = rows_to_samples(iter_sweep_file(filename))
+        return {"samples": samples}
+
+    return cached_frames(Path(filename), "sweep", PARSER_VERSION, parse)["samples"]
+
+
+def parse_sweep_frames(filename: Path) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Per-cell (encrypt, decrypt) frames for a log; see parse_sweep_samples."""
+    return samples_to_frames(parse_sweep_samples(filename))
+
+
+def tag_run(samples: pd.DataFrame, run_id: str = "", host: str = "",
+            timestamp: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+    """Turn a sample-level table into the long format by adding run metadata (facets are kept)."""
+    facets = [c for c in FACET_COLUMNS if c in samples]
+    long_df = samples[SAMPLE_COLUMNS + facets].copy()
+    long_df["RunId"] = run_id
+    long_df["Host"] = host
+    long_df["Timestamp"] = timestamp if timestamp is not None else pd.NaT
+    return long_df[LONG_COLUMNS + facets]
+
+
+@dataclass(frozen=True)
+class SweepResults:
+    """Parsed and validated sweep data, shared by every chart generator."""
+    encrypt: pd.DataFrame
+    decrypt: pd.DataFrame
+    source: Optional[Path] = None
+    samples: Optional[pd.DataFrame] = None   # sample-level table (SAMPLE_COLUMNS, FACET_COLUMNS if swept)
+
+    def validate(self) -> None:
+        name = self.source.name if self.source else "input"
+        if self.encrypt.empty:
+            raise SweepFormatError(f"no ENCRYPTION sweep rows found in {name}")
+        if self.decrypt.empty:
+            raise SweepFormatError(f"no DECRYPTION sweep rows found in {name}")
+
+
+def load_sweep_results(filename: Path) -> SweepResults:
+    """Parse a log once and validate it; raises SweepFormatError on unusable input.
+
+    The frames hold the default window cap / memory limit cells only.
+    """
+    filename = Path(filename)
+    samples = parse_sweep_samples(filename)
+    enc, dec = samples_to_frames(default_facet(samples))
+    results = SweepResults(enc, dec, filename, samples)
+    results.validate()
+    return results
@@ -0,0 +1,142 @@
+import warnings
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from cube import SweepCube
+
+
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_RESAMPLES = 2000
+# Modified z-score above which a sample is an outlier (Iglewicz & Hoaglin)
+DEFAULT_OUTLIER_Z = 3.5
+# Fewer samples than this give no usable median/MAD, so nothing is rejected
+MIN_SAMPLES_FOR_REJECTION = 4
+# 1.4826 * MAD estimates the standard deviation of normal data, robustly
+_MAD_SCALE = 1.4826
+# Fixed so that charts and summaries are reproducible from the same input
+_SEED = 0
+# Resampled values held at once by bootstrap_ci (~16 MB per float64 array), so that
+# memory stays flat however many runs a long history pools into each cell
+_BLOCK_VALUES = 1 << 21
+
+
+def _nan_quiet(fn, *args, **kwargs):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN (unmeasured) cells
+        return fn(*args, **kwargs)
+
+
+def mad(samples: np.ndarray) -> np.ndarray:
+    """Scaled median absolute deviation along the last axis, ignoring NaN padding."""
+    median = _nan_quiet(np.nanmedian, samples, axis=-1, keepdims=True)
+    return _MAD_SCALE * _nan_quiet(np.nanmedian, np.abs(samples - median), axis=-1)
+
+
+def reject_outliers(samples: np.ndarray, z: float = DEFAULT_OUTLIER_Z) -> np.ndarray:
+    """samples with outliers replaced by NaN (same shape; sample axis last).
+
+    A sample is an outlier when |x - median| > z * MAD of its cell. Cells
+    with fewer than MIN_SAMPLES_FOR_REJECTION samples, or a MAD of zero, are
+    left untouched.
+    """
+    median = _nan_quiet(np.nanmedian, samples, axis=-1, keepdims=True)
+    spread = mad(samples)[..., None]
+    count = np.count_nonzero(~np.isnan(samples), axis=-1)[..., None]
+    with np.errstate(invalid="ignore"):
+        outlier = (np.abs(samples - median) > z * spread) & (spread > 0) & (count >= MIN_SAMPLES_FOR_REJECTION)
+    return np.where(outlier, np.nan, samples)
+
+
+def bootstrap_ci(samples: np.ndarray, confidence: float = DEFAULT_CONFIDENCE, resamples: int = DEFAULT_RESAMPLES,
+                 statistic: str = "mean", seed: int = _SEED):
+    """Percentile bootstrap interval of the mean (or median) of every cell at once.
+
+    samples is NaN-padded with the sample axis last; each cell is resampled
+    from its own valid samples only. Returns (low, high) arrays of the
+    leading shape; cells with one sample get a zero-width interval, unmeasured
+    cells NaN. Cells and resamples are drawn in blocks of about _BLOCK_VALUES
+    values, so memory does not grow with the sample depth.
+    """
+    reduce = {"mean": np.nanmean, "median": np.nanmedian}[statistic]
+    cells = samples.reshape(-1, samples.shape[-1])
+    # NaN sorts last, so each cell's valid samples become a prefix of length count
+    packed = np.sort(cells, axis=-1)
+    count = np.count_nonzero(~np.isnan(packed), axis=-1)
+    depth = max(int(count.max(initial=0)), 1)
+    packed = packed[:, :depth]
+
+    rng = np.random.default_rng(seed)
+    estimates = np.empty((len(cells), resamples))
+    cell_block = max(1, _BLOCK_VALUES // (resamples * depth))
+    resample_block = max(1, _BLOCK_VALUES // (cell_block * depth))
+    for c in range(0, len(cells), cell_block):
+        block, n = packed[c:c + cell_block], count[c:c + cell_block]
+        # Draws past a cell's own count are padding: a cell of n samples resamples n
+        padding = (np.arange(depth) >= n[:, None])[:, None, :]
+        for r in range(0, resamples, resample_block):
+            size = min(resample_block, resamples - r)
+            idx = rng.integers(0, np.maximum(n, 1)[:, None, None], (len(block), size, depth))
+            resampled = np.take_along_axis(block[:, None, :], idx, axis=-1)
+            resampled[np.broadcast_to(padding, resampled.shape)] = np.nan
+            estimates[c:c + cell_block, r:r + size] = _nan_quiet(reduce, resampled, axis=-1)
+
+    tail = (1.0 - confidence) / 2.0
+    low, high = _nan_quiet(np.nanquantile, estimates, [tail, 1.0 - tail], axis=-1)
+    shape = samples.shape[:-1]
+    return low.reshape(shape), high.reshape(shape)
+
+
+@dataclass(frozen=True)
+class CellIntervals:
+    """Robust per-cell statistics of a cube; arrays are [op, threads, chunk] like SweepCube.mean."""
+    cube: SweepCube
+    median: np.ndarray
+    mad: np.ndarray
+    mean: np.ndarray                 # mean of the samples kept after outlier rejection
+    low: np.ndarray                  # bootstrap interval of that mean
+    high: np.ndarray
+    count: np.ndarray                # samples kept
+    rejected: np.ndarray             # samples dropped as outliers
+    confidence: float
+
+    def contenders(self, op: str) -> List[int]:
+        """Flat [threads * chunk] indices of op's cells whose interval reaches the best cell's, best first.
+
+        The best cell (highest mean) is always first. It is a clear winner
+        only when it is the sole contender and rests on more than one sample.
+        """
+        o = self.cube.op_index(op)
+        mean, low, high = self.mean[o].ravel(), self.low[o].ravel(), self.high[o].ravel()
+        if np.isnan(mean).all():
+            return []
+        best = int(np.nanargmax(mean))
+        overlap = np.flatnonzero(high >= low[best])
+        return [best] + [int(i) for i in overlap[np.argsort(-mean[overlap])] if i != best]
+
+    def winner(self, op: str) -> Optional[int]:
+        """Flat index of op's best cell if its interval overlaps no other cell's, else None."""
+        contenders = self.contenders(op)
+        if len(contenders) != 1 or self.count[self.cube.op_index(op)].ravel()[contenders[0]] < 2:
+            return None
+        return contenders[0]
+
+
+def cell_intervals(cube: SweepCube, confidence: float = DEFAULT_CONFIDENCE, resamples: int = DEFAULT_RESAMPLES,
+                   outlier_z: float = DEFAULT_OUTLIER_Z) -> CellIntervals:
+    """Median, MAD, outlier-filtered mean and its bootstrap interval for every cell of the cube."""
+    kept = reject_outliers(cube.samples, outlier_z)
+    count = np.count_nonzero(~np.isnan(kept), axis=-1)
+    low, high = bootstrap_ci(kept, confidence, resamples)
+    return CellIntervals(
+        cube=cube,
+        median=cube.median,
+        mad=mad(cube.samples),
+        mean=_nan_quiet(np.nanmean, kept, axis=-1),
+        low=low,
+        high=high,
+        count=count,
+        rejected=cube.count - count,
+        confidence=confidence,
+    )
@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+
+# The chart scripts are flat modules that import each other by name
+CHARTS_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(CHARTS_DIR))
@@ -0,0 +1,87 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from auto_tune import (CipherConfig, GaussianProcess, SearchSpace, expected_improvement, initial_design, propose,
+                       score)
+from facets import NO_MEMORY_LIMIT
+from iteration_planner import CELL_FIELDS
+from units import KIB, MIB
+
+
+SPACE = SearchSpace(max_threads=16)
+
+
+def test_decode_stays_in_bounds_and_encode_inverts_it():
+    rng = np.random.default_rng(0)
+    for x in rng.random((500, 4)):
+        config = SPACE.decode(x)
+        assert 1 <= config.threads <= SPACE.max_threads
+        assert SPACE.min_chunk <= config.chunk_bytes <= SPACE.max_chunk and config.chunk_bytes % KIB == 0
+        x2 = SPACE.encode(config)
+        assert ((0 <= x2) & (x2 <= 1)).all()
+        assert SPACE.decode(x2) == config
+
+
+@pytest.mark.parametrize("config", [
+    CipherConfig(1, 8 * KIB, 4, 32 * KIB),
+    CipherConfig(16, 64 * MIB, 4096),
+    CipherConfig(6, 3 * MIB, 100, 512 * MIB),
+])
+def test_measured_configs_round_trip(config):
+    assert SPACE.decode(SPACE.encode(config)) == config
+
+
+def test_memory_limit_axis():
+    assert SPACE.decode(np.array([0.5, 0.5, 0.5, 0.95])).memory_limit_bytes == NO_MEMORY_LIMIT
+    assert SPACE.decode(np.array([0.5, 0.5, 0.5, 0.5])).memory_limit_bytes != NO_MEMORY_LIMIT
+    fixed = SearchSpace(max_threads=16, tune_memory_limit=False)
+    assert fixed.decode(np.array([0.5, 0.5, 0.5, 0.0])).memory_limit_bytes == NO_MEMORY_LIMIT
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"max_threads": 0}, {"max_threads": 4, "min_chunk": KIB}, {"max_threads": 4, "max_window_cap": 1},
+    {"max_threads": 4, "max_memory_limit": KIB},
+])
+def test_invalid_spaces(kwargs):
+    with pytest.raises(ValueError):
+        SearchSpace(**kwargs)
+
+
+def test_initial_design_is_distinct():
+    configs = initial_design(SPACE, 8, np.random.default_rng(1))
+    assert 0 < len(configs) <= 8 and len(set(configs)) == len(configs)
+
+
+def test_gaussian_process_interpolates():
+    x = np.random.default_rng(2).random((12, 4))
+    y = np.sin(3 * x[:, 0]) + x[:, 1]
+    mean, std = GaussianProcess(x, y, lengthscale=0.5, noise=1e-6).predict(x)
+    np.testing.assert_allclose(mean, y, atol=1e-3)
+    assert (std < 1e-2).all()
+
+
+def test_expected_improvement():
+    ei = expected_improvement(np.array([0.0, 1.0, 2.0]), np.array([1.0, 1.0, 1.0]), 1.0)
+    assert ei[1] == pytest.approx(1 / math.sqrt(2 * math.pi))
+    assert ei[0] < ei[1] < ei[2]
+
+
+def test_propose_skips_seen_configs():
+    rng = np.random.default_rng(3)
+    seen = initial_design(SPACE, 8, rng)
+    scores = np.array([c.threads * 10.0 + 1 for c in seen])
+    picked, gain = propose(SPACE, seen, scores, 3, rng)
+    assert len(picked) == 3 and not set(picked) & set(seen) and gain >= 0
+
+
+def test_score_is_geometric_mean_over_ops():
+    rows = [("encrypt", 2, MIB, 4, NO_MEMORY_LIMIT, 100.0), ("encrypt", 2, MIB, 4, NO_MEMORY_LIMIT, 300.0),
+            ("decrypt", 2, MIB, 4, NO_MEMORY_LIMIT, 50.0), ("encrypt", 4, MIB, 4, NO_MEMORY_LIMIT, 10.0)]
+    df = pd.DataFrame(rows, columns=CELL_FIELDS + ["Throughput"])
+    result = score(df, ["encrypt", "decrypt"])
+    full = result[CipherConfig(2, MIB, 4, NO_MEMORY_LIMIT)]
+    assert full["encrypt"] == 200.0 and full["score"] == pytest.approx(100.0)
+    assert math.isnan(result[CipherConfig(4, MIB, 4, NO_MEMORY_LIMIT)]["score"])
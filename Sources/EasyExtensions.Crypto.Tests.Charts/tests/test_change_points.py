@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from change_points import SERIES_KEY, current_level_start, detect, noise_sigma, pelt
+
+
+def _noisy(levels, rng, noise=0.5):
+    return np.concatenate([level + rng.normal(0.0, noise, n) for level, n in levels])
+
+
+def _bic(n: int, noise: float = 0.5) -> float:
+    return 3.0 * noise ** 2 * np.log(n)
+
+
+def _exhaustive(x: np.ndarray, penalty: float, min_size: int) -> list:
+    """Optimal partitioning without pruning, O(n^2): the reference PELT must match."""
+    n = len(x)
+    if n < 2 * min_size:
+        return []
+    best, last = [-penalty] + [np.inf] * n, [0] * (n + 1)
+    for t in range(min_size, n + 1):
+        for s in [0] + list(range(min_size, t - min_size + 1)):
+            seg = x[s:t]
+            value = best[s] + float(((seg - seg.mean()) ** 2).sum()) + penalty
+            if value < best[t]:
+                best[t], last[t] = value, s
+    changes, t = [], last[n]
+    while t > 0:
+        changes.append(t)
+        t = last[t]
+    return changes[::-1]
+
+
+def test_pelt_finds_a_single_step():
+    x = _noisy([(100.0, 20), (110.0, 20)], np.random.default_rng(0))
+    assert pelt(x, _bic(len(x))) == [20]
+
+
+def test_pelt_finds_several_steps_and_none_in_flat_data():
+    rng = np.random.default_rng(1)
+    x = _noisy([(100.0, 15), (90.0, 10), (120.0, 15)], rng)
+    assert pelt(x, _bic(len(x))) == [15, 25]
+    flat = _noisy([(100.0, 40)], rng)
+    assert pelt(flat, _bic(len(flat))) == []
+
+
+def test_pelt_respects_min_size():
+    x = np.array([1.0, 1.0, 1.0, 1.0, 5.0])
+    # The lone 5.0 cannot form a segment of two, so the best cut pairs it with a 1.0
+    assert pelt(x, 0.1, min_size=2) == [3]
+    assert pelt(x, 0.1, min_size=1) == [4]
+    assert pelt(np.array([1.0, 2.0, 3.0]), 0.1, min_size=2) == []
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_pelt_pruning_matches_exhaustive_search(seed):
+    rng = np.random.default_rng(seed)
+    n, min_size = int(rng.integers(4, 40)), int(rng.integers(1, 5))
+    x = rng.normal(0.0, 1.0, n) + np.repeat(rng.normal(0.0, 3.0, 3), [n // 3, n // 3, n - 2 * (n // 3)])
+    penalty = float(rng.uniform(0.1, 10.0))
+    assert pelt(x, penalty, min_size) == _exhaustive(x, penalty, min_size)
+
+
+def test_pelt_pruning_keeps_candidates_min_size_needs():
+    # Pruning against the current end instead of end - min_size found a costlier fit here
+    rng = np.random.default_rng(281)
+    n = int(rng.integers(4, 40))
+    x = rng.normal(0, 1, n) + np.repeat(rng.normal(0, 3, 3), [n // 3, n // 3, n - 2 * (n // 3)])
+    penalty = float(rng.uniform(0.5, 10))
+    assert pelt(x, penalty) == _exhaustive(x, penalty, 2) == [2, 4, 7, 12, 14]
+
+
+def test_noise_sigma_ignores_level_shifts():
+    rng = np.random.default_rng(2)
+    step = _noisy([(100.0, 50), (150.0, 50)], rng, noise=1.0)
+    assert noise_sigma(step) == pytest.approx(1.0, rel=0.3)
+    assert np.std(step) > 20
+
+
+def test_current_level_start_skips_small_shifts():
+    rng = np.random.default_rng(3)
+    assert current_level_start(_noisy([(100.0, 6), (130.0, 6)], rng)) == 6
+    assert current_level_start(_noisy([(100.0, 12)], rng)) == 0
+    # A 1% shift is below DEFAULT_MIN_SHIFT
+    assert current_level_start(_noisy([(100.0, 8), (101.0, 8)], rng, noise=0.01), min_shift=0.02) == 0
+
+
+def test_detect_reports_commit_range_and_shift():
+    x = _noisy([(100.0, 8), (80.0, 8)], np.random.default_rng(4))
+    series = pd.DataFrame({"Host": "ci-01", "Op": "encrypt", "Threads": 4, "ChunkBytes": 1 << 20,
+                           "RunId": [f"run{i}" for i in range(len(x))],
+                           "Timestamp": pd.date_range("2026-01-01", periods=len(x), freq="D"),
+                           "GitSha": [f"{i:02d}" + "f" * 38 for i in range(len(x))], "Throughput": x})
+    changes = list(detect(series[SERIES_KEY + ["RunId", "Timestamp", "GitSha", "Throughput"]]))
+    assert len(changes) == 1
+    cp = changes[0]
+    assert cp.index == 8
+    assert cp.shift == pytest.approx(-0.2, abs=0.01)
+    assert cp.commit_range == "07ffffffff..08ffffffff"
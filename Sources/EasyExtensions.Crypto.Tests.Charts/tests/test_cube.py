@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cube import OPS, SweepCube
+from units import BPS, MIB, MIBPS
+
+
+def _samples(rows):
+    return pd.DataFrame(rows, columns=["Op", "Threads", "ChunkBytes", "Throughput"])
+
+
+@pytest.fixture
+def cube():
+    # Throughput in MiB/s; encrypt has an unmeasured (2 threads, 2 MiB) cell, decrypt one chunk size only
+    return SweepCube.from_samples(_samples([
+        ("encrypt", 1, MIB, 100.0), ("encrypt", 1, MIB, 110.0), ("encrypt", 1, MIB, 120.0),
+        ("encrypt", 1, 2 * MIB, 200.0),
+        ("encrypt", 2, MIB, 150.0), ("encrypt", 2, MIB, 170.0),
+        ("decrypt", 2, MIB, 90.0),
+        ("hash", 4, MIB, 1.0),
+    ]))
+
+
+def test_axes_and_padding(cube):
+    assert cube.ops == OPS
+    assert cube.threads.tolist() == [1, 2]  # ops outside OPS are dropped
+    assert cube.chunk_bytes.tolist() == [MIB, 2 * MIB]
+    assert cube.samples.shape == (2, 2, 2, 3)
+    assert cube.count[cube.op_index("encrypt")].tolist() == [[3, 1], [2, 0]]
+    assert np.isnan(cube.samples[0, 1, 0, 2])
+
+
+def test_stored_in_bytes_per_second(cube):
+    assert cube.unit == BPS
+    assert cube.mean[0, 0, 0] == pytest.approx(110.0 * MIB)
+
+
+def test_stats_and_best(cube):
+    stats = cube.stats("encrypt", t=0)
+    assert stats.mean.tolist() == pytest.approx([110.0 * MIB, 200.0 * MIB])
+    assert stats.min[0] == 100.0 * MIB and stats.max[0] == 120.0 * MIB
+    assert stats.count.tolist() == [3, 1]
+    assert np.isnan(cube.stats("encrypt", 1, 1).mean)
+    best = cube.best("encrypt")
+    assert (best["Threads"], best["ChunkBytes"], best["ChunkMB"]) == (1, 2 * MIB, 2.0)
+
+
+def test_in_unit_round_trip(cube):
+    mib = cube.in_unit(MIBPS)
+    assert mib.unit == MIBPS
+    assert mib.mean[0, 0, 0] == pytest.approx(110.0)
+    assert mib.in_unit(BPS).samples == pytest.approx(cube.samples, nan_ok=True)
+    assert cube.in_unit(BPS) is cube
+
+
+def test_cell_queries(cube):
+    assert cube.cells("encrypt") == 3 and cube.cells("decrypt") == 1
+    assert cube.has_chunk_axis("encrypt") and not cube.has_chunk_axis("decrypt")
+    assert cube.thread_index(2) == 1 and cube.thread_index(3) == -1
+    assert not cube.empty
+
+
+def test_several_facets_are_rejected():
+    df = _samples([("encrypt", 1, MIB, 1.0), ("encrypt", 1, MIB, 2.0)])
+    df["WindowCap"] = [1, 2]
+    df["MemoryLimitBytes"] = [0, 0]
+    with pytest.raises(ValueError, match="facet"):
+        SweepCube.from_samples(df)
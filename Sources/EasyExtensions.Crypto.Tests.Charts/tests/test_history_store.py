@@ -0,0 +1,83 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import history_store
+from facets import DEFAULT_FACET, FACET_COLUMNS
+from history_store import HISTORY_COLUMNS, HistoryStore
+from sweep_parser import SAMPLE_COLUMNS, parse_sweep_samples
+
+
+INPUT = Path(__file__).parent.parent / "input.txt"
+
+
+@pytest.fixture(scope="module")
+def samples():
+    return parse_sweep_samples(INPUT)
+
+
+@pytest.fixture
+def store(tmp_path, samples):
+    store = HistoryStore(tmp_path / "history")
+    store.append(samples, pd.Timestamp("2026-01-01 10:00:00"), host="ci-01", git_sha="a" * 40)
+    store.append(samples[samples["Op"] == "encrypt"], pd.Timestamp("2026-02-01 10:00:00"), host="ci-02",
+                 git_sha="b" * 40, placement="p0")
+    return store
+
+
+def test_read_run_round_trips(store, samples):
+    run = store.runs()[0]
+    back = store.read_run(run)
+    assert list(back.columns) == SAMPLE_COLUMNS + FACET_COLUMNS
+    pd.testing.assert_frame_equal(back[SAMPLE_COLUMNS], samples[SAMPLE_COLUMNS].reset_index(drop=True),
+                                  check_dtype=False)
+    # Sources without facet columns measured the cipher defaults
+    assert (back[FACET_COLUMNS].drop_duplicates().to_numpy() == [DEFAULT_FACET]).all()
+
+
+def test_manifest_records_metadata_and_pruning_stats(store, samples):
+    first, second = store.runs()
+    assert first.run_id == "20260101T100000-ci-01-aaaaaaaa"
+    assert (first.rows, first.host, first.ops) == (len(samples), "ci-01", ["decrypt", "encrypt"])
+    assert second.ops == ["encrypt"] and second.placement == "p0"
+
+
+def test_load_filters_and_tags_rows(store, samples):
+    history = store.load()
+    assert list(history.columns) == HISTORY_COLUMNS
+    assert len(history) == len(samples) + (samples["Op"] == "encrypt").sum()
+    decrypt = store.load(op="decrypt")
+    assert set(decrypt["RunId"]) == {store.runs()[0].run_id}
+    one = store.load(op="encrypt", threads=[1], host="ci-02")
+    assert set(one["Threads"]) == {1} and set(one["GitSha"]) == {"b" * 40}
+    assert len(store.load(since="2026-01-15")) == (samples["Op"] == "encrypt").sum()
+    assert store.load(until="2025-01-01").empty
+
+
+def test_select_runs_prunes_by_manifest(store):
+    ids = lambda **kw: [r.run_id for r in store.select_runs(**kw)]
+    assert len(ids(git_sha="bbbb")) == 1
+    assert len(ids(chunk_bytes=[12345])) == 0
+    # Runs recorded without a placement were unpinned
+    assert len(ids(placement="unpinned")) == 1
+
+
+def test_memory_mapped_partitions_read_the_same(store, monkeypatch):
+    expected = store.load(op="encrypt", threads=[2])
+    monkeypatch.setattr(history_store, "_MMAP_MIN_ROWS", 1)
+    pd.testing.assert_frame_equal(store.load(op="encrypt", threads=[2]), expected)
+
+
+def test_run_ids_are_unique_and_empty_runs_refused(store, samples):
+    again = store.append(samples, pd.Timestamp("2026-01-01 10:00:00"), host="ci-01", git_sha="a" * 40)
+    assert again.run_id == "20260101T100000-ci-01-aaaaaaaa-2"
+    with pytest.raises(ValueError):
+        store.append(samples.iloc[:0], pd.Timestamp("2026-03-01"))
+    assert not any(p.name.endswith(".tmp") for p in (store.root / history_store.PARTITIONS_DIR).iterdir())
+
+
+def test_missing_store_is_empty(tmp_path):
+    store = HistoryStore(tmp_path / "nothing")
+    assert store.runs() == []
+    assert store.load().empty
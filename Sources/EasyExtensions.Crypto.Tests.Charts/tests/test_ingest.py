@@ -0,0 +1,41 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from ingest import expand_inputs, ingest_files, parse_one
+
+
+INPUT = Path(__file__).parent.parent / "input.txt"
+
+
+@pytest.fixture
+def ci_tree(tmp_path):
+    """<host>/<run_id> result files: two good logs, a truncated .jsonl and a log without sweeps."""
+    for host, run in (("ci-01", "run1"), ("ci-02", "run2")):
+        (tmp_path / host).mkdir(exist_ok=True)
+        shutil.copy(INPUT, tmp_path / host / f"{run}.txt")
+    (tmp_path / "ci-01" / "cut.jsonl").write_text('{"op": "encrypt", "threads": 1, "chunkB', encoding="utf-8")
+    (tmp_path / "ci-02" / "empty.txt").write_text("Build succeeded.\n", encoding="utf-8")
+    return tmp_path
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_bad_files_are_skipped_and_reported(ci_tree, workers, capsys):
+    paths = expand_inputs([str(ci_tree / "**" / "*")])
+    assert len(paths) == 4
+    runs, skipped = ingest_files(paths, workers=workers)
+    assert sorted(runs["RunId"].unique()) == ["run1", "run2"]
+    assert sorted(runs["Host"].unique()) == ["ci-01", "ci-02"]
+    one, reason = parse_one(ci_tree / "ci-01" / "run1.txt")
+    assert reason is None and len(runs) == 2 * len(one)
+    reasons = {p.name: reason for p, reason in skipped}
+    assert reasons.keys() == {"cut.jsonl", "empty.txt"}
+    assert reasons["empty.txt"] == "no sweep rows"
+    if workers == 1:  # pool workers print to their own stdout
+        assert "cut.jsonl" in capsys.readouterr().out
+
+
+def test_no_inputs():
+    runs, skipped = ingest_files([])
+    assert runs.empty and skipped == []
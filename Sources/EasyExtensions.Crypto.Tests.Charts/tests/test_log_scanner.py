@@ -0,0 +1,44 @@
+from pathlib import Path
+
+import pytest
+
+import log_scanner
+from sweep_parser import iter_sweep_rows
+
+
+INPUT = Path(__file__).parent.parent / "input.txt"
+
+
+def _line_by_line(path: Path) -> list:
+    return list(iter_sweep_rows(path.read_text(encoding="utf-8", errors="ignore").splitlines()))
+
+
+def test_scanner_matches_line_parser():
+    rows = list(log_scanner.iter_log_rows(INPUT))
+    assert rows == _line_by_line(INPUT)
+    assert {r.test_name for r in rows} == {"Encrypt_ThreadSweep_ChunkSweep", "Decrypt_ThreadSweep_ChunkSweep"}
+
+
+def test_source_line_opening_a_window_keeps_its_test_name(tmp_path, monkeypatch):
+    # Pad the log so the second test's Source: line starts exactly at a window boundary
+    text = INPUT.read_bytes()
+    source = text.index(b"Source:", text.index(b"Decrypt_ThreadSweep_ChunkSweep"))
+    line_start = text.rfind(b"\n", 0, source) + 1
+    window = 64 * 1024
+    log = tmp_path / "padded.txt"
+    log.write_bytes(b"#" * (window - line_start - 1) + b"\n" + text)
+    padded = log.read_bytes()
+    assert padded[window - 1:window] == b"\n" and b"Source:" in padded[window:].split(b"\n", 1)[0]
+    monkeypatch.setattr(log_scanner, "WINDOW", window)
+
+    rows = list(log_scanner.iter_log_rows(log))
+    assert rows == _line_by_line(log)
+    assert {r.test_name for r in rows if r.op == "decrypt"} == {"Decrypt_ThreadSweep_ChunkSweep"}
+
+
+@pytest.mark.parametrize("window", [4096, 8192, 12345])
+def test_any_window_size_gives_the_same_rows(tmp_path, monkeypatch, window):
+    log = tmp_path / "long.txt"
+    log.write_bytes(INPUT.read_bytes() * 20)
+    monkeypatch.setattr(log_scanner, "WINDOW", window)
+    assert list(log_scanner.iter_log_rows(log)) == _line_by_line(log)
@@ -0,0 +1,77 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from history_store import HistoryStore
+from regression_gate import EXIT_NO_DATA, EXIT_PASS, EXIT_REGRESSION, baseline_runs, cell_baseline, run_gate
+from units import MIB
+
+
+CELLS = [(op, threads) for op in ("encrypt", "decrypt") for threads in (1, 4)]
+
+
+def _sweep(level: float, rng: np.random.Generator, iterations: int = 6, cells=CELLS) -> pd.DataFrame:
+    return pd.DataFrame([{"Op": op, "Threads": threads, "ChunkBytes": MIB, "Iteration": i,
+                          "Throughput": level * rng.normal(1.0, 0.005)}
+                         for op, threads in cells for i in range(iterations)])
+
+
+def _store(tmp_path, levels) -> HistoryStore:
+    rng = np.random.default_rng(7)
+    store = HistoryStore(tmp_path / "history")
+    for day, level in enumerate(levels):
+        store.append(_sweep(level * rng.normal(1.0, 0.005), rng), pd.Timestamp("2026-01-01") + pd.Timedelta(days=day),
+                     host="ci-01", git_sha=f"{day:040x}")
+    return store
+
+
+def test_empty_history_has_no_baseline(tmp_path):
+    verdict = run_gate(HistoryStore(tmp_path / "history"), _sweep(100.0, np.random.default_rng(0)))
+    assert verdict.status == "no-baseline"
+    assert verdict.exit_code == EXIT_NO_DATA
+
+
+def test_steady_candidate_passes(tmp_path):
+    store = _store(tmp_path, [100.0] * 10)
+    verdict = run_gate(store, _sweep(100.0, np.random.default_rng(1)))
+    assert (verdict.status, verdict.exit_code) == ("pass", EXIT_PASS)
+    assert verdict.checked == len(CELLS) and not verdict.regressions
+    assert json.loads(verdict.to_json())["status"] == "pass"
+
+
+def test_drop_beyond_noise_fails(tmp_path):
+    store = _store(tmp_path, [100.0] * 10)
+    verdict = run_gate(store, _sweep(92.0, np.random.default_rng(1)))
+    assert (verdict.status, verdict.exit_code) == ("fail", EXIT_REGRESSION)
+    assert len(verdict.regressions) == len(CELLS)
+    worst = verdict.regressions[0]
+    assert worst.delta == pytest.approx(-0.08, abs=0.02)
+    assert worst.delta < -worst.threshold
+    assert len(json.loads(verdict.to_json())["regressions"]) == len(CELLS)
+
+
+def test_unmeasured_cells_are_skipped(tmp_path):
+    store = _store(tmp_path, [100.0] * 5)
+    candidate = _sweep(100.0, np.random.default_rng(1), cells=CELLS + [("encrypt", 16)])
+    verdict = run_gate(store, candidate)
+    assert (verdict.checked, verdict.skipped) == (len(CELLS), 1)
+
+
+def test_window_keeps_latest_runs(tmp_path):
+    store = _store(tmp_path, [100.0] * 6)
+    runs = baseline_runs(store, window=4)
+    assert [r.git_sha for r in runs] == [f"{day:040x}" for day in range(2, 6)]
+
+
+def test_level_shift_inside_window_does_not_widen_threshold(tmp_path):
+    # A 20% speed-up landed mid-window: the baseline is the new level, with its own noise
+    store = _store(tmp_path, [100.0] * 5 + [120.0] * 5)
+    baseline = cell_baseline(store, baseline_runs(store))
+    assert baseline["Baseline"].to_numpy() == pytest.approx(120.0, rel=0.02)
+    assert (baseline["Runs"] == 5).all()
+    assert (3 * baseline["Sigma"] / baseline["Baseline"]).max() < 0.05
+    # Falling back to the old level is a regression against the new one
+    verdict = run_gate(store, _sweep(105.0, np.random.default_rng(1)))
+    assert verdict.exit_code == EXIT_REGRESSION
@@ -0,0 +1,78 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cube import SweepCube
+from sweep_diff import beta_inc, diff_cubes, student_t_two_sided, welch_t_test
+from units import MIB, MIBPS
+
+
+def _t_two_sided_by_quadrature(t: float, df: float) -> float:
+    """Reference p-value: 1 - 2 * integral of the Student t density over [0, |t|] (Simpson's rule)."""
+    x = np.linspace(0.0, abs(t), 20001)
+    log_norm = math.lgamma((df + 1) / 2) - math.lgamma(df / 2) - 0.5 * math.log(df * math.pi)
+    f = np.exp(log_norm - (df + 1) / 2 * np.log1p(x * x / df))
+    h = x[1] - x[0]
+    integral = h / 3 * (f[0] + f[-1] + 4 * f[1:-1:2].sum() + 2 * f[2:-1:2].sum())
+    return 1.0 - 2.0 * integral
+
+
+@pytest.mark.parametrize("t", [0.0, 0.5, 1.0, 3.0, 12.0])
+def test_student_t_closed_forms(t):
+    # df = 1 is the Cauchy distribution, df = 2 has an algebraic CDF
+    assert student_t_two_sided(t, 1.0) == pytest.approx(1 - 2 / math.pi * math.atan(t), abs=1e-10)
+    assert student_t_two_sided(t, 2.0) == pytest.approx(1 - t / math.sqrt(2 + t * t), abs=1e-10)
+
+
+@pytest.mark.parametrize("t, df, p", [(2.228139, 10, 0.05), (4.032143, 5, 0.01), (1.959964, 1e6, 0.05)])
+def test_student_t_critical_values(t, df, p):
+    assert student_t_two_sided(t, df) == pytest.approx(p, rel=1e-5)
+
+
+@pytest.mark.parametrize("t, df", [(1.897, 5.882), (0.3, 3.5), (2.5, 17.25), (-4.0, 8.1)])
+def test_student_t_fractional_df(t, df):
+    assert student_t_two_sided(t, df) == pytest.approx(_t_two_sided_by_quadrature(t, df), abs=1e-8)
+
+
+def test_beta_inc_edges_and_symmetry():
+    assert beta_inc(2.0, 3.0, 0.0) == 0.0
+    assert beta_inc(2.0, 3.0, 1.0) == 1.0
+    assert beta_inc(1.0, 1.0, 0.3) == pytest.approx(0.3)
+    assert beta_inc(2.5, 4.0, 0.2) + beta_inc(4.0, 2.5, 0.8) == pytest.approx(1.0)
+
+
+def test_welch_by_hand():
+    a = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+    b = np.array([2.0, 4.0, 6.0, 8.0, 10.0])
+    t, df, p = welch_t_test(a.mean(), a.var(ddof=1), len(a), b.mean(), b.var(ddof=1), len(b))
+    # se^2 = 2.5/5 + 10/5 = 2.5; df = 2.5^2 / (0.5^2/4 + 2^2/4)
+    assert t == pytest.approx(3.0 / math.sqrt(2.5))
+    assert df == pytest.approx(6.25 / 1.0625)
+    assert p == pytest.approx(_t_two_sided_by_quadrature(float(t), float(df)), abs=1e-8)
+
+
+def test_welch_degenerate_cells():
+    t, df, p = welch_t_test(np.array([10.0, 10.0, 10.0]), np.zeros(3), np.array([3, 3, 1]),
+                            np.array([10.0, 11.0, 11.0]), np.zeros(3), np.array([3, 3, 3]))
+    # Noise-free cells are significant exactly when the means differ; one sample is untestable
+    assert p[0] == 1.0 and p[1] == 0.0
+    assert np.isnan(p[2]) and np.isnan(t[2]) and np.isnan(df[2])
+
+
+def _cube(throughputs):
+    rows = [{"Op": op, "Threads": 1, "ChunkBytes": MIB, "Iteration": i, "Throughput": v}
+            for op in ("encrypt", "decrypt") for i, v in enumerate(throughputs[op])]
+    return SweepCube.from_samples(pd.DataFrame(rows))
+
+
+def test_diff_cubes_flags_significant_regression():
+    base = _cube({"encrypt": [100.0, 101.0, 99.0, 100.5], "decrypt": [100.0, 101.0, 99.0, 100.5]})
+    cand = _cube({"encrypt": [90.0, 91.0, 89.0, 90.5], "decrypt": [100.5, 99.5, 100.0, 101.0]})
+    diff = diff_cubes(base.in_unit(MIBPS), cand)
+    rows = diff.table.set_index("Op")
+    assert rows.loc["encrypt", "Delta"] == pytest.approx(-0.1, abs=1e-3)
+    assert rows.loc["encrypt", "Significant"]
+    assert not rows.loc["decrypt", "Significant"]
+    assert list(diff.regressions["Op"]) == ["encrypt"]
@@ -0,0 +1,108 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from jsonl_loader import TICKS_PER_SECOND, measurements_to_samples
+from sweep_parser import (DEFAULT_CHUNK_BYTES, SweepFormatError, chunk_mb_to_bytes, iter_sweep_file, iter_sweep_rows,
+                          rows_to_samples)
+from units import KIB, MIB
+
+
+def _log(*body: str, header: str = "ENCRYPTION", name: str = "Encrypt_ThreadSweep_ChunkSweep") -> list:
+    return [f" {name}", "   Source: PerformanceTests.cs line 55", "   Duration: 1.5 sec", "",
+            f"=== {header} THREAD/CHUNK SWEEP ===", *body]
+
+
+def test_rows_carry_exact_chunk_bytes_and_test_context():
+    rows = list(iter_sweep_rows(_log("Threads: 1, 2", "Chunk sizes: 0.1MB, 1.0MB",
+                                     "Threads | ChunkMB | Avg MB/s | Samples MB/s",
+                                     "      1 |   0.062 |  100.0 | 90.0 110.0",
+                                     "      1 |   1.000 |  200.0 | 200.0 200.0",
+                                     "      2 |   0.062 |  300.0 | 300.0 300.0",
+                                     "      2 |   1.000 |  400.0 | 400.0 400.0")))
+    assert [(r.op, r.threads, r.chunk_bytes) for r in rows] == [
+        ("encrypt", 1, 64 * KIB), ("encrypt", 1, MIB), ("encrypt", 2, 64 * KIB), ("encrypt", 2, MIB)]
+    assert rows[0].samples == (90.0, 110.0)
+    assert rows[0].test_name == "Encrypt_ThreadSweep_ChunkSweep"
+    assert rows[0].source_line == 55
+    assert rows[0].duration_sec == 1.5
+
+
+def test_threads_times_chunks_header_checks_row_count():
+    lines = _log("Threads: 1, 2", "Chunk sizes: 0.1MB, 1.0MB",
+                 "      1 |   0.062 |  100.0", "      1 |   1.000 |  200.0", "      2 |   0.062 |  300.0")
+    with pytest.raises(SweepFormatError, match="3 rows, header lists 4"):
+        list(iter_sweep_rows(lines))
+
+
+def test_rows_header_overrides_threads_times_chunks():
+    lines = _log("Threads: 1, 2", "Chunk sizes: 0.1MB, 1.0MB", "Rows: 2",
+                 "      1 |   0.062 |  100.0", "      2 |   1.000 |  200.0")
+    assert len(list(iter_sweep_rows(lines))) == 2
+    with pytest.raises(SweepFormatError, match="2 rows, header lists 3"):
+        list(iter_sweep_rows(lines[:-3] + ["Rows: 3"] + lines[-2:]))
+
+
+def test_lenient_mode_warns_instead_of_raising():
+    lines = _log("Rows: 3", "      1 |   0.062 |  100.0")
+    with pytest.warns(RuntimeWarning, match="1 rows, header lists 3"):
+        rows = list(iter_sweep_rows(lines, strict=False))
+    assert len(rows) == 1
+
+
+def test_banner_closes_the_section():
+    lines = _log("Rows: 2", "      1 |   0.062 |  100.0", "=== SOMETHING ELSE ===", "      1 |   1.000 |  200.0")
+    with pytest.raises(SweepFormatError):
+        list(iter_sweep_rows(lines))
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("0.062", 64 * KIB),      # 63 KiB prints the same; the power of two wins
+    ("0.125", 128 * KIB),
+    ("0.500", 512 * KIB),
+    ("1.000", MIB),
+    ("16.000", 16 * MIB),
+    ("0.001", KIB),
+])
+def test_chunk_mb_to_bytes_recovers_whole_kib(text, expected):
+    assert chunk_mb_to_bytes(text) == expected
+
+
+def test_legacy_decrypt_rows_are_pooled_per_thread_count():
+    lines = _log("Threads: 1, 2", "Chunk sizes: 0.1MB, 1.0MB",
+                 "      1 |   0.062 |  100.0", "      1 |   1.000 |  300.0",
+                 "      2 |   0.062 |  500.0", "      2 |   1.000 |  700.0",
+                 header="DECRYPTION", name="Decrypt_ThreadSweep_ChunkSweep")
+    samples = rows_to_samples(iter_sweep_rows(lines))
+    assert sorted(zip(samples["Threads"], samples["ChunkBytes"], samples["Throughput"])) == [
+        (1, DEFAULT_CHUNK_BYTES, 200.0), (2, DEFAULT_CHUNK_BYTES, 600.0)]
+
+
+def test_decrypt_rows_with_ciphertext_header_keep_their_chunks():
+    lines = _log("Threads: 1", "Chunk sizes: 0.1MB, 1.0MB", "Ciphertext: one payload per chunk size",
+                 "      1 |   0.062 |  100.0", "      1 |   1.000 |  300.0",
+                 header="DECRYPTION", name="Decrypt_ThreadSweep_ChunkSweep")
+    rows = list(iter_sweep_rows(lines))
+    assert [r.chunk_bytes for r in rows] == [64 * KIB, MIB]
+    assert not any(r.pooled for r in rows)
+
+
+def test_legacy_decrypt_measurements_are_pooled():
+    rows = [{"op": "decrypt", "threads": 2, "chunkBytes": chunk, "dataBytes": 100 * MIB,
+             "elapsedTicks": TICKS_PER_SECOND * seconds, "iteration": i, "windowCap": 1024,
+             "memoryLimitBytes": 0, "ciphertextChunkBytes": None, "placement": "unpinned", "physicalCores": 4}
+            for chunk, seconds in ((64 * KIB, 1), (4 * MIB, 2)) for i in range(2)]
+    df = pd.DataFrame(rows).assign(Throughput=lambda d: d["dataBytes"] / MIB / (d["elapsedTicks"] / TICKS_PER_SECOND))
+    samples = measurements_to_samples(df)
+    assert len(samples) == 1
+    assert samples.loc[0, "ChunkBytes"] == DEFAULT_CHUNK_BYTES
+    assert samples.loc[0, "Throughput"] == pytest.approx(75.0)
+    # Cells re-run by name keep their requested chunk sizes and iterations
+    assert len(measurements_to_samples(df, requested_chunks=True)) == 4
+
+
+def test_bundled_log_row_counts():
+    rows = list(iter_sweep_file(Path(__file__).parent.parent / "input.txt"))
+    assert sum(r.op == "encrypt" for r in rows) == 35
+    assert sum(r.op == "decrypt" for r in rows) == 35
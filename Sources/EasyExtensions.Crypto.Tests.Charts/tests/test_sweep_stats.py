@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import sweep_stats
+from cube import SweepCube
+from sweep_stats import bootstrap_ci, cell_intervals, mad, reject_outliers
+from units import MIB
+
+
+def test_mad_of_normal_data_estimates_sigma():
+    x = np.random.default_rng(1).normal(0.0, 2.0, 20000)
+    assert mad(x) == pytest.approx(2.0, rel=0.03)
+
+
+def test_reject_outliers():
+    cells = np.array([
+        [10.0, 11.0, 10.5, 10.2, 50.0],        # 50 is far outside
+        [10.0, 11.0, 50.0, np.nan, np.nan],    # too few samples to judge
+        [10.0, 10.0, 10.0, 10.0, 12.0],        # MAD of zero
+    ])
+    kept = reject_outliers(cells)
+    assert np.isnan(kept[0, 4]) and not np.isnan(kept[0, :4]).any()
+    np.testing.assert_array_equal(kept[1:], cells[1:])
+
+
+def test_bootstrap_ci_shapes_and_degenerate_cells():
+    samples = np.full((3, 4), np.nan)
+    samples[0] = [1.0, 2.0, 3.0, 4.0]
+    samples[1, 0] = 5.0
+    low, high = bootstrap_ci(samples, resamples=500)
+    assert low[0] < 2.5 < high[0] and 1.0 <= low[0] and high[0] <= 4.0
+    assert low[1] == high[1] == 5.0
+    assert np.isnan(low[2]) and np.isnan(high[2])
+
+
+def test_bootstrap_ci_is_seeded_and_blocking_does_not_matter(monkeypatch):
+    samples = np.random.default_rng(2).normal(100.0, 5.0, (6, 30))
+    samples[::2, 20:] = np.nan  # ragged cells
+    full = bootstrap_ci(samples, resamples=400)
+    np.testing.assert_array_equal(full, bootstrap_ci(samples, resamples=400))
+    monkeypatch.setattr(sweep_stats, "_BLOCK_VALUES", 64)
+    blocked = bootstrap_ci(samples, resamples=400)
+    # Different block shapes draw different numbers, so only the statistical answer must agree
+    np.testing.assert_allclose(blocked, full, rtol=0.02)
+
+
+def test_bootstrap_ci_covers_the_mean():
+    samples = np.random.default_rng(3).normal(50.0, 4.0, (1, 200))
+    low, high = bootstrap_ci(samples, resamples=2000)
+    half_width = 1.96 * 4.0 / np.sqrt(200)
+    assert high[0] - low[0] == pytest.approx(2 * half_width, rel=0.25)
+
+
+def _cube(cells):
+    rows = [("encrypt", threads, MIB, value) for threads, values in cells.items() for value in values]
+    return SweepCube.from_samples(pd.DataFrame(rows, columns=["Op", "Threads", "ChunkBytes", "Throughput"]))
+
+
+def test_clear_winner():
+    intervals = cell_intervals(_cube({1: [100, 101, 99, 100], 2: [200, 201, 199, 200]}), resamples=500)
+    assert intervals.winner("encrypt") == 1
+    assert intervals.contenders("encrypt") == [1]
+
+
+def test_overlapping_cells_have_no_winner():
+    intervals = cell_intervals(_cube({1: [100, 140, 60, 100], 2: [105, 145, 65, 105]}), resamples=500)
+    assert intervals.winner("encrypt") is None
+    assert intervals.contenders("encrypt") == [1, 0]
+
+
+def test_single_sample_best_cell_is_not_a_winner():
+    intervals = cell_intervals(_cube({1: [100, 101, 99, 100], 2: [300]}), resamples=500)
+    assert intervals.contenders("encrypt") == [1]
+    assert intervals.winner("encrypt") is None
+
+
+def test_outliers_are_dropped_from_the_mean():
+    intervals = cell_intervals(_cube({1: [100, 101, 99, 100, 1000]}), resamples=200)
+    assert intervals.mean[0, 0, 0] == pytest.approx(100 * MIB)
+    assert intervals.count[0, 0, 0] == 4 and intervals.rejected[0, 0, 0] == 1
+    assert intervals.contenders("decrypt") == []
@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from units import (BPS, GIB, KIB, MIB, MIBPS, OPENSSL_K_UNIT, SAMPLE_THROUGHPUT_UNIT, format_mib, format_size,
+                   parse_size, throughput_unit)
+
+
+def test_throughput_round_trip_through_bytes_per_second():
+    mb = throughput_unit("MB/s")
+    values = np.array([1.0, 1024.0])
+    assert np.allclose(MIBPS.to_bps(values), values * MIB)
+    # 1 MiB/s is 1.048576 decimal MB/s: the ~5% gap the units layer exists for
+    assert mb.from_bps(MIBPS.to_bps(1.0)) == pytest.approx(1.048576)
+    assert MIBPS.from_bps(mb.to_bps(values)) == pytest.approx(values / 1.048576)
+    assert BPS.from_bps(123.0) == 123.0
+
+
+def test_declared_source_units():
+    assert SAMPLE_THROUGHPUT_UNIT is MIBPS
+    assert OPENSSL_K_UNIT.bytes_per_sec == 1000
+
+
+def test_unknown_unit_is_rejected():
+    with pytest.raises(ValueError, match="unknown throughput unit"):
+        throughput_unit("mb/s")
+
+
+@pytest.mark.parametrize("n_bytes, label", [
+    (64 * KIB, "64KiB"), (MIB, "1MiB"), (3 * MIB // 2, "1.5MiB"), (2 * GIB, "2GiB"), (1000, "1000B"), (1536, "1.5KiB"),
+])
+def test_format_size(n_bytes, label):
+    assert format_size(n_bytes) == label
+
+
+def test_format_mib_labels_chunk_mb_values():
+    assert format_mib(0.0625) == "64KiB"
+    assert format_mib(16.0) == "16MiB"
+
+
+@pytest.mark.parametrize("text, n_bytes", [
+    ("64KiB", 64 * KIB), ("1MiB", MIB), ("1.5 GiB", 3 * GIB // 2), ("1MB", 1_000_000), ("4096", 4096), (512, 512),
+])
+def test_parse_size(text, n_bytes):
+    assert parse_size(text) == n_bytes
+
+
+@pytest.mark.parametrize("text", ["64XB", "fast", "0.5B"])
+def test_parse_size_rejects_bad_sizes(text):
+    with pytest.raises(ValueError):
+        parse_size(text)
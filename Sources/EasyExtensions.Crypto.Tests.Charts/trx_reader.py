@@ -0,0 +1,65 @@
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Iterator, Optional
+
+from sweep_parser import SweepLogParser, SweepRow
+
+
+# TRX durations are TimeSpan strings: [d.]hh:mm:ss[.fffffff]
+_TIMESPAN_RE = re.compile(r"^(?:(\d+)\.)?(\d+):(\d+):(\d+(?:\.\d+)?)$")
+
+
+def _local(tag: str) -> str:
+    """Strip the '{namespace}' prefix ElementTree puts on TRX tags."""
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_timespan(value: Optional[str]) -> Optional[float]:
+    """Convert a TRX duration ('00:00:06.2000000') to seconds."""
+    if not value:
+        return None
+    m = _TIMESPAN_RE.match(value.strip())
+    if not m:
+        return None
+    days, hours, minutes, seconds = m.groups()
+    return int(days or 0) * 86400 + int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def _std_out(result: ET.Element) -> str:
+    for child in result:
+        if _local(child.tag) == "Output":
+            for part in child:
+                if _local(part.tag) == "StdOut":
+                    return part.text or ""
+    return ""
+
+
+def iter_trx_rows(filename: Path, strict: bool = True) -> Iterator[SweepRow]:
+    """Stream sweep rows out of a 'dotnet test --logger trx' results file.
+
+    Each <UnitTestResult> is handled as soon as its end tag is parsed: its
+    StdOut is fed through the same SweepLogParser as console logs (with the
+    test name and duration taken from the element attributes) and the element
+    is then dropped, so the DOM never grows beyond one result.
+    """
+    parser = SweepLogParser(strict=strict)
+    parents = []
+    for event, elem in ET.iterparse(filename, events=("start", "end")):
+        if event == "start":
+            parents.append(elem)
+            continue
+        parents.pop()
+        if _local(elem.tag) != "UnitTestResult":
+            continue
+
+        parser.begin_test(elem.get("testName"), duration_sec=parse_timespan(elem.get("duration")))
+        for line in _std_out(elem).splitlines():
+            row = parser.feed(line)
+            if row is not None:
+                yield row
+
+        elem.clear()
+        if parents:
+            parents[-1].remove(elem)
+    parser.close()
@@ -0,0 +1,82 @@
+import re
+from typing import Dict, NamedTuple, Union
+
+import numpy as np
+
+
+# Sizes in bytes. Binary prefixes are what the C# tests mean by "MB"
+# (PerformanceTests.OneMb = 1024 * 1024); OpenSSL's "k" is decimal.
+KIB = 1024
+MIB = 1024 * KIB
+GIB = 1024 * MIB
+KB = 1000
+MB = 1000 * KB
+GB = 1000 * MB
+
+
+class Unit(NamedTuple):
+    """A throughput unit: its label and how many bytes/s one of it is."""
+    name: str
+    bytes_per_sec: float
+
+    def from_bps(self, values):
+        """Convert bytes/s to this unit (scalars or arrays)."""
+        return np.divide(values, self.bytes_per_sec)
+
+    def to_bps(self, values):
+        """Convert values in this unit to bytes/s."""
+        return np.multiply(values, self.bytes_per_sec)
+
+
+BPS = Unit("B/s", 1.0)
+MIBPS = Unit("MiB/s", MIB)
+THROUGHPUT_UNITS: Dict[str, Unit] = {u.name: u for u in (
+    BPS,
+    Unit("KiB/s", KIB), MIBPS, Unit("GiB/s", GIB),
+    Unit("kB/s", KB), Unit("MB/s", MB), Unit("GB/s", GB),
+)}
+# What the sweep tables, .jsonl loader and history store carry in "Throughput":
+# the tests print MiB/s under a "MB/s" header
+SAMPLE_THROUGHPUT_UNIT = MIBPS
+# OpenSSL speed reports "1000s of bytes per second" with a 'k' suffix
+OPENSSL_K_UNIT = THROUGHPUT_UNITS["kB/s"]
+DEFAULT_DISPLAY_UNIT = MIBPS
+
+
+def throughput_unit(name: str) -> Unit:
+    """Look up a display unit by name ('MiB/s', 'MB/s', ...; case-sensitive, since k/K and B/b differ)."""
+    try:
+        return THROUGHPUT_UNITS[name]
+    except KeyError:
+        raise ValueError(f"unknown throughput unit {name!r}; choose from {', '.join(THROUGHPUT_UNITS)}") from None
+
+
+def format_size(n_bytes: int) -> str:
+    """Exact short label for a size: '64KiB', '1MiB', '1.5MiB', '1000B'."""
+    n_bytes = int(n_bytes)
+    for factor, suffix in ((GIB, "GiB"), (MIB, "MiB"), (KIB, "KiB")):
+        if n_bytes >= factor and (n_bytes * 2) % factor == 0:
+            return f"{n_bytes / factor:g}{suffix}"
+    return f"{n_bytes}B"
+
+
+def format_mib(mib: float) -> str:
+    """format_size() of a size given in MiB, such as a ChunkMB display value."""
+    return format_size(round(mib * MIB))
+
+
+_SIZE_SUFFIXES = {"": 1, "B": 1, "KIB": KIB, "MIB": MIB, "GIB": GIB, "KB": KB, "MB": MB, "GB": GB}
+
+
+def parse_size(value: Union[int, str]) -> int:
+    """Bytes of a size given as an integer (bytes) or a string like '64KiB', '1MiB', '1.5 GiB'."""
+    if isinstance(value, int):
+        return value
+    m = re.fullmatch(r"\s*([\d.]+)\s*([A-Za-z]*)\s*", str(value))
+    suffix = m.group(2).upper() if m else ""
+    if not m or suffix not in _SIZE_SUFFIXES:
+        raise ValueError(f"not a size: {value!r} (use bytes or e.g. 64KiB, 1MiB)")
+    size = float(m.group(1)) * _SIZE_SUFFIXES[suffix]
+    if size != int(size):
+        raise ValueError(f"not a whole number of bytes: {value!r}")
+    return int(size)
@@ -1,8 +1,11 @@
 ﻿// SPDX-License-Identifier: MIT
 // Copyright (c) 2025–2026 Vadim Belov <https://belov.us>
 
+using EasyExtensions.Crypto.Models;
 using EasyExtensions.Crypto.Tests.TestUtils;
 using System.Diagnostics;
+using System.Globalization;
+using System.Runtime.InteropServices;
 
 namespace EasyExtensions.Crypto.Tests
 {
@@ -14,8 +17,8 @@ namespace EasyExtensions.Crypto.Tests
         private static byte[]? _sharedData;
         private static byte[]? _masterKey;
         private const int OneMb = 1024 * 1024;
-        private const int TestDataSizeMb = 1000;
-        private const int Iterations = 2;
+        private static readonly PerformanceSettings _settings = PerformanceSettings.Current;
+        private static int TestDataSizeMb => _settings.DataSizeMb;
         private static readonly int[] chunkSizesInKBytes = [64, 128, 512, 1024, 4096, 8192, 16384];
 
         [SetUp]
@@ -40,7 +43,7 @@ namespace EasyExtensions.Crypto.Tests
                     _masterKey[i] = (byte)i;
                 }
 
-                // Prepare shared plaintext buffer (1 GB)
+                // Prepare shared plaintext buffer (1 GB unless PERF_DATA_SIZE_MB says otherwise)
                 int sizeBytes = TestDataSizeMb * OneMb;
                 byte[] data = new byte[sizeBytes];
                 for (int i = 0; i < data.Length; i++)
@@ -66,34 +69,31 @@ namespace EasyExtensions.Crypto.Tests
 
             int[] threadCounts = [.. GetThreadSweep()];
             int[] chunkSizes = GetChunkSweep();
+            SweepCell[] cells = [.. GetCells("encrypt", threadCounts, chunkSizes)];
 
             TestContext.Out.WriteLine("=== ENCRYPTION THREAD/CHUNK SWEEP ===");
-            TestContext.Out.WriteLine($"Data size: {TestDataSizeMb} MB");
-            TestContext.Out.WriteLine($"Threads: {string.Join(", ", threadCounts)}");
-            TestContext.Out.WriteLine($"Chunk sizes: {string.Join(", ", chunkSizes.Select(x => $"{x / (double)OneMb:F1}MB"))}");
-            TestContext.Out.WriteLine("Threads | ChunkMB | Avg MB/s");
+            WriteSweepHeader(threadCounts, chunkSizes, cells);
 
-            foreach (int threads in threadCounts)
+            using var results = new PerformanceResultsWriter();
+            foreach (SweepCell cell in cells)
             {
-                foreach (int chunkSize in chunkSizes)
+                List<double> throughputs = [];
+                for (int i = 0; i < _settings.Iterations; i++)
                 {
-                    List<double> throughputs = [];
-                    for (int i = 0; i < Iterations; i++)
-                    {
-                        var cipher = new AesGcmStreamCipher(masterKey, keyId: 1, threads: threads);
-                        using var inputStream = new MemoryStream(source, 0, totalBytes, writable: false, publiclyVisible: true);
-                        using var encryptedStream = new DevNullStream();
-                        long t0 = Stopwatch.GetTimestamp();
-                        await cipher.EncryptAsync(inputStream, encryptedStream, chunkSize: chunkSize);
-                        long t1 = Stopwatch.GetTimestamp();
-                        double timeSeconds = (t1 - t0) / (double)Stopwatch.Frequency;
-                        double throughputMBps = TestDataSizeMb / timeSeconds;
-                        throughputs.Add(throughputMBps);
-                    }
-                    double avg = throughputs.Average();
-                    TestContext.Out.WriteLine($"{threads,7} | {chunkSize / (double)OneMb,7:F3} | {avg,9:F1}");
+                    var cipher = CreateCipher(masterKey, cell);
+                    using var inputStream = new MemoryStream(source, 0, totalBytes, writable: false, publiclyVisible: true);
+                    using var encryptedStream = new DevNullStream();
+                    long t0 = Stopwatch.GetTimestamp();
+                    await cipher.EncryptAsync(inputStream, encryptedStream, chunkSize: cell.ChunkSize);
+                    long t1 = Stopwatch.GetTimestamp();
+                    double timeSeconds = (t1 - t0) / (double)Stopwatch.Frequency;
+                    double throughputMBps = TestDataSizeMb / timeSeconds;
+                    throughputs.Add(throughputMBps);
+                    results.Write(CreateMeasurement("encrypt", cell, totalBytes, t0, t1, i));
                 }
+                WriteSweepRow(cell, throughputs);
             }
+            TestContext.Out.WriteLine($"Measurements: {results.FilePath}");
         }
 
         [Test]
@@ -109,33 +109,28 @@ namespace EasyExtensions.Crypto.Tests
             byte[] masterKey = _masterKey!;
             int totalBytes = TestDataSizeMb * OneMb;
 
-            // Prepare one ciphertext for all decrypt sweeps
-            byte[] encryptedPayload;
-            {
-                var cipher = new AesGcmStreamCipher(masterKey, keyId: 1);
-                using var input = new MemoryStream(source, 0, totalBytes, writable: false, publiclyVisible: true);
-                using var encrypted = new MemoryStream(capacity: totalBytes + 4096);
-                await cipher.EncryptAsync(input, encrypted);
-                encryptedPayload = encrypted.ToArray();
-            }
-
             int[] threadCounts = [.. GetThreadSweep()];
             int[] chunkSizes = GetChunkSweep();
+            SweepCell[] cells = [.. GetCells("decrypt", threadCounts, chunkSizes)];
 
             TestContext.Out.WriteLine("=== DECRYPTION THREAD/CHUNK SWEEP ===");
-            TestContext.Out.WriteLine($"Data size: {TestDataSizeMb} MB");
-            TestContext.Out.WriteLine($"Threads: {string.Join(", ", threadCounts)}");
-            TestContext.Out.WriteLine($"Chunk sizes: {string.Join(", ", chunkSizes.Select(x => $"{x / (double)OneMb:F1}MB"))}");
-            TestContext.Out.WriteLine("Threads | ChunkMB | Avg MB/s");
+            // Tells table readers that rows carry the ciphertext's chunk size (older logs decrypted one 1 MiB payload)
+            TestContext.Out.WriteLine("Ciphertext: one payload per chunk size");
+            WriteSweepHeader(threadCounts, chunkSizes, cells);
 
-            foreach (int threads in threadCounts)
+            using var results = new PerformanceResultsWriter();
+            // DecryptAsync takes the chunk size from the ciphertext, so every chunk size needs its own payload.
+            // Each is encrypted right before its cells run, keeping a single payload in memory.
+            foreach (IGrouping<int, SweepCell> group in cells.GroupBy(x => x.ChunkSize))
             {
-                foreach (int chunkSize in chunkSizes)
+                byte[] encryptedPayload = await EncryptPayloadAsync(masterKey, source, totalBytes, group.Key);
+                int ciphertextChunkBytes = ReadCiphertextChunkSize(encryptedPayload);
+                foreach (SweepCell cell in group)
                 {
                     List<double> throughputs = [];
-                    for (int i = 0; i < Iterations; i++)
+                    for (int i = 0; i < _settings.Iterations; i++)
                     {
-                        var cipher = new AesGcmStreamCipher(masterKey, keyId: 1, threads: threads);
+                        var cipher = CreateCipher(masterKey, cell);
                         using var encryptedStream = new MemoryStream(encryptedPayload, writable: false);
                         var decryptedStream = new DevNullStream();
                         long t0 = Stopwatch.GetTimestamp();
@@ -144,15 +139,126 @@ namespace EasyExtensions.Crypto.Tests
                         double timeSeconds = (t1 - t0) / (double)Stopwatch.Frequency;
                         double throughputMBps = TestDataSizeMb / timeSeconds;
                         throughputs.Add(throughputMBps);
+                        results.Write(CreateMeasurement("decrypt", cell, totalBytes, t0, t1, i, ciphertextChunkBytes));
+                    }
+                    WriteSweepRow(cell, throughputs, ciphertextChunkBytes);
+                }
+            }
+            TestContext.Out.WriteLine($"Measurements: {results.FilePath}");
+        }
+
+        private static string FormatSamples(IEnumerable<double> throughputs)
+        {
+            return string.Join(' ', throughputs.Select(x => x.ToString("F1", CultureInfo.InvariantCulture)));
+        }
+
+        private static async Task<byte[]> EncryptPayloadAsync(byte[] masterKey, byte[] source, int totalBytes, int chunkSize)
+        {
+            var cipher = new AesGcmStreamCipher(masterKey, keyId: 1);
+            using var input = new MemoryStream(source, 0, totalBytes, writable: false, publiclyVisible: true);
+            // Plaintext plus a generous per-chunk header allowance, so the buffer never regrows;
+            // computed in long and capped, since near the maximum data size it exceeds int
+            long capacity = totalBytes + (totalBytes / (long)chunkSize + 1) * 64 + 4096;
+            using var encrypted = new MemoryStream(capacity: (int)Math.Min(capacity, Array.MaxLength));
+            await cipher.EncryptAsync(input, encrypted, chunkSize: chunkSize);
+            return encrypted.ToArray();
+        }
+
+        // Plaintext length of the first chunk, i.e. the chunk size the payload was encrypted with
+        private static int ReadCiphertextChunkSize(byte[] encryptedPayload)
+        {
+            using var stream = new MemoryStream(encryptedPayload, writable: false);
+            AesGcmKeyHeader.FromStream(stream, AesGcmStreamCipher.NonceSize, AesGcmStreamCipher.TagSize);
+            AesGcmKeyHeader firstChunk = AesGcmKeyHeader.FromStream(stream, AesGcmStreamCipher.NonceSize, AesGcmStreamCipher.TagSize);
+            return checked((int)firstChunk.DataLength);
+        }
+
+        private static PerformanceMeasurement CreateMeasurement(string op, SweepCell cell, long dataBytes, long t0, long t1, int iteration,
+            int? ciphertextChunkBytes = null)
+        {
+            return new PerformanceMeasurement(
+                Op: op,
+                Threads: cell.Threads,
+                ChunkBytes: cell.ChunkSize,
+                DataBytes: dataBytes,
+                ElapsedTicks: Stopwatch.GetElapsedTime(t0, t1).Ticks,
+                Iteration: iteration,
+                ProcessorCount: Environment.ProcessorCount,
+                RuntimeVersion: RuntimeInformation.FrameworkDescription,
+                WindowCap: cell.WindowCap,
+                MemoryLimitBytes: cell.MemoryLimitBytes,
+                CiphertextChunkBytes: ciphertextChunkBytes,
+                Placement: _settings.Placement,
+                PhysicalCores: _settings.PhysicalCores);
+        }
+
+        private static AesGcmStreamCipher CreateCipher(byte[] masterKey, SweepCell cell)
+        {
+            return new AesGcmStreamCipher(masterKey, keyId: 1, threads: cell.Threads, windowCap: cell.WindowCap, memoryLimitBytes: cell.MemoryLimitBytes);
+        }
+
+        private static IEnumerable<SweepCell> GetCells(string op, int[] threadCounts, int[] chunkSizes)
+        {
+            foreach (int threads in threadCounts)
+            {
+                foreach (int chunkSize in chunkSizes)
+                {
+                    foreach (int windowCap in _settings.WindowCaps)
+                    {
+                        foreach (long? memoryLimit in _settings.MemoryLimits)
+                        {
+                            if (_settings.Includes(op, threads, chunkSize, windowCap, memoryLimit))
+                            {
+                                yield return new SweepCell(threads, chunkSize, windowCap, memoryLimit);
+                            }
+                        }
                     }
-                    double avg = throughputs.Average();
-                    TestContext.Out.WriteLine($"{threads,7} | {chunkSize / (double)OneMb,7:F3} | {avg,9:F1}");
                 }
             }
         }
 
+        // "Rows:" counts the plain threads x chunk rows only; rows of other window caps and
+        // memory limits carry a [windowCap=... memoryLimit=...] prefix, so table readers that
+        // predate these dimensions skip them (the .jsonl measurements have every cell).
+        private static void WriteSweepHeader(int[] threadCounts, int[] chunkSizes, SweepCell[] cells)
+        {
+            TestContext.Out.WriteLine($"Data size: {TestDataSizeMb} MB");
+            if (_settings.Placement != null)
+            {
+                string cores = _settings.PhysicalCores?.ToString(CultureInfo.InvariantCulture) ?? "?";
+                TestContext.Out.WriteLine($"Placement: {_settings.Placement}, {cores} physical cores, {Environment.ProcessorCount} CPUs");
+            }
+            TestContext.Out.WriteLine($"Threads: {string.Join(", ", threadCounts)}");
+            TestContext.Out.WriteLine($"Chunk sizes: {string.Join(", ", chunkSizes.Select(x => $"{x / (double)OneMb:F1}MB"))}");
+            if (_settings.WindowCaps.Length > 1 || _settings.MemoryLimits.Length > 1 || !cells.All(x => x.IsDefaultFacet))
+            {
+                TestContext.Out.WriteLine($"Window caps: {string.Join(", ", _settings.WindowCaps)}");
+                TestContext.Out.WriteLine($"Memory limits: {string.Join(", ", _settings.MemoryLimits.Select(x => x?.ToString(CultureInfo.InvariantCulture) ?? "none"))}");
+            }
+            TestContext.Out.WriteLine($"Rows: {cells.Count(x => x.IsDefaultFacet)}");
+            TestContext.Out.WriteLine("Threads | ChunkMB | Avg MB/s | Samples MB/s");
+        }
+
+        private static void WriteSweepRow(SweepCell cell, List<double> throughputs, int? chunkBytes = null)
+        {
+            string facet = cell.IsDefaultFacet
+                ? string.Empty
+                : $"[windowCap={cell.WindowCap} memoryLimit={cell.MemoryLimitBytes?.ToString(CultureInfo.InvariantCulture) ?? "none"}] ";
+            double avg = throughputs.Average();
+            TestContext.Out.WriteLine($"{facet}{cell.Threads,7} | {(chunkBytes ?? cell.ChunkSize) / (double)OneMb,7:F3} | {avg,9:F1} | {FormatSamples(throughputs)}");
+        }
+
         private static IEnumerable<int> GetThreadSweep()
         {
+            if (_settings.Threads != null)
+            {
+                foreach (int configured in _settings.Threads)
+                {
+                    yield return configured;
+                }
+                yield break;
+            }
+
             int threads = Math.Max(8, Environment.ProcessorCount);
             for (int i = 1; i < threads; i++)
             {
@@ -163,8 +269,17 @@ namespace EasyExtensions.Crypto.Tests
             }
         }
 
+        private readonly record struct SweepCell(int Threads, int ChunkSize, int WindowCap, long? MemoryLimitBytes)
+        {
+            public bool IsDefaultFacet => PerformanceSettings.IsDefaultFacet(WindowCap, MemoryLimitBytes);
+        }
+
         private static int[] GetChunkSweep()
         {
+            if (_settings.ChunkSizes != null)
+            {
+                return _settings.ChunkSizes;
+            }
             return [.. chunkSizesInKBytes.Select(x => x * 1024)];
         }
     }
@@ -0,0 +1,37 @@
+﻿// SPDX-License-Identifier: MIT
+// Copyright (c) 2025–2026 Vadim Belov <https://belov.us>
+
+namespace EasyExtensions.Crypto.Tests.TestUtils
+{
+    /// <summary>
+    /// One timed iteration of a performance sweep, written as a JSON line for the chart toolchain.
+    /// </summary>
+    /// <param name="Op">"encrypt" or "decrypt".</param>
+    /// <param name="Threads">Cipher thread count.</param>
+    /// <param name="ChunkBytes">Chunk size in bytes.</param>
+    /// <param name="DataBytes">Plaintext bytes processed.</param>
+    /// <param name="ElapsedTicks">Elapsed wall time in <see cref="TimeSpan"/> ticks (100 ns).</param>
+    /// <param name="Iteration">Zero-based iteration index within the cell.</param>
+    /// <param name="ProcessorCount">Value of <see cref="Environment.ProcessorCount"/>.</param>
+    /// <param name="RuntimeVersion">.NET runtime description.</param>
+    /// <param name="WindowCap">The cipher's windowCap constructor argument.</param>
+    /// <param name="MemoryLimitBytes">The cipher's memoryLimitBytes constructor argument (<see langword="null"/> for no limit).</param>
+    /// <param name="CiphertextChunkBytes">Chunk size read back from the decrypted payload's first chunk header
+    /// (decrypt only; <see langword="null"/> for encrypt, whose ciphertext uses <paramref name="ChunkBytes"/>).</param>
+    /// <param name="Placement">CPU placement the run was pinned to (<see cref="PerformanceSettings.PlacementVariable"/>), if any.</param>
+    /// <param name="PhysicalCores">Physical cores of that placement (<see cref="PerformanceSettings.PhysicalCoresVariable"/>), if known.</param>
+    internal sealed record PerformanceMeasurement(
+        string Op,
+        int Threads,
+        int ChunkBytes,
+        long DataBytes,
+        long ElapsedTicks,
+        int Iteration,
+        int ProcessorCount,
+        string RuntimeVersion,
+        int WindowCap,
+        long? MemoryLimitBytes,
+        int? CiphertextChunkBytes,
+        string? Placement,
+        int? PhysicalCores);
+}
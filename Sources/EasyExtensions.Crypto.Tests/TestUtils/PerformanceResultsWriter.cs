@@ -0,0 +1,47 @@
+﻿// SPDX-License-Identifier: MIT
+// Copyright (c) 2025–2026 Vadim Belov <https://belov.us>
+
+using System.Text.Json;
+
+namespace EasyExtensions.Crypto.Tests.TestUtils
+{
+    /// <summary>
+    /// Appends <see cref="PerformanceMeasurement"/> records to a JSON-lines file.
+    /// The path comes from the PERF_RESULTS_PATH environment variable, otherwise
+    /// performance-results.jsonl in the test work directory.
+    /// </summary>
+    internal sealed class PerformanceResultsWriter : IDisposable
+    {
+        public const string PathVariable = "PERF_RESULTS_PATH";
+        private const string DefaultFileName = "performance-results.jsonl";
+
+        private static readonly JsonSerializerOptions _jsonOptions = new()
+        {
+            PropertyNamingPolicy = JsonNamingPolicy.CamelCase,
+        };
+
+        private readonly StreamWriter _writer;
+
+        public string FilePath { get; }
+
+        public PerformanceResultsWriter()
+        {
+            string? configured = Environment.GetEnvironmentVariable(PathVariable);
+            FilePath = string.IsNullOrWhiteSpace(configured)
+                ? Path.Combine(TestContext.CurrentContext.WorkDirectory, DefaultFileName)
+                : Path.GetFullPath(configured);
+            var stream = new FileStream(FilePath, FileMode.Append, FileAccess.Write, FileShare.Read);
+            _writer = new StreamWriter(stream) { AutoFlush = true };
+        }
+
+        public void Write(PerformanceMeasurement measurement)
+        {
+            _writer.WriteLine(JsonSerializer.Serialize(measurement, _jsonOptions));
+        }
+
+        public void Dispose()
+        {
+            _writer.Dispose();
+        }
+    }
+}
@@ -0,0 +1,268 @@
+﻿// SPDX-License-Identifier: MIT
+// Copyright (c) 2025–2026 Vadim Belov <https://belov.us>
+
+using System.Globalization;
+
+namespace EasyExtensions.Crypto.Tests.TestUtils
+{
+    /// <summary>
+    /// Sweep parameters passed to <see cref="PerformanceTests"/> through environment variables,
+    /// so a driver (the charts package's orchestrator and iteration planner) can steer a run without recompiling.
+    /// Unset variables keep the built-in defaults.
+    /// </summary>
+    internal sealed class PerformanceSettings
+    {
+        /// <summary>
+        /// Timed iterations per cell (positive integer).
+        /// </summary>
+        public const string IterationsVariable = "PERF_ITERATIONS";
+
+        /// <summary>
+        /// Cells to run, as <c>op:threads:chunkBytes</c> entries separated by <c>;</c>
+        /// (e.g. <c>encrypt:4:65536;decrypt:8:1048576</c>), optionally extended to
+        /// <c>op:threads:chunkBytes:windowCap:memoryLimitBytes</c> to pick one window cap and
+        /// memory limit (0 for none); the short form matches every one. Unset runs the whole sweep.
+        /// </summary>
+        public const string CellsVariable = "PERF_CELLS";
+
+        /// <summary>
+        /// Plaintext size per timed operation, in MiB (1..2047).
+        /// </summary>
+        public const string DataSizeVariable = "PERF_DATA_SIZE_MB";
+
+        /// <summary>
+        /// Thread counts to sweep, comma-separated (e.g. <c>1,2,4,6</c>).
+        /// </summary>
+        public const string ThreadsVariable = "PERF_THREADS";
+
+        /// <summary>
+        /// Chunk sizes to sweep in bytes, comma-separated (e.g. <c>65536,1048576</c>).
+        /// </summary>
+        public const string ChunkBytesVariable = "PERF_CHUNK_BYTES";
+
+        /// <summary>
+        /// Window caps to sweep, comma-separated, each at least 4 (default: the cipher's default, 1024).
+        /// </summary>
+        public const string WindowCapsVariable = "PERF_WINDOW_CAPS";
+
+        /// <summary>
+        /// Memory limits to sweep in bytes, comma-separated; 0 means no limit (the default).
+        /// </summary>
+        public const string MemoryLimitsVariable = "PERF_MEMORY_LIMITS";
+
+        /// <summary>
+        /// Name of the CPU placement the run is pinned to (e.g. <c>physical</c>, <c>smt</c>), recorded with every measurement.
+        /// </summary>
+        public const string PlacementVariable = "PERF_PLACEMENT";
+
+        /// <summary>
+        /// Physical cores of that placement (positive integer), so charts can mark where SMT siblings begin to share cores.
+        /// </summary>
+        public const string PhysicalCoresVariable = "PERF_PHYSICAL_CORES";
+
+        /// <summary>
+        /// The cipher's default window cap, used when <see cref="WindowCapsVariable"/> is unset.
+        /// </summary>
+        public const int DefaultWindowCap = 1024;
+
+        private const int DefaultIterations = 2;
+        private const int DefaultDataSizeMb = 1000;
+        private const int MaxDataSizeMb = int.MaxValue / (1024 * 1024);
+
+        private readonly HashSet<(string Op, int Threads, int ChunkBytes)>? _cells;
+        private readonly HashSet<(string Op, int Threads, int ChunkBytes, int WindowCap, long MemoryLimit)>? _facetCells;
+
+        /// <summary>
+        /// Settings of the current process, read once.
+        /// </summary>
+        public static PerformanceSettings Current { get; } = FromEnvironment();
+
+        /// <summary>
+        /// Timed iterations per cell.
+        /// </summary>
+        public int Iterations { get; }
+
+        /// <summary>
+        /// Plaintext size per timed operation, in MiB.
+        /// </summary>
+        public int DataSizeMb { get; }
+
+        /// <summary>
+        /// Thread counts to sweep, or <see langword="null"/> for the test's default sweep.
+        /// </summary>
+        public int[]? Threads { get; }
+
+        /// <summary>
+        /// Chunk sizes to sweep in bytes, or <see langword="null"/> for the test's default sweep.
+        /// </summary>
+        public int[]? ChunkSizes { get; }
+
+        /// <summary>
+        /// Window caps to sweep.
+        /// </summary>
+        public int[] WindowCaps { get; }
+
+        /// <summary>
+        /// Memory limits to sweep; <see langword="null"/> means no limit.
+        /// </summary>
+        public long?[] MemoryLimits { get; }
+
+        /// <summary>
+        /// CPU placement of the run, or <see langword="null"/> when the driver did not pin it.
+        /// </summary>
+        public string? Placement { get; }
+
+        /// <summary>
+        /// Physical cores of <see cref="Placement"/>, or <see langword="null"/> when unknown.
+        /// </summary>
+        public int? PhysicalCores { get; }
+
+        private PerformanceSettings(int iterations, int dataSizeMb, int[]? threads, int[]? chunkSizes, int[] windowCaps,
+            long?[] memoryLimits, string? placement, int? physicalCores, HashSet<(string, int, int)>? cells,
+            HashSet<(string, int, int, int, long)>? facetCells)
+        {
+            Iterations = iterations;
+            DataSizeMb = dataSizeMb;
+            Threads = threads;
+            ChunkSizes = chunkSizes;
+            WindowCaps = windowCaps;
+            MemoryLimits = memoryLimits;
+            Placement = placement;
+            PhysicalCores = physicalCores;
+            _cells = cells;
+            _facetCells = facetCells;
+        }
+
+        /// <summary>
+        /// Whether the given cell is part of this run.
+        /// </summary>
+        public bool Includes(string op, int threads, int chunkBytes, int windowCap, long? memoryLimitBytes)
+        {
+            if (_cells == null && _facetCells == null)
+            {
+                return true;
+            }
+            return _cells?.Contains((op, threads, chunkBytes)) == true
+                || _facetCells?.Contains((op, threads, chunkBytes, windowCap, memoryLimitBytes ?? 0)) == true;
+        }
+
+        /// <summary>
+        /// Whether the cell uses the cipher defaults for window cap and memory limit,
+        /// i.e. belongs to the classic threads x chunk table.
+        /// </summary>
+        public static bool IsDefaultFacet(int windowCap, long? memoryLimitBytes)
+        {
+            return windowCap == DefaultWindowCap && memoryLimitBytes == null;
+        }
+
+        /// <summary>
+        /// Reads the settings from the environment.
+        /// </summary>
+        /// <exception cref="FormatException">A variable is set but cannot be parsed.</exception>
+        public static PerformanceSettings FromEnvironment()
+        {
+            int iterations = ReadInt(IterationsVariable, DefaultIterations, max: int.MaxValue);
+            int dataSizeMb = ReadInt(DataSizeVariable, DefaultDataSizeMb, max: MaxDataSizeMb);
+            int[]? threads = ReadIntList(ThreadsVariable);
+            int[]? chunkSizes = ReadIntList(ChunkBytesVariable);
+            int[] windowCaps = ReadIntList(WindowCapsVariable) ?? [DefaultWindowCap];
+            if (windowCaps.Any(x => x < 4))
+            {
+                throw new FormatException($"{WindowCapsVariable} values must be at least 4.");
+            }
+            long?[] memoryLimits = ReadMemoryLimits();
+            string? placement = Environment.GetEnvironmentVariable(PlacementVariable)?.Trim();
+            int? physicalCores = string.IsNullOrWhiteSpace(Environment.GetEnvironmentVariable(PhysicalCoresVariable))
+                ? null
+                : ReadInt(PhysicalCoresVariable, 0, max: int.MaxValue);
+
+            string? cellsValue = Environment.GetEnvironmentVariable(CellsVariable);
+            HashSet<(string, int, int)>? cells = null;
+            HashSet<(string, int, int, int, long)>? facetCells = null;
+            if (!string.IsNullOrWhiteSpace(cellsValue))
+            {
+                cells = [];
+                facetCells = [];
+                foreach (string entry in cellsValue.Split(';', StringSplitOptions.RemoveEmptyEntries | StringSplitOptions.TrimEntries))
+                {
+                    string[] parts = entry.Split(':');
+                    if ((parts.Length != 3 && parts.Length != 5)
+                        || !int.TryParse(parts[1], NumberStyles.None, CultureInfo.InvariantCulture, out int cellThreads)
+                        || !int.TryParse(parts[2], NumberStyles.None, CultureInfo.InvariantCulture, out int chunkBytes))
+                    {
+                        throw new FormatException($"{CellsVariable} entries must be op:threads:chunkBytes[:windowCap:memoryLimitBytes], got '{entry}'.");
+                    }
+                    string op = parts[0].ToLowerInvariant();
+                    if (parts.Length == 3)
+                    {
+                        cells.Add((op, cellThreads, chunkBytes));
+                        continue;
+                    }
+                    if (!int.TryParse(parts[3], NumberStyles.None, CultureInfo.InvariantCulture, out int windowCap)
+                        || !long.TryParse(parts[4], NumberStyles.None, CultureInfo.InvariantCulture, out long memoryLimit))
+                    {
+                        throw new FormatException($"{CellsVariable} entries must be op:threads:chunkBytes[:windowCap:memoryLimitBytes], got '{entry}'.");
+                    }
+                    facetCells.Add((op, cellThreads, chunkBytes, windowCap, memoryLimit));
+                }
+            }
+            return new PerformanceSettings(iterations, dataSizeMb, threads, chunkSizes, windowCaps, memoryLimits,
+                string.IsNullOrEmpty(placement) ? null : placement, physicalCores, cells, facetCells);
+        }
+
+        private static long?[] ReadMemoryLimits()
+        {
+            string? value = Environment.GetEnvironmentVariable(MemoryLimitsVariable);
+            if (string.IsNullOrWhiteSpace(value))
+            {
+                return [null];
+            }
+            string[] parts = value.Split(',', StringSplitOptions.RemoveEmptyEntries | StringSplitOptions.TrimEntries);
+            long?[] result = new long?[parts.Length];
+            for (int i = 0; i < parts.Length; i++)
+            {
+                if (!long.TryParse(parts[i], NumberStyles.None, CultureInfo.InvariantCulture, out long limit)
+                    || (limit != 0 && limit < AesGcmStreamCipher.MinChunkSize * 4))
+                {
+                    throw new FormatException($"{MemoryLimitsVariable} values must be 0 (no limit) or at least "
+                        + $"{AesGcmStreamCipher.MinChunkSize * 4} bytes, got '{parts[i]}'.");
+                }
+                result[i] = limit == 0 ? null : limit;
+            }
+            return result.Length > 0 ? result : [null];
+        }
+
+        private static int ReadInt(string variable, int defaultValue, int max)
+        {
+            string? value = Environment.GetEnvironmentVariable(variable);
+            if (string.IsNullOrWhiteSpace(value))
+            {
+                return defaultValue;
+            }
+            if (!int.TryParse(value, NumberStyles.None, CultureInfo.InvariantCulture, out int result) || result < 1 || result > max)
+            {
+                throw new FormatException($"{variable} must be an integer from 1 to {max}, got '{value}'.");
+            }
+            return result;
+        }
+
+        private static int[]? ReadIntList(string variable)
+        {
+            string? value = Environment.GetEnvironmentVariable(variable);
+            if (string.IsNullOrWhiteSpace(value))
+            {
+                return null;
+            }
+            string[] parts = value.Split(',', StringSplitOptions.RemoveEmptyEntries | StringSplitOptions.TrimEntries);
+            int[] result = new int[parts.Length];
+            for (int i = 0; i < parts.Length; i++)
+            {
+                if (!int.TryParse(parts[i], NumberStyles.None, CultureInfo.InvariantCulture, out result[i]) || result[i] < 1)
+                {
+                    throw new FormatException($"{variable} must be a comma-separated list of positive integers, got '{value}'.");
+                }
+            }
+            return result.Length > 0 ? result : null;
+        }
+    }
+}